@@ -1,7 +1,16 @@
+import time
+
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization as crypt_serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import http_method_kind
+from .ratelimit import is_throttled
+from .ratelimit import parse_retry_after
+
 
 def generate_key_pair():
     """
@@ -52,3 +61,67 @@ def generic_find(filter_names, kwargs, objs):
             % (kwargs, filter_names))
 
     return matches
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """
+    An HTTP adapter which applies a :class:`.RateLimiter` to each request, and
+    retries requests throttled by the server.
+    """
+
+    def __init__(self, rate_limiter, **kwargs):
+        self.rate_limiter = rate_limiter
+        super(RateLimitedHTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        kind = http_method_kind(request.method)
+        # Streamed bodies cannot be sent again
+        can_retry = not hasattr(request.body, 'read')
+        attempts = 0
+        while True:
+            attempts += 1
+            self.rate_limiter.acquire(kind)
+            response = super(RateLimitedHTTPAdapter, self).send(
+                request, **kwargs)
+            # Recorded by the instrumentation hook
+            response.throttle_retries = attempts - 1
+            if not is_throttled(response.status_code, request.method):
+                self.rate_limiter.succeeded(kind)
+                return response
+            delay = self.rate_limiter.throttled(
+                kind, attempts,
+                parse_retry_after(response.headers.get('Retry-After')))
+            if delay is None or not can_retry:
+                return response
+            response.close()
+            time.sleep(delay)
+
+
+def create_http_session(pool_size=None, keep_alive=True, rate_limiter=None,
+                        instrumentation=None, service=None):
+    """
+    Creates a ``requests`` session for SDKs which accept one, with the given
+    connection pool size per host. If ``keep_alive`` is ``False``,
+    connections are closed after each request instead of being reused. If a
+    ``rate_limiter`` is given, it is applied to all requests made through the
+    session, and if ``instrumentation`` is given, the requests are recorded
+    against ``service``.
+    """
+    session = requests.Session()
+    if pool_size or rate_limiter:
+        pool_kwargs = {}
+        if pool_size:
+            pool_kwargs = {'pool_connections': pool_size,
+                           'pool_maxsize': pool_size}
+        if rate_limiter:
+            adapter = RateLimitedHTTPAdapter(rate_limiter, **pool_kwargs)
+        else:
+            adapter = HTTPAdapter(**pool_kwargs)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    if instrumentation:
+        session.hooks['response'].append(
+            instrumentation.requests_hook(service))
+    return session
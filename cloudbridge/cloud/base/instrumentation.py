@@ -0,0 +1,349 @@
+"""
+Instrumentation of the API calls made by providers.
+
+Each provider records every outbound API call as a :class:`CallRecord` and
+passes it to the listeners registered with ``provider.instrumentation``.
+A :class:`CallAggregator`, which keeps per operation latency percentiles, and
+a :class:`StatsdExporter` are provided as listeners.
+
+Example:
+
+.. code-block:: python
+
+    stats = CallAggregator()
+    provider.instrumentation.add_listener(stats)
+    provider.compute.instances.list()
+    print(stats.summary())
+"""
+import logging
+import math
+import re
+import socket
+import threading
+import time
+from collections import deque
+
+from six.moves.urllib.parse import urlparse
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_SAMPLES = 10000
+
+# Path segments that look like resource ids rather than resource types, and
+# API versions, which are not ids
+ID_SEGMENT_PATTERN = re.compile(r'.*\d|[^/]{20,}')
+VERSION_SEGMENT_PATTERN = re.compile(r'v\d+(\.\d+)*$')
+
+
+def http_operation_name(method, path):
+    """
+    Returns an operation name for a REST call, made up of the method and the
+    path with any resource ids replaced by ``{id}``, so that calls to
+    different resources of the same type are grouped together. Azure Resource
+    Manager paths, which alternate between resource types and names, have
+    every name replaced.
+
+    :type method: ``str``
+    :param method: The HTTP method.
+
+    :type path: ``str``
+    :param path: The URL path, without a query string.
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    if segments and segments[0].lower() == 'subscriptions':
+        template = []
+        expect_name = False
+        for segment in segments:
+            if not expect_name:
+                template.append(segment)
+                expect_name = True
+            elif template[-1].lower() == 'providers':
+                # A provider namespace (e.g. Microsoft.Compute), which is
+                # followed by a resource type
+                template.append(segment)
+                expect_name = False
+            else:
+                template.append('{id}')
+                expect_name = False
+        segments = template
+    else:
+        segments = ['{id}' if ID_SEGMENT_PATTERN.match(segment) and
+                    not VERSION_SEGMENT_PATTERN.match(segment) else segment
+                    for segment in segments]
+    return '{0} /{1}'.format(method.upper(), '/'.join(segments))
+
+
+class CallRecord(object):
+    """
+    A single API call made by a provider.
+
+    :ivar service: The cloud service called (e.g. ``ec2``).
+    :ivar operation: The operation called (e.g. ``DescribeInstances``).
+    :ivar latency: The time taken by the call, in seconds.
+    :ivar status: The HTTP status code of the final response, or ``None`` if
+                  no response was received.
+    :ivar retries: The number of times the call was retried.
+    :ivar bytes_sent: The size of the request body, if known.
+    :ivar bytes_received: The size of the response body, if known.
+    :ivar error: The provider's error code, if the call failed.
+    """
+
+    def __init__(self, provider, service, operation, latency, status=None,
+                 retries=0, bytes_sent=None, bytes_received=None, error=None):
+        self.provider = provider
+        self.service = service
+        self.operation = operation
+        self.latency = latency
+        self.status = status
+        self.retries = retries
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.error = error
+        self.timestamp = time.time()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "<CB-{0}: {1}.{2} {3} {4:.3f}s>".format(
+            self.__class__.__name__, self.service, self.operation,
+            self.status, self.latency)
+
+
+class Instrumentation(object):
+    """
+    Distributes the records of the API calls made by a provider to the
+    registered listeners. A listener is any callable accepting a
+    :class:`CallRecord`; it is called in the thread which made the call.
+
+    Listeners added with :meth:`add_global_listener` receive the calls made
+    by all providers.
+    """
+    _global_listeners = []
+
+    def __init__(self, provider):
+        self.provider = provider
+        self._listeners = []
+
+    @property
+    def enabled(self):
+        return bool(self._listeners or Instrumentation._global_listeners)
+
+    @staticmethod
+    def add_global_listener(listener):
+        Instrumentation._global_listeners = \
+            Instrumentation._global_listeners + [listener]
+        return listener
+
+    @staticmethod
+    def remove_global_listener(listener):
+        Instrumentation._global_listeners = [
+            existing for existing in Instrumentation._global_listeners
+            if existing != listener]
+
+    def add_listener(self, listener):
+        # Copy on write, so that records can be sent without locking
+        self._listeners = self._listeners + [listener]
+        return listener
+
+    def remove_listener(self, listener):
+        self._listeners = [existing for existing in self._listeners
+                           if existing != listener]
+
+    def record(self, service, operation, latency, **kwargs):
+        """
+        Send a record of an API call to all listeners. Errors raised by
+        listeners are logged and ignored.
+
+        The arguments are those of :class:`CallRecord`.
+        """
+        listeners = self._listeners + Instrumentation._global_listeners
+        if not listeners:
+            return
+        record = CallRecord(self.provider.name, service, operation, latency,
+                            **kwargs)
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                log.warning("Instrumentation listener %s failed: %s",
+                            listener, e)
+
+    def requests_hook(self, service):
+        """
+        Returns a ``requests`` response hook which records each call made
+        through a requests session. Sessions shared by several services can
+        pass ``None`` to use the host name as the service.
+        """
+        def record_response(response, *args, **kwargs):
+            if not self.enabled:
+                return
+            request = response.request
+            url = urlparse(response.url or request.url)
+            retries = getattr(response, 'throttle_retries', 0)
+            raw_retries = getattr(response.raw, 'retries', None)
+            if raw_retries is not None:
+                retries += len(raw_retries.history)
+            body = request.body
+            self.record(
+                service or url.hostname,
+                http_operation_name(request.method, url.path),
+                response.elapsed.total_seconds(), status=response.status_code,
+                retries=retries,
+                bytes_sent=len(body) if isinstance(body, (bytes, str))
+                else None,
+                bytes_received=_content_length(response.headers),
+                error=response.reason if response.status_code >= 400
+                else None)
+        return record_response
+
+
+def _content_length(headers):
+    length = headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+class OperationStats(object):
+    """
+    Call statistics for a single operation. Latencies are kept for the most
+    recent ``max_samples`` calls.
+    """
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latencies = deque(maxlen=max_samples)
+
+    def add(self, record):
+        self.count += 1
+        self.errors += 0 if record.ok else 1
+        self.retries += record.retries
+        self.bytes_sent += record.bytes_sent or 0
+        self.bytes_received += record.bytes_received or 0
+        self.latencies.append(record.latency)
+
+    def percentile(self, percent):
+        """
+        Returns the given percentile of the recorded latencies, using the
+        nearest rank method.
+        """
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return None
+        rank = max(int(math.ceil(percent / 100.0 * len(latencies))), 1)
+        return latencies[rank - 1]
+
+
+class CallAggregator(object):
+    """
+    An instrumentation listener which keeps call counts and latency
+    percentiles for each operation, in memory.
+    """
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __call__(self, record):
+        key = (record.service, record.operation)
+        with self._lock:
+            stats = self._stats.get(key)
+            if not stats:
+                stats = self._stats[key] = OperationStats(self.max_samples)
+            stats.add(record)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def stats(self, service, operation):
+        """
+        Returns the :class:`OperationStats` for an operation, or ``None`` if
+        it has not been called.
+        """
+        return self._stats.get((service, operation))
+
+    def summary(self):
+        """
+        Returns a summary of the calls made to each operation.
+
+        :rtype: ``dict``
+        :return: A dict keyed by ``(service, operation)``, with the ``count``,
+                 ``errors``, ``retries``, ``bytes_sent`` and
+                 ``bytes_received`` for each operation and its ``p50``,
+                 ``p95`` and ``p99`` latencies in seconds.
+        """
+        with self._lock:
+            items = sorted(self._stats.items())
+            summary = {}
+            for key, stats in items:
+                summary[key] = {'count': stats.count,
+                                'errors': stats.errors,
+                                'retries': stats.retries,
+                                'bytes_sent': stats.bytes_sent,
+                                'bytes_received': stats.bytes_received}
+                for percent in self.PERCENTILES:
+                    summary[key]['p%s' % percent] = stats.percentile(percent)
+        return summary
+
+    def to_prometheus(self, metric='cloudbridge_api_call'):
+        """
+        Formats the summary in the Prometheus text exposition format, for
+        serving from an application's metrics endpoint.
+        """
+        lines = ['# TYPE {0}_seconds summary'.format(metric),
+                 '# TYPE {0}_errors_total counter'.format(metric)]
+        for (service, operation), stats in sorted(self.summary().items()):
+            labels = 'service="{0}",operation="{1}"'.format(
+                service, operation.replace('"', '\\"'))
+            for percent in self.PERCENTILES:
+                lines.append('{0}_seconds{{{1},quantile="{2}"}} {3}'.format(
+                    metric, labels, percent / 100.0,
+                    stats['p%s' % percent]))
+            lines.append('{0}_seconds_count{{{1}}} {2}'.format(
+                metric, labels, stats['count']))
+            lines.append('{0}_errors_total{{{1}}} {2}'.format(
+                metric, labels, stats['errors']))
+        return '\n'.join(lines) + '\n'
+
+
+class StatsdExporter(object):
+    """
+    An instrumentation listener which sends each call to a StatsD server, as
+    a timer and call, error and retry counters.
+    """
+    INVALID_NAME_CHARACTERS = re.compile(r'[^A-Za-z0-9_.-]+')
+
+    def __init__(self, host='localhost', port=8125, prefix='cloudbridge'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _name(self, record):
+        operation = self.INVALID_NAME_CHARACTERS.sub(
+            '_', record.operation.replace('{id}', 'id')).strip('_')
+        return '.'.join((self.prefix, record.service, operation))
+
+    def __call__(self, record):
+        name = self._name(record)
+        metrics = ['{0}.latency:{1:d}|ms'.format(name,
+                                                 int(record.latency * 1000)),
+                   '{0}.calls:1|c'.format(name)]
+        if not record.ok:
+            metrics.append('{0}.errors:1|c'.format(name))
+        if record.retries:
+            metrics.append('{0}.retries:{1:d}|c'.format(name, record.retries))
+        try:
+            self._socket.sendto('\n'.join(metrics).encode('utf-8'),
+                                self.address)
+        except socket.error as e:
+            log.debug("Could not send metrics to StatsD: %s", e)
+
+    def close(self):
+        self._socket.close()
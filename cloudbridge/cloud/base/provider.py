@@ -8,6 +8,12 @@ try:
 except ImportError:  # Python 2
     from ConfigParser import SafeConfigParser as ConfigParser
 
+from cloudbridge.cloud.base import tracing
+from cloudbridge.cloud.base.instrumentation import Instrumentation
+from cloudbridge.cloud.base.ratelimit import RateLimiter
+from cloudbridge.cloud.base.services import BaseBulkService
+from cloudbridge.cloud.base.transfer import DEFAULT_TRANSFER_MAX_WORKERS
+from cloudbridge.cloud.base.transfer import DEFAULT_TRANSFER_PART_SIZE
 from cloudbridge.cloud.interfaces import CloudProvider
 from cloudbridge.cloud.interfaces.exceptions import ProviderConnectionException
 from cloudbridge.cloud.interfaces.resources import Configuration
@@ -17,12 +23,17 @@ log = logging.getLogger(__name__)
 DEFAULT_RESULT_LIMIT = 50
 DEFAULT_WAIT_TIMEOUT = 600
 DEFAULT_WAIT_INTERVAL = 5
+# Used for whichever of the connect or read timeouts is not set, when a
+# client only accepts both together
+DEFAULT_HTTP_TIMEOUT = 60
 
 # By default, use two locations for CloudBridge configuration
 CloudBridgeConfigPath = '/etc/cloudbridge.ini'
 CloudBridgeConfigLocations = [CloudBridgeConfigPath]
 UserConfigPath = os.path.join(expanduser('~'), '.cloudbridge')
 CloudBridgeConfigLocations.append(UserConfigPath)
+# Location for data cached between runs (e.g. provider catalogs)
+UserCachePath = os.path.join(expanduser('~'), '.cloudbridge_cache')
 
 
 class BaseConfiguration(Configuration):
@@ -76,6 +87,44 @@ class BaseConfiguration(Configuration):
         """
         return self.get('cb_debug', os.environ.get('CB_DEBUG', False))
 
+    @property
+    def http_pool_size(self):
+        return self.get('http_pool_size')
+
+    @property
+    def http_connect_timeout(self):
+        return self.get('http_connect_timeout')
+
+    @property
+    def http_read_timeout(self):
+        return self.get('http_read_timeout')
+
+    @property
+    def http_keep_alive(self):
+        return self.get('http_keep_alive', True)
+
+    @property
+    def transfer_part_size(self):
+        return int(self.get('transfer_part_size',
+                            DEFAULT_TRANSFER_PART_SIZE))
+
+    @property
+    def transfer_max_workers(self):
+        return int(self.get('transfer_max_workers',
+                            DEFAULT_TRANSFER_MAX_WORKERS))
+
+    @property
+    def http_timeout(self):
+        """
+        The connect and read timeouts as a ``(connect, read)`` tuple, as
+        accepted by ``requests``, or ``None`` if neither is set.
+        """
+        if (self.http_connect_timeout is None and
+                self.http_read_timeout is None):
+            return None
+        return (self.http_connect_timeout or DEFAULT_HTTP_TIMEOUT,
+                self.http_read_timeout or DEFAULT_HTTP_TIMEOUT)
+
 
 class BaseCloudProvider(CloudProvider):
 
@@ -83,15 +132,69 @@ class BaseCloudProvider(CloudProvider):
         self._config = BaseConfiguration(config)
         self._config_parser = ConfigParser()
         self._config_parser.read(CloudBridgeConfigLocations)
+        self._bulk = BaseBulkService(self)
+        self._rate_limiter = RateLimiter.from_config(self._config)
+        self._instrumentation = Instrumentation(self)
+        if tracing.is_enabled():
+            # Trace any provider classes loaded since tracing was enabled
+            tracing.trace_classes()
+        # Providers for other regions, shared by all providers created
+        # through for_region
+        self._region_providers = {}
 
     @property
     def config(self):
         return self._config
 
+    @property
+    def bulk(self):
+        return self._bulk
+
+    @property
+    def rate_limiter(self):
+        """
+        The :class:`.RateLimiter` applied to requests made by this provider,
+        which also records throttling metrics.
+        """
+        return self._rate_limiter
+
+    @property
+    def instrumentation(self):
+        """
+        The :class:`.Instrumentation` to which every API call made by this
+        provider is reported. Register listeners with it to monitor calls.
+        """
+        return self._instrumentation
+
     @property
     def name(self):
         return str(self.__class__.__name__)
 
+    def _region_config(self, region_name):
+        """
+        Returns this provider's configuration, changed to connect to the
+        given region. Providers supporting ``for_region`` must implement
+        this.
+        """
+        raise NotImplementedError(
+            "{0} does not support connecting to other regions".format(
+                self.name))
+
+    def for_region(self, region_name):
+        current_region = getattr(self, 'region_name', None)
+        if region_name == current_region:
+            return self
+        if current_region:
+            self._region_providers.setdefault(current_region, self)
+        region_provider = self._region_providers.get(region_name)
+        if not region_provider:
+            log.debug("Creating a provider for region %s", region_name)
+            region_provider = self.__class__(self._region_config(region_name))
+            # pylint:disable=protected-access
+            region_provider._region_providers = self._region_providers
+            self._region_providers[region_name] = region_provider
+        return region_provider
+
     def authenticate(self):
         """
         A basic implementation which simply runs a low impact command to
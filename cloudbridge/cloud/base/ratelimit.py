@@ -0,0 +1,285 @@
+"""
+Client side rate limiting and throttling aware retries, shared by all
+providers.
+
+Requests are divided into two kinds, ``describe`` (read only) and ``mutate``
+calls, each of which can be given its own budget, as providers usually limit
+them separately. When a provider throttles a request, the budget for that kind
+of request is reduced and the request is retried with jittered exponential
+backoff. The budget then recovers gradually as requests succeed.
+"""
+import logging
+import random
+import threading
+import time
+from email.utils import mktime_tz
+from email.utils import parsedate_tz
+
+log = logging.getLogger(__name__)
+
+DESCRIBE = 'describe'
+MUTATE = 'mutate'
+
+DEFAULT_THROTTLE_MAX_RETRIES = 5
+DEFAULT_THROTTLE_BASE_DELAY = 0.5
+DEFAULT_THROTTLE_MAX_DELAY = 20
+
+# Operation name prefixes, and HTTP methods, of read only requests
+DESCRIBE_OPERATION_PREFIXES = ('Describe', 'Get', 'Head', 'List')
+DESCRIBE_HTTP_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# HTTP status codes returned by throttled requests. A 503 may also come from
+# a proxy after the request took effect, so it is only treated as throttling,
+# and retried, for idempotent methods.
+THROTTLE_STATUS_CODES = (429,)
+IDEMPOTENT_THROTTLE_STATUS_CODES = (503,)
+IDEMPOTENT_HTTP_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE')
+
+
+def operation_kind(operation_name):
+    """
+    Returns the kind of request, ``describe`` or ``mutate``, for an API
+    operation name (e.g. DescribeInstances).
+    """
+    if operation_name.startswith(DESCRIBE_OPERATION_PREFIXES):
+        return DESCRIBE
+    return MUTATE
+
+
+def http_method_kind(method):
+    """
+    Returns the kind of request, ``describe`` or ``mutate``, for an HTTP
+    method.
+    """
+    if method and method.upper() in DESCRIBE_HTTP_METHODS:
+        return DESCRIBE
+    return MUTATE
+
+
+def is_throttled(status_code, method):
+    """
+    Returns whether a response with the given status code, to a request with
+    the given HTTP method, was throttled and may be retried.
+    """
+    if status_code in THROTTLE_STATUS_CODES:
+        return True
+    return (status_code in IDEMPOTENT_THROTTLE_STATUS_CODES and
+            bool(method) and method.upper() in IDEMPOTENT_HTTP_METHODS)
+
+
+def parse_retry_after(value):
+    """
+    Parses the value of a Retry-After header, which is either a number of
+    seconds or an HTTP date.
+
+    :rtype: ``float``
+    :return: The number of seconds to wait, or ``None`` if the value could
+             not be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        parsed = parsedate_tz(value)
+        if parsed:
+            return max(mktime_tz(parsed) - time.time(), 0)
+    return None
+
+
+class TokenBucket(object):
+    """
+    A token bucket allowing ``rate`` requests per second on average, with
+    bursts of up to ``capacity`` requests.
+
+    The rate adapts to throttling: it is halved whenever the provider
+    throttles a request, and recovers by a small step with each successful
+    request, up to the configured rate.
+    """
+    MIN_RATE_FRACTION = 0.05
+    RECOVERY_FRACTION = 0.05
+
+    def __init__(self, rate, capacity=None):
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.capacity = float(capacity or max(rate, 1))
+        self._tokens = self.capacity
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        """
+        Take a token from the bucket.
+
+        :rtype: ``float``
+        :return: The number of seconds to wait before the token may be used.
+        """
+        with self._lock:
+            self._refill(time.time())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.rate / 2,
+                            self.max_rate * self.MIN_RATE_FRACTION)
+
+    def succeeded(self):
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(
+                    self.rate + self.max_rate * self.RECOVERY_FRACTION,
+                    self.max_rate)
+
+
+class RateLimiter(object):
+    """
+    Rate limits requests to a provider, and decides how long to back off for
+    when the provider throttles them.
+
+    :type rates: ``dict``
+    :param rates: The maximum requests per second for each kind of request.
+                  Kinds without a rate are not limited, but are still retried
+                  when throttled.
+
+    :type burst: ``int``
+    :param burst: The number of requests of each kind which may be made at
+                  once, before the rate limit applies. Defaults to the rate.
+    """
+
+    def __init__(self, rates=None, burst=None,
+                 max_retries=DEFAULT_THROTTLE_MAX_RETRIES,
+                 base_delay=DEFAULT_THROTTLE_BASE_DELAY,
+                 max_delay=DEFAULT_THROTTLE_MAX_DELAY):
+        self.buckets = {kind: TokenBucket(rate, burst)
+                        for kind, rate in (rates or {}).items() if rate}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Creates a rate limiter from the ``rate_limit_*`` and ``throttle_*``
+        provider configuration values.
+
+        :type config: :class:`.Configuration`
+        :param config: The provider configuration.
+        """
+        def value(key, default, cast=float):
+            setting = config.get(key)
+            return cast(setting) if setting is not None else default
+
+        return cls(rates={DESCRIBE: value('rate_limit_describe', None),
+                          MUTATE: value('rate_limit_mutate', None)},
+                   burst=value('rate_limit_burst', None, int),
+                   max_retries=value('throttle_max_retries',
+                                     DEFAULT_THROTTLE_MAX_RETRIES, int),
+                   base_delay=value('throttle_base_delay',
+                                    DEFAULT_THROTTLE_BASE_DELAY),
+                   max_delay=value('throttle_max_delay',
+                                   DEFAULT_THROTTLE_MAX_DELAY))
+
+    def reset_metrics(self):
+        with self._metrics_lock:
+            self._metrics = {
+                'requests': {DESCRIBE: 0, MUTATE: 0},
+                'throttle_events': {DESCRIBE: 0, MUTATE: 0},
+                'retries': 0,
+                'rate_limit_wait_time': 0.0,
+                'backoff_wait_time': 0.0
+            }
+
+    @property
+    def metrics(self):
+        """
+        A snapshot of the rate limiter metrics.
+
+        :rtype: ``dict``
+        :return: A dict with the number of ``requests`` and
+                 ``throttle_events`` for each kind of request, the number of
+                 ``retries`` and the total seconds spent waiting on the rate
+                 limit (``rate_limit_wait_time``) and backing off
+                 (``backoff_wait_time``).
+        """
+        with self._metrics_lock:
+            return {key: dict(value) if isinstance(value, dict) else value
+                    for key, value in self._metrics.items()}
+
+    def rates(self):
+        """
+        The current, adapted, rate for each limited kind of request.
+        """
+        return {kind: bucket.rate for kind, bucket in self.buckets.items()}
+
+    def acquire(self, kind):
+        """
+        Wait until a request of the given kind may be made.
+
+        :type kind: ``str``
+        :param kind: ``describe`` or ``mutate``.
+        """
+        bucket = self.buckets.get(kind)
+        delay = bucket.reserve() if bucket else 0
+        with self._metrics_lock:
+            self._metrics['requests'][kind] += 1
+            self._metrics['rate_limit_wait_time'] += delay
+        if delay:
+            log.debug("Rate limit reached for %s requests, waiting %.2f"
+                      " seconds", kind, delay)
+            time.sleep(delay)
+
+    def succeeded(self, kind):
+        bucket = self.buckets.get(kind)
+        if bucket:
+            bucket.succeeded()
+
+    def throttled(self, kind, attempts, retry_after=None):
+        """
+        Record that a request was throttled by the provider, and decide
+        whether to retry it.
+
+        :type kind: ``str``
+        :param kind: ``describe`` or ``mutate``.
+
+        :type attempts: ``int``
+        :param attempts: The number of times the request has been made.
+
+        :type retry_after: ``float``
+        :param retry_after: The number of seconds the provider asked to wait,
+                            if any.
+
+        :rtype: ``float``
+        :return: The number of seconds to wait before retrying, or ``None``
+                 if the request should not be retried.
+        """
+        bucket = self.buckets.get(kind)
+        if bucket:
+            bucket.throttled()
+        with self._metrics_lock:
+            self._metrics['throttle_events'][kind] += 1
+        if attempts > self.max_retries:
+            log.warning("%s request still throttled after %s attempts",
+                        kind, attempts)
+            return None
+
+        # Use "full jitter" so that concurrent clients spread their retries
+        delay = random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        with self._metrics_lock:
+            self._metrics['retries'] += 1
+            self._metrics['backoff_wait_time'] += delay
+        log.debug("%s request throttled on attempt %s, retrying in %.2f"
+                  " seconds", kind, attempts, delay)
+        return delay
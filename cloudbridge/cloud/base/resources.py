@@ -2,7 +2,7 @@
 Base implementation for data objects exposed through a provider or service
 """
 import inspect
-import itertools
+import io
 import logging
 import os
 import re
@@ -10,6 +10,9 @@ import shutil
 import time
 
 import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.transfer import DEFAULT_READ_BUFFER_SIZE
+from cloudbridge.cloud.base.transfer import READ_CHUNK_SIZE
+from cloudbridge.cloud.base.transfer import RangedReader
 from cloudbridge.cloud.interfaces.exceptions \
     import InvalidConfigurationException
 from cloudbridge.cloud.interfaces.exceptions import InvalidNameException
@@ -312,6 +315,119 @@ class ServerPagedResultList(BaseResultList):
             "ServerPagedResultLists do not support the data property")
 
 
+def _load_first(method):
+    """
+    Wraps a ``list`` method so that a :class:`StreamingResultList` is fully
+    populated before the method is invoked.
+    """
+    def wrapper(self, *args, **kwargs):
+        # pylint:disable=protected-access
+        self._load()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class StreamingResultList(ServerPagedResultList):
+    """
+    A server paged result list which is populated on demand from a
+    generator of provider pages, rather than being fully materialised before
+    being returned. Pages are only fetched as results are consumed and no
+    more than ``limit`` results are ever fetched. Iterating over the list
+    yields each result as soon as its page arrives, while any other access
+    (e.g. ``len()``, indexing, ``is_truncated`` or ``marker``) populates the
+    list up to ``limit`` first.
+
+    :type pages: ``iterable``
+    :param pages: An iterable which fetches and yields one page of
+                  CloudBridge objects at a time, resuming from the marker
+                  the list was requested with.
+
+    :type limit: ``int``
+    :param limit: The maximum number of results to return.
+
+    :type marker_from: ``function``
+    :param marker_from: Returns the marker with which the listing can be
+                        resumed after a given object. Defaults to the id of
+                        the object.
+    """
+
+    def __init__(self, pages, limit, marker_from=None):
+        super(StreamingResultList, self).__init__(False, None, False)
+        self._pages = iter(pages)
+        self._limit = limit
+        self._marker_from = marker_from or (lambda obj: obj.id)
+        self._exhausted = False
+
+    def _fetch(self):
+        """
+        Fetch the next page of results, returning ``False`` once no more
+        results will be added to this list.
+        """
+        if self._exhausted:
+            return False
+        page = next(self._pages, None)
+        if page is None:
+            self._exhausted = True
+            return False
+        page = list(page)
+        room = self._limit - list.__len__(self)
+        list.extend(self, page[:room])
+        if list.__len__(self) >= self._limit:
+            # The limit has been reached. The provider may or may not have
+            # more results, so assume it does unless the generator was
+            # already drained.
+            self._exhausted = True
+            self._is_truncated = True
+            self._marker = self._marker_from(list.__getitem__(self, -1))
+        return True
+
+    def _load(self):
+        while self._fetch():
+            pass
+
+    def __iter__(self):
+        position = 0
+        while True:
+            while position < list.__len__(self):
+                yield list.__getitem__(self, position)
+                position += 1
+            if not self._fetch():
+                return
+
+    @property
+    def marker(self):
+        self._load()
+        return self._marker
+
+    @property
+    def is_truncated(self):
+        self._load()
+        return self._is_truncated
+
+    __len__ = _load_first(list.__len__)
+    __getitem__ = _load_first(list.__getitem__)
+    __contains__ = _load_first(list.__contains__)
+    __reversed__ = _load_first(list.__reversed__)
+    __eq__ = _load_first(list.__eq__)
+    __ne__ = _load_first(list.__ne__)
+    __add__ = _load_first(list.__add__)
+    __iadd__ = _load_first(list.__iadd__)
+    __repr__ = _load_first(list.__repr__)
+    append = _load_first(list.append)
+    extend = _load_first(list.extend)
+    insert = _load_first(list.insert)
+    index = _load_first(list.index)
+    count = _load_first(list.count)
+    pop = _load_first(list.pop)
+    remove = _load_first(list.remove)
+    reverse = _load_first(list.reverse)
+    sort = _load_first(list.sort)
+    if hasattr(list, '__getslice__'):  # Python 2
+        __getslice__ = _load_first(list.__getslice__)
+
+
 class ClientPagedResultList(BaseResultList):
     """
     This is a convenience class that extends the :class:`BaseResultList` class
@@ -323,17 +439,18 @@ class ClientPagedResultList(BaseResultList):
     """
 
     def __init__(self, provider, objects, limit=None, marker=None):
-        self._objects = objects
+        self._objects = (objects if isinstance(objects, (list, tuple))
+                         else list(objects))
         limit = limit or provider.config.default_result_limit
-        total_size = len(objects)
+        total_size = len(self._objects)
+        start = 0
         if marker:
-            from_marker = itertools.dropwhile(
-                lambda obj: not obj.id == marker, objects)
-            # skip one past the marker
-            next(from_marker, None)
-            objects = list(from_marker)
-        is_truncated = len(objects) > limit
-        results = list(itertools.islice(objects, limit))
+            # skip one past the marker, or past the end if it is not found
+            start = next((position for position, obj
+                          in enumerate(self._objects)
+                          if obj.id == marker), total_size - 1) + 1
+        is_truncated = total_size - start > limit
+        results = list(self._objects[start:start + limit])
         super(ClientPagedResultList, self).__init__(
             is_truncated,
             results[-1].id if is_truncated else None,
@@ -848,7 +965,22 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
                 "data.html#object-key-guidelines" % name)
 
     def save_content(self, target_stream):
-        shutil.copyfileobj(self.iter_content(), target_stream)
+        content = self.iter_content()
+        if not hasattr(content, 'readinto'):
+            shutil.copyfileobj(content, target_stream)
+            return
+        # Copy through a single buffer, which the content fills in place
+        buffer = bytearray(READ_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            count = content.readinto(buffer)
+            if not count:
+                break
+            target_stream.write(view[:count])
+
+    def open(self, buffer_size=None):
+        return io.BufferedReader(RangedReader(self),
+                                 buffer_size or DEFAULT_READ_BUFFER_SIZE)
 
     def __eq__(self, other):
         return (isinstance(other, BucketObject) and
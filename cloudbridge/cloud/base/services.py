@@ -2,10 +2,16 @@
 Base implementation for services available through a provider
 """
 import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
+from cloudbridge.cloud.interfaces.resources import Region
 from cloudbridge.cloud.interfaces.resources import Router
 from cloudbridge.cloud.interfaces.services import BucketService
+from cloudbridge.cloud.interfaces.services import BulkService
 from cloudbridge.cloud.interfaces.services import CloudService
 from cloudbridge.cloud.interfaces.services import ComputeService
 from cloudbridge.cloud.interfaces.services import ImageService
@@ -13,6 +19,8 @@ from cloudbridge.cloud.interfaces.services import InstanceService
 from cloudbridge.cloud.interfaces.services import KeyPairService
 from cloudbridge.cloud.interfaces.services import NetworkService
 from cloudbridge.cloud.interfaces.services import NetworkingService
+from cloudbridge.cloud.interfaces.services import \
+    ObjectLifeCycleServiceMixin
 from cloudbridge.cloud.interfaces.services import RegionService
 from cloudbridge.cloud.interfaces.services import RouterService
 from cloudbridge.cloud.interfaces.services import SecurityService
@@ -28,6 +36,8 @@ from .resources import ClientPagedResultList
 
 log = logging.getLogger(__name__)
 
+DEFAULT_BULK_MAX_WORKERS = 10
+
 
 class BaseCloudService(CloudService):
 
@@ -39,6 +49,83 @@ class BaseCloudService(CloudService):
         return self._provider
 
 
+class BaseObjectLifeCycleServiceMixin(ObjectLifeCycleServiceMixin):
+    """
+    A base implementation of waiting on several resources at once. Providers
+    which can describe many resources in a single request should override
+    ``_refresh_all``.
+    """
+
+    def _refresh_all(self, resources):
+        """
+        Refresh the state of each of the given resources.
+        """
+        for resource in resources:
+            resource.refresh()
+
+    def _wait_for(self, resources, target_states, terminal_states, timeout,
+                  interval, wait_for_all):
+        if timeout is None:
+            timeout = self.provider.config.default_wait_timeout
+        if interval is None:
+            interval = self.provider.config.default_wait_interval
+
+        assert timeout >= 0
+        assert interval >= 0
+        assert timeout >= interval
+
+        terminal_states = terminal_states or []
+        resources = list(resources)
+        end_time = time.time() + timeout
+
+        while True:
+            reached = []
+            pending = []
+            terminal = []
+            for resource in resources:
+                state = resource.state
+                if state in target_states:
+                    reached.append(resource)
+                else:
+                    pending.append(resource)
+                    if state in terminal_states:
+                        terminal.append(resource)
+
+            if not pending or (reached and not wait_for_all):
+                log.debug("%s of %s objects successfully reached target"
+                          " state(s): %s", len(reached), len(resources),
+                          target_states)
+                return reached
+            if terminal and (wait_for_all or len(terminal) == len(pending)):
+                raise WaitStateException(
+                    "Object: {0} is in state: {1} which is a terminal state"
+                    " and cannot be waited on.".format(
+                        terminal[0], terminal[0].state))
+
+            log.debug(
+                "%s of %s objects are yet to reach target state(s): %s."
+                " Waiting another %s seconds...", len(pending),
+                len(resources), target_states, int(end_time - time.time()))
+            time.sleep(interval)
+            if time.time() > end_time:
+                raise WaitStateException(
+                    "Waited too long for objects: {0} to become ready."
+                    " {1} objects have not reached target state(s)".format(
+                        pending, len(pending)))
+            self._refresh_all(pending)
+
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        self._wait_for(resources, target_states, terminal_states, timeout,
+                       interval, wait_for_all=True)
+        return True
+
+    def wait_for_any(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        return self._wait_for(resources, target_states, terminal_states,
+                              timeout, interval, wait_for_all=False)
+
+
 class BaseComputeService(ComputeService, BaseCloudService):
 
     def __init__(self, provider):
@@ -46,14 +133,16 @@ class BaseComputeService(ComputeService, BaseCloudService):
 
 
 class BaseVolumeService(
-        BasePageableObjectMixin, VolumeService, BaseCloudService):
+        BasePageableObjectMixin, BaseObjectLifeCycleServiceMixin,
+        VolumeService, BaseCloudService):
 
     def __init__(self, provider):
         super(BaseVolumeService, self).__init__(provider)
 
 
 class BaseSnapshotService(
-        BasePageableObjectMixin, SnapshotService, BaseCloudService):
+        BasePageableObjectMixin, BaseObjectLifeCycleServiceMixin,
+        SnapshotService, BaseCloudService):
 
     def __init__(self, provider):
         super(BaseSnapshotService, self).__init__(provider)
@@ -122,20 +211,72 @@ class BaseVMTypeService(
 
     def __init__(self, provider):
         super(BaseVMTypeService, self).__init__(provider)
+        # Index of the provider's VM types, keyed by id and by name. Built
+        # on first lookup and kept until explicitly invalidated.
+        self._index = None
+        self._index_hits = 0
+        self._index_misses = 0
+
+    @property
+    def index_stats(self):
+        """
+        Lookup statistics for the VM type index.
+
+        A hit is a lookup served from the existing index; a miss is a lookup
+        that required the index to be (re)built from the provider.
+
+        :rtype: ``dict``
+        :return: A dict with ``hits``, ``misses`` and ``size`` keys.
+        """
+        return {'hits': self._index_hits,
+                'misses': self._index_misses,
+                'size': len(self._index['id']) if self._index else 0}
+
+    def invalidate(self):
+        """
+        Discard the VM type index so that it is rebuilt from the provider on
+        next lookup.
+        """
+        log.debug("Invalidating the VM type index for %s", self.provider)
+        self._index = None
+
+    def _build_index(self):
+        index = {'id': {}, 'name': {}}
+        for vm_type in self:
+            index['id'][vm_type.id] = vm_type
+            index['name'].setdefault(vm_type.name, []).append(vm_type)
+        log.debug("Built VM type index with %s entries", len(index['id']))
+        return index
+
+    def _lookup(self, key, value):
+        if self._index is None:
+            self._index_misses += 1
+            self._index = self._build_index()
+        else:
+            self._index_hits += 1
+        return self._index[key].get(value)
 
     def get(self, vm_type_id):
-        vm_type = (t for t in self if t.id == vm_type_id)
-        return next(vm_type, None)
+        return self._lookup('id', vm_type_id)
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        name = kwargs.pop('name', None)
+
+        # All kwargs should have been popped at this time.
+        if len(kwargs) > 0:
+            raise TypeError("Unrecognised parameters for search: %s."
+                            " Supported attributes: %s" % (kwargs, 'name'))
+
+        if name:
+            matches = self._lookup('name', name) or []
+        else:
+            matches = list(self)
+        return ClientPagedResultList(self._provider, matches)
 
 
 class BaseInstanceService(
-        BasePageableObjectMixin, InstanceService, BaseCloudService):
+        BasePageableObjectMixin, BaseObjectLifeCycleServiceMixin,
+        InstanceService, BaseCloudService):
 
     def __init__(self, provider):
         super(BaseInstanceService, self).__init__(provider)
@@ -207,3 +348,198 @@ class BaseRouterService(
             if router:
                 log.info("Router %s successful deleted.", router)
                 router.delete()
+
+
+class BulkItemResult(object):
+    """
+    The outcome of a bulk operation for a single resource.
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.result = None
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "<CB-{0}: {1} ok={2}>".format(self.__class__.__name__,
+                                             self.resource, self.ok)
+
+
+class BulkResult(object):
+    """
+    A report of a bulk operation, holding one :class:`BulkItemResult` per
+    input resource, in input order.
+    """
+
+    def __init__(self, resources):
+        self.items = [BulkItemResult(resource) for resource in resources]
+
+    @property
+    def succeeded(self):
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self):
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self):
+        return all(item.ok for item in self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return "<CB-{0}: {1} succeeded, {2} failed>".format(
+            self.__class__.__name__, len(self.succeeded), len(self.failed))
+
+
+class RegionResultList(object):
+    """
+    The results of a query run across several regions. The regions are
+    queried, and their results fully fetched, in the background; iterating
+    waits for each region in turn and yields ``(region_name, result)``
+    pairs, in region order.
+
+    Regions which fail are skipped during iteration and their exceptions
+    are available through :attr:`errors`.
+    """
+
+    def __init__(self, futures):
+        # An OrderedDict of region name to the future for its query
+        self._futures = futures
+        self._results = {}
+        self._errors = {}
+
+    def _resolve(self, region_name):
+        if (region_name not in self._results and
+                region_name not in self._errors):
+            try:
+                self._results[region_name] = self._futures[
+                    region_name].result()
+            except Exception as e:
+                log.warning("Query failed in region %s: %s", region_name, e)
+                self._errors[region_name] = e
+        return self._results.get(region_name, [])
+
+    @property
+    def regions(self):
+        return list(self._futures.keys())
+
+    @property
+    def errors(self):
+        for region_name in self._futures:
+            self._resolve(region_name)
+        return dict(self._errors)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def get(self, region_name):
+        """
+        Returns the results for a single region, raising the region's error
+        if its query failed.
+        """
+        results = self._resolve(region_name)
+        if region_name in self._errors:
+            raise self._errors[region_name]
+        return results
+
+    def __iter__(self):
+        for region_name in self._futures:
+            for result in self._resolve(region_name):
+                yield (region_name, result)
+
+    def __len__(self):
+        return sum(len(self._resolve(region_name))
+                   for region_name in self._futures)
+
+    def __repr__(self):
+        return "<CB-{0}: {1}>".format(self.__class__.__name__, self.regions)
+
+
+class BaseBulkService(BulkService, BaseCloudService):
+
+    def __init__(self, provider):
+        super(BaseBulkService, self).__init__(provider)
+
+    def _max_workers(self, max_workers):
+        return max_workers or self.provider.config.get(
+            'bulk_max_workers', DEFAULT_BULK_MAX_WORKERS)
+
+    def _run(self, fn, items, max_workers=None):
+        """
+        Apply ``fn`` to the resource of each item on a bounded thread pool,
+        recording the result or error on the item.
+        """
+        if not items:
+            return
+        max_workers = self._max_workers(max_workers)
+
+        def run_one(item):
+            try:
+                item.result = fn(item.resource)
+            except Exception as e:
+                log.debug("Bulk operation failed for %s: %s",
+                          item.resource, e)
+                item.error = e
+
+        log.debug("Running bulk operation over %s resources with %s workers",
+                  len(items), max_workers)
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(items))) as executor:
+            list(executor.map(run_one, items))
+
+    def _batch_delete(self, items):
+        """
+        Delete as many of the given items as possible using native batch
+        calls. Providers with batch APIs should override this.
+
+        :rtype: ``list`` of :class:`BulkItemResult`
+        :return: The items that were not handled and should be deleted
+                 individually.
+        """
+        return items
+
+    def map(self, fn, resources, max_workers=None):
+        report = BulkResult(resources)
+        self._run(fn, report.items, max_workers)
+        return report
+
+    def delete(self, resources, max_workers=None):
+        report = BulkResult(resources)
+        remaining = self._batch_delete(report.items)
+        self._run(lambda resource: resource.delete(), remaining, max_workers)
+        return report
+
+    def map_regions(self, fn, regions=None, max_workers=None):
+        if regions is None:
+            regions = self.provider.compute.regions
+        region_names = [region.name if isinstance(region, Region) else region
+                        for region in regions]
+        # Connect to each region up front, so that the provider cache is only
+        # populated from the calling thread
+        region_providers = [self.provider.for_region(region_name)
+                            for region_name in region_names]
+
+        log.debug("Querying %s regions", len(region_names))
+        executor = ThreadPoolExecutor(max_workers=min(
+            self._max_workers(max_workers), max(len(region_names), 1)))
+        # Iterate over each region's results in its own thread, so that
+        # lazily paged results are fetched concurrently as well
+        futures = OrderedDict(
+            (region_name, executor.submit(
+                lambda provider: list(fn(provider)), region_provider))
+            for region_name, region_provider
+            in zip(region_names, region_providers))
+        # Queued queries still run; the pool's threads exit once done
+        executor.shutdown(wait=False)
+        return RegionResultList(futures)
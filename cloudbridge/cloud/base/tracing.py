@@ -0,0 +1,156 @@
+"""
+Optional tracing of CloudBridge operations.
+
+When tracing is enabled, every service and resource method runs in a span
+named after the class defining it (e.g. ``AWSInstanceService.create`` or
+``BaseObjectLifeCycleMixin.wait_for``), and each underlying API call made
+by a provider is recorded as a child span of the method which made it.
+
+Any tracer implementing the OpenTelemetry ``Tracer`` API may be used:
+
+.. code-block:: python
+
+    from opentelemetry import trace
+    from cloudbridge.cloud.base import tracing
+
+    tracing.enable_tracing(trace.get_tracer('cloudbridge'))
+
+Tracing is disabled by default, in which case methods are not wrapped at all
+and there is no overhead.
+"""
+import functools
+import inspect
+import logging
+import threading
+
+from .instrumentation import Instrumentation
+from .resources import BaseCloudResource
+from .resources import BasePageableObjectMixin
+from .services import BaseCloudService
+
+log = logging.getLogger(__name__)
+
+# Classes whose subclasses' methods are traced
+TRACED_BASE_CLASSES = (BaseCloudService, BaseCloudResource,
+                       BasePageableObjectMixin)
+# Only methods defined in these packages are traced
+TRACED_MODULE_PREFIXES = ('cloudbridge.cloud.base.',
+                          'cloudbridge.cloud.providers.')
+
+_tracer = None
+# (class, attribute name, original function) for each traced method
+_traced_methods = []
+_lock = threading.RLock()
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def enable_tracing(tracer):
+    """
+    Start tracing CloudBridge operations with the given tracer.
+
+    :type tracer: ``opentelemetry.trace.Tracer``
+    :param tracer: A tracer providing ``start_as_current_span`` and
+                   ``start_span``.
+    """
+    global _tracer
+    with _lock:
+        if _tracer is None:
+            Instrumentation.add_global_listener(_record_call_span)
+        _tracer = tracer
+        trace_classes()
+
+
+def disable_tracing():
+    """
+    Stop tracing, restoring all traced methods to their original form.
+    """
+    global _tracer
+    with _lock:
+        if _tracer is None:
+            return
+        _tracer = None
+        Instrumentation.remove_global_listener(_record_call_span)
+        for cls, name, function in _traced_methods:
+            setattr(cls, name, function)
+        del _traced_methods[:]
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        for descendant in _subclasses(subclass):
+            yield descendant
+
+
+def trace_classes():
+    """
+    Wrap the methods of all service and resource classes in spans. Classes
+    defined after tracing was enabled, such as those of providers which are
+    loaded later, are traced when a provider is created.
+    """
+    with _lock:
+        if _tracer is None:
+            return
+        classes = set()
+        for base_class in TRACED_BASE_CLASSES:
+            for subclass in _subclasses(base_class):
+                classes.update(subclass.__mro__)
+        for cls in classes:
+            if cls.__module__.startswith(TRACED_MODULE_PREFIXES):
+                _trace_class(cls)
+
+
+def _trace_class(cls):
+    for name, member in list(vars(cls).items()):
+        if (name.startswith('__') or not inspect.isfunction(member) or
+                getattr(member, '_cb_traced', False)):
+            continue
+        setattr(cls, name, _traced(
+            '{0}.{1}'.format(cls.__name__, name), member))
+        _traced_methods.append((cls, name, member))
+
+
+def _traced(span_name, function):
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return function(self, *args, **kwargs)
+        with tracer.start_as_current_span(span_name) as span:
+            provider = getattr(self, '_provider', None)
+            if provider is not None:
+                span.set_attribute('cloudbridge.provider', provider.name)
+            return function(self, *args, **kwargs)
+
+    wrapper._cb_traced = True
+    return wrapper
+
+
+def _record_call_span(record):
+    """
+    Instrumentation listener which records an API call as a span, as a child
+    of the span active in the calling thread.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return
+    end_time = int(record.timestamp * 1e9)
+    attributes = {
+        'cloudbridge.provider': record.provider,
+        'cloudbridge.service': record.service,
+        'cloudbridge.operation': record.operation,
+        'cloudbridge.retries': record.retries
+    }
+    if record.status is not None:
+        attributes['http.status_code'] = record.status
+    if record.error:
+        attributes['cloudbridge.error'] = record.error
+    span = tracer.start_span(
+        '{0} {1}'.format(record.service, record.operation),
+        start_time=end_time - int(record.latency * 1e9),
+        attributes=attributes)
+    span.end(end_time=end_time)
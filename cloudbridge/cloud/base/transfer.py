@@ -0,0 +1,466 @@
+"""
+Parallel transfers of files to and from object stores, shared by all
+providers.
+
+A file is split into parts, which are sent concurrently on a thread pool
+shared by all transfers in the process. Each part is read straight from the
+file while it is sent, so memory use does not grow with the size of the file.
+Providers implement the steps of their multipart API by subclassing
+:class:`BaseMultipartUpload`, and ranged reads by subclassing
+:class:`BaseRangedDownload`. :class:`RangedReader` gives random access to an
+object through ranged reads.
+"""
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from cloudbridge.cloud.interfaces.exceptions import TransferIntegrityException
+
+import six
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TRANSFER_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_TRANSFER_MAX_WORKERS = 10
+
+# Maximum number of threads of the shared pool, across all transfers
+TRANSFER_POOL_SIZE = 64
+
+# Size of the reads from a response body, and from a file being checksummed
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Default read-ahead buffer size of objects opened for reading
+DEFAULT_READ_BUFFER_SIZE = 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the thread pool shared by all transfers, creating it on first
+    use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TRANSFER_POOL_SIZE)
+        return _executor
+
+
+def http_range(start=None, end=None):
+    """
+    Returns the value of an HTTP Range header for the bytes from ``start`` to
+    ``end``, inclusive, or ``None`` if neither is set.
+    """
+    if start is None and end is None:
+        return None
+    return 'bytes={0}-{1}'.format(start or 0, '' if end is None else end)
+
+
+def run_parts(fn, parts, max_workers):
+    """
+    Calls ``fn`` for each part on the shared thread pool, with at most
+    ``max_workers`` calls in flight, and returns the results in the order of
+    ``parts``.
+
+    No further parts are started once a call fails. The calls already in
+    flight are allowed to finish, and the first error is then raised.
+    """
+    executor = get_executor()
+    results = [None] * len(parts)
+    indexes = {}
+    position = 0
+    pending = set()
+    try:
+        while position < len(parts) or pending:
+            while position < len(parts) and len(pending) < max_workers:
+                future = executor.submit(fn, parts[position])
+                indexes[future] = position
+                pending.add(future)
+                position += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[indexes.pop(future)] = future.result()
+    except Exception:
+        wait(pending)
+        raise
+    return results
+
+
+class FileSlice(object):
+    """
+    A read only, seekable file object over ``length`` bytes of a file,
+    starting at ``offset``. It is passed to clients which stream a request
+    body from a file object.
+    """
+
+    def __init__(self, path, offset, length):
+        self._file = open(path, 'rb')
+        self._offset = offset
+        self._length = length
+        self._position = 0
+        self._file.seek(offset)
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read(self, amt=None):
+        remaining = self._length - self._position
+        if amt is None or amt < 0 or amt > remaining:
+            amt = remaining
+        data = self._file.read(amt)
+        self._position += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._position = min(max(offset, 0), self._length)
+        self._file.seek(self._offset + self._position)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        self._file.close()
+
+
+class FilePart(object):
+    """
+    A byte range of a file, transferred as one part. Parts are numbered
+    from 1.
+    """
+
+    def __init__(self, path, number, offset, length):
+        self.path = path
+        self.number = number
+        self.offset = offset
+        self.length = length
+
+    def open(self):
+        """
+        Returns a :class:`FileSlice` streaming this part's bytes.
+        """
+        return FileSlice(self.path, self.offset, self.length)
+
+    def read(self):
+        """
+        Reads this part's bytes into memory, for clients which cannot stream
+        a request body.
+        """
+        with self.open() as part:
+            return part.read()
+
+    def __repr__(self):
+        return "<FilePart: {0} {1}+{2}>".format(self.number, self.offset,
+                                                self.length)
+
+
+def file_parts(path, size, part_size):
+    """
+    Splits ``size`` bytes of a file into :class:`FilePart` objects of
+    ``part_size`` bytes, the last of which may be shorter.
+    """
+    return [FilePart(path, number, offset, min(part_size, size - offset))
+            for number, offset in enumerate(range(0, size, part_size), 1)]
+
+
+class BaseMultipartUpload(object):
+    """
+    Uploads a file to an object as parts sent in parallel.
+
+    Files no bigger than one part are sent in a single request by
+    ``_upload_single``. Bigger files are uploaded by calling ``_begin``,
+    ``_upload_part`` for every part, and ``_complete`` with the results of
+    the parts, in order. If a part or ``_complete`` fails, ``_abort`` is
+    called to clean up the parts already sent.
+    """
+
+    # The provider's limits on the size and number of parts. The part size
+    # is increased as needed for the file to fit in MAX_PARTS parts.
+    MIN_PART_SIZE = 1
+    MAX_PART_SIZE = None
+    MAX_PARTS = 10000
+
+    def __init__(self, provider, path, part_size=None, max_workers=None):
+        self.provider = provider
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.part_size = self._choose_part_size(
+            part_size or provider.config.transfer_part_size)
+        self.max_workers = (max_workers or
+                            provider.config.transfer_max_workers)
+
+    def _choose_part_size(self, requested):
+        part_size = max(requested, self.MIN_PART_SIZE,
+                        int(math.ceil(float(self.size) / self.MAX_PARTS)))
+        if self.MAX_PART_SIZE:
+            part_size = min(part_size, self.MAX_PART_SIZE)
+        return part_size
+
+    def parts(self):
+        return file_parts(self.path, self.size, self.part_size)
+
+    def upload(self):
+        """
+        Uploads the file.
+
+        :rtype: ``bool``
+        :return: ``True`` if successful.
+        """
+        if self.size <= self.part_size:
+            log.debug("Uploading %s in a single request", self.path)
+            self._upload_single()
+            return True
+
+        parts = self.parts()
+        log.debug("Uploading %s in %d parts of %d bytes, with %d workers",
+                  self.path, len(parts), self.part_size, self.max_workers)
+        self._begin()
+        try:
+            results = run_parts(self._upload_part, parts, self.max_workers)
+            self._complete(results)
+        except Exception:
+            exc_info = sys.exc_info()
+            try:
+                self._abort()
+            except Exception:
+                log.warning("Could not abort the upload of %s", self.path,
+                            exc_info=True)
+            six.reraise(*exc_info)
+        return True
+
+    def _upload_single(self):
+        raise NotImplementedError()
+
+    def _begin(self):
+        raise NotImplementedError()
+
+    def _upload_part(self, part):
+        """
+        Uploads a :class:`FilePart`, and returns what ``_complete`` needs to
+        know about it.
+        """
+        raise NotImplementedError()
+
+    def _complete(self, results):
+        raise NotImplementedError()
+
+    def _abort(self):
+        raise NotImplementedError()
+
+
+class BaseRangedDownload(object):
+    """
+    Downloads an object to a file as byte ranges fetched in parallel, each
+    written at its own offset in the file.
+
+    The parts written so far are recorded in ``<path>.cbparts``, so that an
+    interrupted download can be resumed without fetching them again. The
+    record is only reused if the object and part size are unchanged, and is
+    removed once the download completes.
+    """
+
+    STATE_SUFFIX = '.cbparts'
+
+    def __init__(self, provider, path, size, version, md5=None, parts=None,
+                 max_workers=None):
+        """
+        :type size: ``int``
+        :param size: The size of the object.
+
+        :type version: ``str``
+        :param version: Identifies the object's content (e.g. its ETag), so
+                        that parts of different versions are never mixed.
+
+        :type md5: ``str``
+        :param md5: The hex MD5 digest of the object, if the provider has
+                    one, used to verify the downloaded file.
+
+        :type parts: ``int``
+        :param parts: The number of parts to download. Defaults to as many
+                      as needed to fetch ``transfer_part_size`` bytes each.
+        """
+        self.provider = provider
+        self.path = path
+        self.size = size
+        self.version = version
+        self.md5 = md5
+        if parts:
+            self.part_size = max(int(math.ceil(float(size) / parts)), 1)
+        else:
+            self.part_size = provider.config.transfer_part_size
+        self.max_workers = (max_workers or
+                            provider.config.transfer_max_workers)
+        self.state_path = path + self.STATE_SUFFIX
+
+    def parts(self):
+        return file_parts(self.path, self.size, self.part_size)
+
+    def _state_header(self):
+        return {'size': self.size, 'version': self.version,
+                'part_size': self.part_size}
+
+    def _load_state(self):
+        """
+        Returns the numbers of the parts already written to the file.
+        """
+        if not (os.path.exists(self.state_path) and
+                os.path.exists(self.path)):
+            return set()
+        with open(self.state_path) as state:
+            lines = state.read().splitlines()
+        try:
+            if not lines or json.loads(lines[0]) != self._state_header():
+                log.debug("Not resuming the download to %s, as the object"
+                          " or part size has changed", self.path)
+                return set()
+            # The last line may have been partly written
+            return set(int(line) for line in lines[1:] if line.isdigit())
+        except ValueError:
+            log.debug("Ignoring an unreadable record of the download to %s",
+                      self.path, exc_info=True)
+            return set()
+
+    def download(self, resume=False, verify=False):
+        """
+        Downloads the object.
+
+        :type resume: ``bool``
+        :param resume: Whether to keep the parts of the file written by an
+                       earlier, interrupted, download.
+
+        :type verify: ``bool``
+        :param verify: Whether to check the downloaded file against the
+                       object's MD5 digest, where the provider reports one.
+
+        :rtype: ``bool``
+        :return: ``True`` if successful.
+        """
+        done = self._load_state() if resume else set()
+        with open(self.path, 'r+b' if done else 'wb') as f:
+            f.truncate(self.size)
+        parts = [part for part in self.parts() if part.number not in done]
+        log.debug("Downloading %d of %d parts of %d bytes to %s, with %d"
+                  " workers", len(parts), len(parts) + len(done),
+                  self.part_size, self.path, self.max_workers)
+
+        lock = threading.Lock()
+        with open(self.state_path, 'a' if done else 'w') as state:
+            if not done:
+                state.write(json.dumps(self._state_header()) + '\n')
+                state.flush()
+
+            def download_part(part):
+                self._download_part(part)
+                with lock:
+                    state.write('{0}\n'.format(part.number))
+                    state.flush()
+
+            run_parts(download_part, parts, self.max_workers)
+
+        # A file failing verification must not be resumed, so the record
+        # is removed first
+        os.remove(self.state_path)
+        if verify:
+            self._verify()
+        return True
+
+    def _download_part(self, part):
+        with open(self.path, 'r+b') as f:
+            f.seek(part.offset)
+            self._write_range(f, part.offset, part.offset + part.length - 1)
+            written = f.tell() - part.offset
+        if written != part.length:
+            raise TransferIntegrityException(
+                "Received {0} of the {1} bytes of part {2} of {3}".format(
+                    written, part.length, part.number, self.path))
+
+    def _verify(self):
+        if not self.md5:
+            log.debug("No checksum to verify %s against", self.path)
+            return
+        digest = hashlib.md5()
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        if digest.hexdigest() != self.md5:
+            raise TransferIntegrityException(
+                "The MD5 digest of {0} is {1} instead of {2}".format(
+                    self.path, digest.hexdigest(), self.md5))
+
+    def _write_range(self, stream, start, end):
+        """
+        Writes the bytes of the object from ``start`` to ``end``, inclusive,
+        to ``stream``.
+        """
+        raise NotImplementedError()
+
+
+class RangedReader(io.RawIOBase):
+    """
+    A seekable, read only file object over a bucket object. Each read
+    fetches just the requested bytes with ``iter_content(start, end)``. It
+    is meant to be wrapped in an ``io.BufferedReader``, which reads ahead
+    and so turns small reads into fewer, larger, requests.
+    """
+
+    def __init__(self, bucket_object):
+        super(RangedReader, self).__init__()
+        self._object = bucket_object
+        self._size = None
+        self._position = 0
+
+    @property
+    def size(self):
+        if self._size is None:
+            self._size = self._object.size
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        end = min(self._position + len(b), self.size) - 1
+        if end < self._position:
+            return 0
+        length = 0
+        for chunk in self._object.iter_content(self._position, end):
+            b[length:length + len(chunk)] = chunk
+            length += len(chunk)
+        self._position += length
+        return length
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("Negative seek position {0}".format(offset))
+        self._position = offset
+        return self._position
+
+    def tell(self):
+        return self._position
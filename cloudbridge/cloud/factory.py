@@ -1,7 +1,11 @@
+import hashlib
 import importlib
 import inspect
+import json
 import logging
 import pkgutil
+import threading
+import time
 from collections import defaultdict
 
 from cloudbridge.cloud import providers
@@ -16,6 +20,75 @@ class ProviderList(object):
     AWS = 'aws'
     OPENSTACK = 'openstack'
     AZURE = 'azure'
+    MOCK = 'mock'
+
+
+# Number of seconds after which an unused pooled provider is discarded
+DEFAULT_POOL_IDLE_TIMEOUT = 600
+
+
+class ProviderPool(object):
+
+    """
+    A process-wide pool of provider instances, keyed by a hash of the
+    provider name and its configuration (i.e. credentials and region).
+    Providers which have not been handed out for longer than
+    ``idle_timeout`` seconds are evicted.
+
+    The pool itself may be used from several threads, but the providers it
+    hands out are not thread-safe: their service connections (e.g. boto3
+    resources) must not be used by several threads at once.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._providers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(name, config):
+        """
+        Returns the pool key for a provider name and config. Only a digest is
+        kept, so credentials are not held in the key.
+        """
+        serialized = json.dumps([name, config], sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def _evict_idle(self, now):
+        for key, (_, last_used) in list(self._providers.items()):
+            if now - last_used > self.idle_timeout:
+                log.debug("Evicting idle pooled provider %s", key)
+                del self._providers[key]
+
+    def get_or_create(self, key, create):
+        """
+        Returns the provider pooled under ``key``, or calls ``create`` to
+        construct and pool one. Providers are constructed outside of the
+        pool's lock, so that other lookups do not wait for them. If two
+        threads construct the same provider at once, the first one pooled
+        is returned to both.
+        """
+        with self._lock:
+            now = time.time()
+            self._evict_idle(now)
+            entry = self._providers.get(key)
+            if entry:
+                self._providers[key] = (entry[0], now)
+                return entry[0]
+        provider = create()
+        with self._lock:
+            entry = self._providers.get(key)
+            if entry:
+                provider = entry[0]
+            self._providers[key] = (provider, time.time())
+            return provider
+
+    def clear(self):
+        with self._lock:
+            self._providers.clear()
+
+    def __len__(self):
+        return len(self._providers)
 
 
 class CloudProviderFactory(object):
@@ -23,6 +96,8 @@ class CloudProviderFactory(object):
     """
     Get info and handle on the available cloud provider implementations.
     """
+    # Shared by all factories in the process
+    provider_pool = ProviderPool()
 
     def __init__(self):
         self.provider_list = defaultdict(dict)
@@ -112,13 +187,19 @@ class CloudProviderFactory(object):
         log.info("List of available providers: %s", self.provider_list)
         return self.provider_list
 
-    def create_provider(self, name, config):
+    def create_provider(self, name, config, pooled=False):
         """
         Searches all available providers for a CloudProvider interface with the
         given name, and instantiates it based on the given config dictionary,
         where the config dictionary is a dictionary understood by that
         cloud provider.
 
+        If ``pooled`` is set, a provider previously created with the same
+        name and config is returned instead, along with its already
+        established sessions and connections. Pooled providers are shared
+        between callers, so their config should not be modified. They are
+        not thread-safe, and must not be used by several threads at once.
+
         :type name: str
         :param name: Cloud provider name: one of ``aws``, ``openstack``.
 
@@ -127,6 +208,10 @@ class CloudProviderFactory(object):
                        be accessed using dot notation. See specific provider
                        implementation for the required fields.
 
+        :type pooled: ``bool``
+        :param pooled: Whether to return a shared provider from the
+                       process-wide provider pool.
+
         :return:  a concrete provider instance
         :rtype: ``object`` of :class:`.CloudProvider`
         """
@@ -141,6 +226,10 @@ class CloudProviderFactory(object):
                 ' found'.format(name))
         log.debug("Found provider name: %s with these config "
                   " details: %s", name, config)
+        if pooled:
+            return self.provider_pool.get_or_create(
+                ProviderPool.key_for(name, config),
+                lambda: provider_class(config))
         return provider_class(config)
 
     def get_provider_class(self, name, get_mock=False):
@@ -153,7 +242,8 @@ class CloudProviderFactory(object):
 
         :rtype: provider class or ``None``
         :return: A class corresponding to the requested provider or ``None``
-                 if the provider was not found.
+                 if the provider was not found. Providers which only have a
+                 mock version (e.g. ``mock``) always return that version.
         """
         log.debug("Returning a class for the %s provider", name)
         impl = self.list_providers().get(name)
@@ -162,6 +252,10 @@ class CloudProviderFactory(object):
                 log.debug("param get_mock set to True, returning "
                           "a mock version of the provider %s", name)
                 return impl["mock_class"]
+            elif not impl.get("class"):
+                log.debug("Returning the mock provider %s, which has no"
+                          " real version", name)
+                return impl["mock_class"]
             else:
                 log.debug("Returning the real version of %s", name)
                 return impl["class"]
@@ -179,7 +273,8 @@ class CloudProviderFactory(object):
 
         :rtype: type ``class`` or ``None``
         :return: A list of all available provider classes or an empty list
-        if none found.
+        if none found. Providers which only have a mock version are left out
+        unless ``get_mock`` is set.
         """
         all_providers = []
         for impl in self.list_providers().values():
@@ -187,7 +282,7 @@ class CloudProviderFactory(object):
                 log.debug("param get_mock set to True, appending "
                           "a mock version of the provider %s", impl)
                 all_providers.append(impl["mock_class"])
-            else:
+            elif impl.get("class"):
                 all_providers.append(impl["class"])
         log.info("List of provider classes: %s", all_providers)
         return all_providers
@@ -37,6 +37,15 @@ class ProviderInternalException(CloudBridgeBaseException):
     pass
 
 
+class TransferIntegrityException(CloudBridgeBaseException):
+    """
+    Marker interface for transfers of corrupt or incomplete data.
+    Thrown when a downloaded byte range is shorter than requested, or a
+    downloaded file does not match the checksum of its object.
+    """
+    pass
+
+
 class ProviderConnectionException(CloudBridgeBaseException):
     """
     Marker interface for connection errors to a cloud provider.
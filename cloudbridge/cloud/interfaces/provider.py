@@ -192,6 +192,48 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractproperty
+    def bulk(self):
+        """
+        Provides access to parallel and batched operations over many
+        resources at once.
+
+        Example:
+
+        .. code-block:: python
+
+            volumes = provider.storage.volumes.find(name='scratch')
+            report = provider.bulk.delete(volumes, max_workers=20)
+            print(len(report.succeeded), len(report.failed))
+
+        :rtype: :class:`.BulkService`
+        :return: a BulkService object
+        """
+        pass
+
+    @abstractmethod
+    def for_region(self, region_name):
+        """
+        Returns a provider for the given region, using the same credentials
+        and configuration as this one. Providers are cached per region, so
+        repeated calls reuse the same connections.
+
+        Example:
+
+        .. code-block:: python
+
+            west = provider.for_region('us-west-2')
+            print(west.compute.instances.list())
+
+        :type region_name: ``str``
+        :param region_name: The name of the region to connect to.
+
+        :rtype: :class:`.CloudProvider`
+        :return: A provider connected to the given region. If the region is
+                 this provider's own region, this provider is returned.
+        """
+        pass
+
 
 class TestMockHelperMixin(object):
     """
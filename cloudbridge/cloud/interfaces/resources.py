@@ -146,6 +146,75 @@ class Configuration(dict):
         :return: Whether debug mode is on.
         """
 
+    @property
+    def http_pool_size(self):
+        """
+        Gets the maximum number of HTTP connections each underlying client
+        keeps open to a single host. This should be at least the number of
+        threads that share a provider. ``None`` leaves the SDK default in
+        place.
+
+        :rtype: ``int``
+        :return: The connection pool size per host.
+        """
+        pass
+
+    @property
+    def http_connect_timeout(self):
+        """
+        Gets the number of seconds to wait for a connection to a provider
+        endpoint to be established. ``None`` leaves the SDK default in place.
+
+        :rtype: ``float``
+        :return: The connect timeout in seconds.
+        """
+        pass
+
+    @property
+    def http_read_timeout(self):
+        """
+        Gets the number of seconds to wait for data from a provider endpoint
+        once connected. ``None`` leaves the SDK default in place.
+
+        :rtype: ``float``
+        :return: The read timeout in seconds.
+        """
+        pass
+
+    @property
+    def http_keep_alive(self):
+        """
+        A flag indicating whether HTTP connections are kept open and reused
+        between requests.
+
+        :rtype: ``bool``
+        :return: Whether connections are reused.
+        """
+        pass
+
+    @property
+    def transfer_part_size(self):
+        """
+        Gets the size, in bytes, of the parts in which files are uploaded to
+        and downloaded from object stores. Providers raise it as needed to
+        stay within their limits on the size and number of parts.
+
+        :rtype: ``int``
+        :return: The part size in bytes.
+        """
+        pass
+
+    @property
+    def transfer_max_workers(self):
+        """
+        Gets the maximum number of parts of a single file transferred
+        concurrently.
+
+        :rtype: ``int``
+        :return: The number of concurrent part transfers.
+        """
+        pass
+
 
 class ObjectLifeCycleMixin(object):
 
@@ -2126,16 +2195,55 @@ class BucketObject(CloudResource):
         pass
 
     @abstractmethod
-    def iter_content(self):
+    def iter_content(self, start=None, end=None):
         """
         Returns this object's content as an iterable.
 
+        Only part of the object is fetched if ``start`` or ``end`` is given.
+        As in an HTTP Range header, ``end`` is the offset of the last byte
+        returned, not the one after it.
+
+        .. code-block:: python
+
+            # The last 1024 bytes of the object
+            tail = b''.join(obj.iter_content(start=obj.size - 1024))
+
+        :type start: ``int``
+        :param start: The offset of the first byte to return. Defaults to
+                      the start of the object.
+
+        :type end: ``int``
+        :param end: The offset of the last byte to return. Defaults to the
+                    end of the object.
+
         :rtype: Iterable
         :return: An iterable of the file contents
 
         """
         pass
 
+    @abstractmethod
+    def open(self, buffer_size=None):
+        """
+        Returns a seekable, read only, binary file object over this object's
+        content, for formats read out of order. Only the bytes read, plus
+        a read-ahead buffer, are fetched.
+
+        .. code-block:: python
+
+            with obj.open() as f:
+                f.seek(-8, os.SEEK_END)
+                footer = f.read(8)
+
+        :type buffer_size: ``int``
+        :param buffer_size: The minimum number of bytes fetched by each
+                            request. Defaults to 1 MiB.
+
+        :rtype: ``io.BufferedReader``
+        :return: A file object.
+        """
+        pass
+
     @abstractmethod
     def save_content(self, target_stream):
         """
@@ -2143,6 +2251,46 @@ class BucketObject(CloudResource):
         """
         pass
 
+    @abstractmethod
+    def download_to_file(self, path, parts=None, max_workers=None,
+                         resume=False, verify=False):
+        """
+        Download this object to a file, as byte ranges fetched in parallel
+        and written in place.
+
+        .. code-block:: python
+
+            obj.download_to_file('/data/sample.bam', parts=32, verify=True)
+
+        :type path: ``str``
+        :param path: The file to write. It is created, or overwritten unless
+                     resuming.
+
+        :type parts: ``int``
+        :param parts: The number of byte ranges to fetch. Defaults to ranges
+                      of the ``transfer_part_size`` config value.
+
+        :type max_workers: ``int``
+        :param max_workers: The maximum number of ranges fetched
+                            concurrently. Defaults to the
+                            ``transfer_max_workers`` config value.
+
+        :type resume: ``bool``
+        :param resume: Whether to continue an interrupted download to the
+                       same file, fetching only the missing ranges. The
+                       download starts over if the object has changed.
+
+        :type verify: ``bool``
+        :param verify: Whether to check the file against the object's MD5
+                       digest, where the provider reports one. A
+                       ``TransferIntegrityException`` is raised if they
+                       differ.
+
+        :rtype: ``bool``
+        :return: ``True`` if successful.
+        """
+        pass
+
     @abstractmethod
     def upload(self, source_stream):
         """
@@ -2155,12 +2303,27 @@ class BucketObject(CloudResource):
         pass
 
     @abstractmethod
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, part_size=None, max_workers=None):
         """
         Store the contents of the file pointed by the "path" variable.
 
+        Files larger than ``part_size`` are uploaded as parts sent in
+        parallel, read from the file as they are sent.
+
         :type path: ``str``
         :param path: Absolute path to the file to be uploaded to S3.
+
+        :type part_size: ``int``
+        :param part_size: The size of the parts in bytes. Defaults to the
+                          ``transfer_part_size`` config value.
+
+        :type max_workers: ``int``
+        :param max_workers: The maximum number of parts uploaded
+                            concurrently. Defaults to the
+                            ``transfer_max_workers`` config value.
+
+        :rtype: ``bool``
+        :return: ``True`` if successful.
         """
         pass
 
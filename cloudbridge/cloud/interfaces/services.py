@@ -26,6 +26,70 @@ class CloudService(object):
         pass
 
 
+class ObjectLifeCycleServiceMixin(object):
+    """
+    A mixin for services whose resources have a lifecycle, allowing a set of
+    resources to be waited on together. Each poll refreshes the whole set,
+    using a single request where the provider supports it.
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        """
+        Wait until all of the given resources reach one of the target states.
+
+        Example:
+
+        .. code-block:: python
+
+            insts = [provider.compute.instances.create(...) for _ in range(10)]
+            provider.compute.instances.wait_for_all(
+                insts, [InstanceState.RUNNING],
+                terminal_states=[InstanceState.ERROR])
+
+        :type resources: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :param resources: The resources to wait on.
+
+        :type target_states: ``list`` of states
+        :param target_states: The states to wait for.
+
+        :type terminal_states: ``list`` of states
+        :param terminal_states: If any resource reaches one of these states,
+                                a WaitStateException is raised.
+
+        :type timeout: ``int``
+        :param timeout: The maximum length of time (in seconds) to wait for.
+                        Defaults to the provider's ``default_wait_timeout``.
+
+        :type interval: ``int``
+        :param interval: The interval (in seconds) at which to poll. Defaults
+                         to the provider's ``default_wait_interval``.
+
+        :rtype: ``bool``
+        :return: ``True`` once all resources have reached a target state.
+                 A WaitStateException is raised on timeout.
+        """
+        pass
+
+    @abstractmethod
+    def wait_for_any(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        """
+        Wait until at least one of the given resources reaches one of the
+        target states.
+
+        The parameters are the same as for :meth:`wait_for_all`, except
+        that a WaitStateException is only raised for terminal states once
+        every resource has reached one.
+
+        :rtype: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :return: The resources that have reached a target state.
+        """
+        pass
+
+
 class ComputeService(CloudService):
     """
     The compute service interface is a collection of services that provides
@@ -125,7 +189,8 @@ class ComputeService(CloudService):
         pass
 
 
-class InstanceService(PageableObjectMixin, CloudService):
+class InstanceService(PageableObjectMixin, ObjectLifeCycleServiceMixin,
+                      CloudService):
     """
     Provides access to instances in a provider, including creating,
     listing and deleting instances.
@@ -290,7 +355,8 @@ class InstanceService(PageableObjectMixin, CloudService):
         pass
 
 
-class VolumeService(PageableObjectMixin, CloudService):
+class VolumeService(PageableObjectMixin, ObjectLifeCycleServiceMixin,
+                    CloudService):
     """
     Base interface for a Volume Service.
     """
@@ -357,7 +423,8 @@ class VolumeService(PageableObjectMixin, CloudService):
         pass
 
 
-class SnapshotService(PageableObjectMixin, CloudService):
+class SnapshotService(PageableObjectMixin, ObjectLifeCycleServiceMixin,
+                      CloudService):
     """
     Base interface for a Snapshot Service.
     """
@@ -1262,3 +1329,107 @@ class RegionService(PageableObjectMixin, CloudService):
         :return: a Region object
         """
         pass
+
+
+class BulkService(CloudService):
+
+    """
+    Base interface for running an operation over many resources at once.
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def map(self, fn, resources, max_workers=None):
+        """
+        Apply a function to each resource in a list, in parallel.
+
+        Example:
+
+        .. code-block:: python
+
+            def rename(vol):
+                vol.name = 'archived-' + vol.name
+
+            report = provider.bulk.map(rename, provider.storage.volumes)
+            for item in report.failed:
+                print(item.resource.id, item.error)
+
+        :type fn: ``callable``
+        :param fn: A function accepting a single resource. Its return value is
+                   recorded as the result for that resource.
+
+        :type resources: ``list`` of :class:`.CloudResource`
+        :param resources: The resources to apply ``fn`` to.
+
+        :type max_workers: ``int``
+        :param max_workers: The maximum number of concurrent calls. Defaults
+                            to the ``bulk_max_workers`` config value.
+
+        :rtype: :class:`.BulkResult`
+        :return: A report with one entry per resource, in input order.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, resources, max_workers=None):
+        """
+        Delete a list of resources, using the provider's native batch calls
+        where available and falling back to parallel individual deletes.
+
+        Example:
+
+        .. code-block:: python
+
+            report = provider.bulk.delete(provider.compute.instances.list())
+            if not report.ok:
+                print(report.failed)
+
+        :type resources: ``list`` of :class:`.CloudResource`
+        :param resources: The resources to delete.
+
+        :type max_workers: ``int``
+        :param max_workers: The maximum number of concurrent calls.
+
+        :rtype: :class:`.BulkResult`
+        :return: A report with one entry per resource, in input order.
+        """
+        pass
+
+    @abstractmethod
+    def map_regions(self, fn, regions=None, max_workers=None):
+        """
+        Run a query against several regions at once. Each region is queried
+        through its own cached provider (see
+        :meth:`.CloudProvider.for_region`), so the total time taken is
+        roughly that of the slowest region.
+
+        Example:
+
+        .. code-block:: python
+
+            inventory = provider.bulk.map_regions(
+                lambda region_provider: region_provider.compute.instances)
+            for region_name, instance in inventory:
+                print(region_name, instance.id)
+
+        :type fn: ``callable``
+        :param fn: A function accepting a region specific provider and
+                   returning an iterable of results for that region. The
+                   iterable is consumed in the region's worker thread, so
+                   returning a service (rather than calling ``list()``, which
+                   is limited to ``default_result_limit`` results) pages
+                   through all of its results concurrently with the other
+                   regions.
+
+        :type regions: ``list`` of ``str`` or :class:`.Region`
+        :param regions: The regions to query. Defaults to all regions
+                        available to this provider.
+
+        :type max_workers: ``int``
+        :param max_workers: The maximum number of regions queried
+                            concurrently.
+
+        :rtype: :class:`.RegionResultList`
+        :return: A lazily evaluated list of ``(region_name, result)`` pairs.
+        """
+        pass
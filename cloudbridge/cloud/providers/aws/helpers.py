@@ -9,6 +9,9 @@ from botocore.utils import merge_dicts
 
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.base.transfer import BaseMultipartUpload
+from cloudbridge.cloud.base.transfer import BaseRangedDownload
+from cloudbridge.cloud.base.transfer import READ_CHUNK_SIZE
 
 
 def trim_empty_params(params_dict):
@@ -56,6 +59,9 @@ class BotoGenericService(object):
     resource, collection and paging support to implement
     basic cloudbridge methods.
     """
+    # Maximum number of values AWS accepts for a single filter
+    MAX_FILTER_VALUES = 200
+
     def __init__(self, provider, cb_resource, boto_conn, boto_collection_name):
         """
         :type provider: :class:`AWSCloudProvider`
@@ -119,6 +125,33 @@ class BotoGenericService(object):
             else:
                 raise exc
 
+    def get_many(self, filter_name, resource_ids):
+        """
+        Returns the current boto resources for a set of ids, using as few
+        requests as possible. Ids that no longer exist are omitted.
+
+        :type filter_name: ``str``
+        :param filter_name: Name of the filter that matches the resource id
+                            (e.g. instance-id)
+
+        :type resource_ids: ``list`` of ``str``
+        :param resource_ids: IDs of the boto resources to fetch
+
+        :rtype: ``dict``
+        :return: A dict mapping each id found to its boto resource
+        """
+        found = {}
+        for i in range(0, len(resource_ids), self.MAX_FILTER_VALUES):
+            collection = self.boto_collection.filter(Filters=[{
+                'Name': filter_name,
+                'Values': resource_ids[i:i + self.MAX_FILTER_VALUES]
+                }])
+            for obj in collection:
+                found[obj.id] = obj
+        log.debug("Retrieved %s of %s %s", len(found), len(resource_ids),
+                  self.boto_collection_model.name)
+        return found
+
     def _get_list_operation(self):
         """
         This function discovers the list operation for a particular resource
@@ -325,3 +358,79 @@ class BotoS3Service(BotoGenericService):
         super(BotoS3Service, self).__init__(
             provider, cb_resource, provider.s3_conn,
             boto_collection_name)
+
+
+class S3MultipartUpload(BaseMultipartUpload):
+    """
+    Uploads a file to an S3 object with the multipart upload API.
+    """
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+    MAX_PARTS = 10000
+
+    def __init__(self, provider, obj, path, part_size=None, max_workers=None):
+        """
+        :type obj: ``boto3.resources.factory.s3.Object``
+        :param obj: The object to upload to.
+        """
+        super(S3MultipartUpload, self).__init__(provider, path, part_size,
+                                                max_workers)
+        # The client is used rather than the object, as it can be shared
+        # between threads
+        self._client = obj.meta.client
+        self._params = {'Bucket': obj.bucket_name, 'Key': obj.key}
+        self._upload_id = None
+
+    def _upload_single(self):
+        with open(self.path, 'rb') as body:
+            self._client.put_object(Body=body, **self._params)
+
+    def _begin(self):
+        self._upload_id = self._client.create_multipart_upload(
+            **self._params)['UploadId']
+
+    def _upload_part(self, part):
+        with part.open() as body:
+            response = self._client.upload_part(
+                UploadId=self._upload_id, PartNumber=part.number,
+                Body=body, ContentLength=part.length, **self._params)
+        return {'ETag': response['ETag'], 'PartNumber': part.number}
+
+    def _complete(self, results):
+        self._client.complete_multipart_upload(
+            UploadId=self._upload_id, MultipartUpload={'Parts': results},
+            **self._params)
+
+    def _abort(self):
+        self._client.abort_multipart_upload(UploadId=self._upload_id,
+                                            **self._params)
+
+
+class S3RangedDownload(BaseRangedDownload):
+    """
+    Downloads an S3 object with ranged GET requests. Each request is made
+    conditional on the object's ETag, so that a download fails rather than
+    mixing the content of two versions of the object.
+    """
+
+    def __init__(self, provider, obj, path, parts=None, max_workers=None):
+        """
+        :type obj: ``boto3.resources.factory.s3.Object``
+        :param obj: The object (or object summary) to download.
+        """
+        self._client = obj.meta.client
+        self._params = {'Bucket': obj.bucket_name, 'Key': obj.key}
+        head = self._client.head_object(**self._params)
+        etag = head['ETag'].strip('"')
+        # The ETag of a multipart upload is not the MD5 of the object
+        super(S3RangedDownload, self).__init__(
+            provider, path, head['ContentLength'], etag,
+            md5=None if '-' in etag else etag, parts=parts,
+            max_workers=max_workers)
+        self._params['IfMatch'] = head['ETag']
+
+    def _write_range(self, stream, start, end):
+        body = self._client.get_object(
+            Range='bytes={0}-{1}'.format(start, end), **self._params)['Body']
+        for chunk in iter(lambda: body.read(READ_CHUNK_SIZE), b''):
+            stream.write(chunk)
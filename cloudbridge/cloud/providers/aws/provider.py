@@ -1,8 +1,12 @@
 """Provider implementation based on boto library for AWS-compatible clouds."""
 import logging as log
 import os
+import threading
+import time
 
 import boto3
+
+from botocore.config import Config
 try:
     # These are installed only for the case of a dev instance
     from moto.packages.responses import responses
@@ -12,8 +16,12 @@ except ImportError:
     log.debug('[aws provider] moto library not available!')
 
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.ratelimit import operation_kind
+from cloudbridge.cloud.base.ratelimit import parse_retry_after
+from cloudbridge.cloud.base.transfer import READ_CHUNK_SIZE
 from cloudbridge.cloud.interfaces import TestMockHelperMixin
 
+from .services import AWSBulkService
 from .services import AWSComputeService
 from .services import AWSNetworkingService
 from .services import AWSSecurityService
@@ -23,7 +31,14 @@ from .services import AWSStorageService
 class AWSCloudProvider(BaseCloudProvider):
     '''AWS cloud provider interface'''
     PROVIDER_ID = 'aws'
+    # Error codes returned by EC2 and S3 for throttled requests
+    THROTTLE_ERROR_CODES = ('RequestLimitExceeded', 'Throttling',
+                            'ThrottlingException', 'RequestThrottled',
+                            'SlowDown', 'TooManyRequestsException')
     AWS_INSTANCE_DATA_DEFAULT_URL = "http://cloudve.org/cb-aws-vmtypes.json"
+    AWS_INSTANCE_DATA_DEFAULT_TTL = 86400  # in seconds
+    # Delay before a failed refresh of the catalog is retried
+    AWS_INSTANCE_DATA_RETRY_INTERVAL = 300  # in seconds
 
     def __init__(self, config):
         super(AWSCloudProvider, self).__init__(config)
@@ -50,8 +65,24 @@ class AWSCloudProvider(BaseCloudProvider):
             'verify': self._get_config_value('s3_validate_certs', True),
             'endpoint_url': self._get_config_value('s3_endpoint_url', None)
         }
+        # Size of the chunks yielded by BucketObject.iter_content
+        self.s3_read_chunk_size = int(self._get_config_value(
+            's3_read_chunk_size', READ_CHUNK_SIZE))
+        # HTTP settings shared by all service connections. Botocore's own
+        # retries are limited to the same number as throttled requests.
+        self.botocore_cfg = Config(retries={
+            'max_attempts': self.rate_limiter.max_retries}, **{
+            k: v for k, v in {
+                'max_pool_connections': self.config.http_pool_size,
+                'connect_timeout': self.config.http_connect_timeout,
+                'read_timeout': self.config.http_read_timeout
+            }.items() if v is not None})
 
-        # service connections, lazily initialized
+        # service connections, lazily initialized. Boto3 sessions are not
+        # thread-safe, so their creation is serialized. The boto3 resources
+        # themselves are not thread-safe either, so a provider must not be
+        # used by several threads at once.
+        self._conn_lock = threading.RLock()
         self._session = None
         self._ec2_conn = None
         self._vpc_conn = None
@@ -62,27 +93,47 @@ class AWSCloudProvider(BaseCloudProvider):
         self._networking = AWSNetworkingService(self)
         self._security = AWSSecurityService(self)
         self._storage = AWSStorageService(self)
+        self._bulk = AWSBulkService(self)
 
     @property
     def session(self):
         '''Get a low-level session object or create one if needed'''
         if not self._session:
-            if self.config.debug_mode:
-                boto3.set_stream_logger(level=log.DEBUG)
-            self._session = boto3.session.Session(
-                region_name=self.region_name, **self.session_cfg)
+            with self._conn_lock:
+                if not self._session:
+                    if self.config.debug_mode:
+                        boto3.set_stream_logger(level=log.DEBUG)
+                    self._session = boto3.session.Session(
+                        region_name=self.region_name, **self.session_cfg)
+                    if not self.config.http_keep_alive:
+                        self._session.events.register(
+                            'request-created', self._close_connection)
+                    for service in ('ec2', 's3'):
+                        self._session.events.register(
+                            'before-call.' + service, self._rate_limit_call)
+                        self._session.events.register(
+                            'before-call.' + service, self._start_call)
+                        self._session.events.register(
+                            'after-call.' + service, self._end_call)
+                        # Must run before botocore's own retry handler
+                        self._session.events.register_first(
+                            'needs-retry.' + service, self._throttle_retry)
         return self._session
 
     @property
     def ec2_conn(self):
         if not self._ec2_conn:
-            self._ec2_conn = self._connect_ec2()
+            with self._conn_lock:
+                if not self._ec2_conn:
+                    self._ec2_conn = self._connect_ec2()
         return self._ec2_conn
 
     @property
     def s3_conn(self):
         if not self._s3_conn:
-            self._s3_conn = self._connect_s3()
+            with self._conn_lock:
+                if not self._s3_conn:
+                    self._s3_conn = self._connect_s3()
         return self._s3_conn
 
     @property
@@ -101,6 +152,11 @@ class AWSCloudProvider(BaseCloudProvider):
     def storage(self):
         return self._storage
 
+    def _region_config(self, region_name):
+        config = dict(self.config)
+        config['aws_region_name'] = region_name
+        return config
+
     def _connect_ec2(self):
         """
         Get a boto ec2 connection object.
@@ -109,19 +165,71 @@ class AWSCloudProvider(BaseCloudProvider):
 
     def _conect_ec2_region(self, region_name=None):
         '''Get an EC2 resource object'''
-        return self.session.resource(
-            'ec2', region_name=region_name, **self.ec2_cfg)
+        with self._conn_lock:
+            return self.session.resource(
+                'ec2', region_name=region_name, config=self.botocore_cfg,
+                **self.ec2_cfg)
 
     def _connect_s3(self):
         '''Get an S3 resource object'''
-        return self.session.resource(
-            's3', region_name=self.region_name, **self.s3_cfg)
+        with self._conn_lock:
+            return self.session.resource(
+                's3', region_name=self.region_name, config=self.botocore_cfg,
+                **self.s3_cfg)
+
+    @staticmethod
+    def _close_connection(request, **kwargs):
+        '''Ask the endpoint to close the connection after the request'''
+        request.headers['Connection'] = 'close'
+
+    def _rate_limit_call(self, model, **kwargs):
+        '''Wait for the rate limiter before making an API call'''
+        self.rate_limiter.acquire(operation_kind(model.name))
+
+    def _start_call(self, context, **kwargs):
+        '''Note the start time of an API call, after any rate limiting'''
+        context['cb_start_time'] = time.time()
+
+    def _end_call(self, http_response, parsed, model, context, **kwargs):
+        '''Report a completed API call to the instrumentation listeners'''
+        if not self.instrumentation.enabled or 'cb_start_time' not in context:
+            return
+        metadata = parsed.get('ResponseMetadata', {})
+        length = http_response.headers.get('Content-Length')
+        self.instrumentation.record(
+            model.service_model.endpoint_prefix, model.name,
+            time.time() - context['cb_start_time'],
+            status=http_response.status_code,
+            retries=metadata.get('RetryAttempts', 0),
+            bytes_received=int(length) if length else None,
+            error=parsed.get('Error', {}).get('Code'))
+
+    def _throttle_retry(self, attempts, operation, response=None, **kwargs):
+        '''
+        Back off and retry throttled API calls. Returns the number of seconds
+        to wait before retrying, or None to leave the decision to botocore.
+        '''
+        if response is None:
+            return None
+        http_response, parsed = response
+        kind = operation_kind(operation.name)
+        error_code = parsed.get('Error', {}).get('Code')
+        if (error_code not in self.THROTTLE_ERROR_CODES and
+                http_response.status_code != 429):
+            if http_response.status_code < 400:
+                self.rate_limiter.succeeded(kind)
+            return None
+        return self.rate_limiter.throttled(
+            kind, attempts,
+            parse_retry_after(http_response.headers.get('Retry-After')))
 
 
 class MockAWSCloudProvider(AWSCloudProvider, TestMockHelperMixin):
 
     def __init__(self, config):
         super(MockAWSCloudProvider, self).__init__(config)
+        # Do not let mocked instance data leak into the on-disk cache
+        self.config.setdefault('aws_instance_info_cache_path', None)
 
     def setUpMock(self):
         """
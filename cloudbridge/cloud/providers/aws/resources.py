@@ -6,6 +6,8 @@ import inspect
 import logging
 
 from botocore.exceptions import ClientError
+from botocore.exceptions import IncompleteReadError
+from botocore.exceptions import ReadTimeoutError
 
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseAttachmentInfo
@@ -32,6 +34,9 @@ from cloudbridge.cloud.base.resources import BaseVMFirewallRuleContainer
 from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import StreamingResultList
+from cloudbridge.cloud.base.transfer import READ_CHUNK_SIZE
+from cloudbridge.cloud.base.transfer import http_range
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
@@ -43,7 +48,11 @@ from cloudbridge.cloud.interfaces.resources import SubnetState
 from cloudbridge.cloud.interfaces.resources import TrafficDirection
 from cloudbridge.cloud.interfaces.resources import VolumeState
 
+from urllib3.exceptions import ReadTimeoutError as URLLib3ReadTimeoutError
+
 from .helpers import BotoEC2Service
+from .helpers import S3MultipartUpload
+from .helpers import S3RangedDownload
 from .helpers import find_tag_value
 from .helpers import trim_empty_params
 
@@ -251,8 +260,8 @@ class AWSInstance(BaseInstance):
 
     @property
     def vm_type(self):
-        return self._provider.compute.vm_types.find(
-            name=self._ec2_instance.instance_type)[0]
+        return self._provider.compute.vm_types.get(
+            self._ec2_instance.instance_type)
 
     def reboot(self):
         self._ec2_instance.reboot()
@@ -717,21 +726,59 @@ class AWSVMFirewallRule(BaseVMFirewallRule):
 class AWSBucketObject(BaseBucketObject):
 
     class BucketObjIterator():
-        CHUNK_SIZE = 4096
+        """
+        Streams the body of an S3 GET response, reading straight from the
+        underlying urllib3 response. The number of bytes read is checked
+        against the response's ``ContentLength`` at the end of the content.
+        """
+        # Default size of the chunks yielded when iterating
+        CHUNK_SIZE = READ_CHUNK_SIZE
 
-        def __init__(self, body):
+        def __init__(self, body, chunk_size=None, content_length=None):
             self.body = body
+            self.chunk_size = chunk_size or self.CHUNK_SIZE
+            # pylint:disable=protected-access
+            self._raw = body._raw_stream
+            self._content_length = content_length
+            self._amount_read = 0
 
         def __iter__(self):
             while True:
-                data = self.read(self.CHUNK_SIZE)
+                data = self.read(self.chunk_size)
                 if data:
                     yield data
                 else:
                     break
 
-        def read(self, length):
-            return self.body.read(amt=length)
+        def _count(self, amount, requested):
+            self._amount_read += amount
+            if ((requested is None or (not amount and requested > 0)) and
+                    self._content_length is not None and
+                    self._amount_read != int(self._content_length)):
+                raise IncompleteReadError(
+                    actual_bytes=self._amount_read,
+                    expected_bytes=int(self._content_length))
+            return amount
+
+        def read(self, length=None):
+            try:
+                data = self._raw.read(length)
+            except URLLib3ReadTimeoutError as e:
+                raise ReadTimeoutError(endpoint_url=e.url, error=e)
+            self._count(len(data), length)
+            return data
+
+        def readinto(self, buffer):
+            """
+            Reads up to ``len(buffer)`` bytes into a ``bytearray`` or
+            ``memoryview``, and returns the number of bytes read, which is 0
+            at the end of the content.
+            """
+            try:
+                count = self._raw.readinto(buffer)
+            except URLLib3ReadTimeoutError as e:
+                raise ReadTimeoutError(endpoint_url=e.url, error=e)
+            return self._count(count, len(buffer))
 
         def close(self):
             return self.body.close()
@@ -750,20 +797,36 @@ class AWSBucketObject(BaseBucketObject):
 
     @property
     def size(self):
-        return self._obj.size
+        # Listed objects are ObjectSummary resources, and fetched objects
+        # are Object resources, which name the size differently
+        try:
+            return self._obj.size
+        except AttributeError:
+            return self._obj.content_length
 
     @property
     def last_modified(self):
         return self._obj.last_modified.strftime("%Y-%m-%dT%H:%M:%S.%f")
 
-    def iter_content(self):
-        return self.BucketObjIterator(self._obj.get().get('Body'))
+    def iter_content(self, start=None, end=None):
+        byte_range = http_range(start, end)
+        response = (self._obj.get(Range=byte_range) if byte_range
+                    else self._obj.get())
+        return self.BucketObjIterator(response.get('Body'),
+                                      self._provider.s3_read_chunk_size,
+                                      response.get('ContentLength'))
+
+    def download_to_file(self, path, parts=None, max_workers=None,
+                         resume=False, verify=False):
+        return S3RangedDownload(self._provider, self._obj, path, parts,
+                                max_workers).download(resume, verify)
 
     def upload(self, data):
         self._obj.put(Body=data)
 
-    def upload_from_file(self, path):
-        self._obj.upload_file(path)
+    def upload_from_file(self, path, part_size=None, max_workers=None):
+        return S3MultipartUpload(self._provider, self._obj, path, part_size,
+                                 max_workers).upload()
 
     def delete(self):
         self._obj.delete()
@@ -813,18 +876,37 @@ class AWSBucketContainer(BaseBucketContainer):
         except ClientError:
             return None
 
-    def list(self, limit=None, marker=None, prefix=None):
-        if prefix:
-            # pylint:disable=protected-access
-            boto_objs = self.bucket._bucket.objects.filter(Prefix=prefix)
-        else:
-            # pylint:disable=protected-access
-            boto_objs = self.bucket._bucket.objects.all()
-        objects = [AWSBucketObject(self._provider, obj)
-                   for obj in boto_objs]
+    def _to_boto_object(self, obj_data):
+        """
+        Converts an entry of a list_objects_v2 response to the corresponding
+        Boto ObjectSummary, without issuing any further requests.
+        """
+        obj = self._provider.s3_conn.ObjectSummary(self.bucket.name,
+                                                   obj_data['Key'])
+        obj.meta.data = obj_data
+        return obj
 
-        return ClientPagedResultList(self._provider, objects,
-                                     limit=limit, marker=marker)
+    def list(self, limit=None, marker=None, prefix=None):
+        """
+        List objects in this bucket, a page of at most ``limit`` keys at a
+        time. The marker is the key of the last object returned, and is
+        passed to S3 as ``StartAfter``.
+        """
+        limit = limit or self._provider.config.default_result_limit
+        client = self._provider.s3_conn.meta.client
+        paginator = client.get_paginator('list_objects_v2')
+        params = trim_empty_params({'Bucket': self.bucket.name,
+                                    'Prefix': prefix,
+                                    'StartAfter': marker})
+        pages = paginator.paginate(PaginationConfig={'PageSize': limit},
+                                   **params)
+        # Objects are only fetched and wrapped a page at a time, as the
+        # results are consumed
+        cb_pages = ([AWSBucketObject(self._provider,
+                                     self._to_boto_object(obj_data))
+                     for obj_data in page.get('Contents', [])]
+                    for page in pages)
+        return StreamingResultList(cb_pages, limit)
 
     def find(self, **kwargs):
         obj_list = self
@@ -855,12 +937,8 @@ class AWSRegion(BaseRegion):
 
     @property
     def zones(self):
-        if self.id == self._provider.region_name:  # optimisation
-            conn = self._provider.ec2_conn
-        else:
-            # pylint:disable=protected-access
-            conn = self._provider._conect_ec2_region(region_name=self.id)
-
+        # Reuses the cached connection for the region
+        conn = self._provider.for_region(self.id).ec2_conn
         zones = (conn.meta.client.describe_availability_zones()
                  .get('AvailabilityZones', []))
         return [AWSPlacementZone(self._provider, zone.get('ZoneName'),
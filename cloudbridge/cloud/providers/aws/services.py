@@ -1,12 +1,18 @@
 """Services implemented by the AWS provider."""
+import json
 import logging
+import os
 import string
+import time
 
 from botocore.exceptions import ClientError
 
 import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.provider import DEFAULT_HTTP_TIMEOUT
+from cloudbridge.cloud.base.provider import UserCachePath
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.services import BaseBucketService
+from cloudbridge.cloud.base.services import BaseBulkService
 from cloudbridge.cloud.base.services import BaseComputeService
 from cloudbridge.cloud.base.services import BaseImageService
 from cloudbridge.cloud.base.services import BaseInstanceService
@@ -24,6 +30,8 @@ from cloudbridge.cloud.base.services import BaseVMTypeService
 from cloudbridge.cloud.base.services import BaseVolumeService
 from cloudbridge.cloud.interfaces.exceptions \
     import InvalidConfigurationException
+from cloudbridge.cloud.interfaces.exceptions \
+    import ProviderInternalException
 from cloudbridge.cloud.interfaces.resources import KeyPair
 from cloudbridge.cloud.interfaces.resources import MachineImage
 from cloudbridge.cloud.interfaces.resources import PlacementZone
@@ -37,6 +45,7 @@ import requests
 from .helpers import BotoEC2Service
 from .helpers import BotoS3Service
 from .resources import AWSBucket
+from .resources import AWSBucketObject
 from .resources import AWSInstance
 from .resources import AWSKeyPair
 from .resources import AWSLaunchConfig
@@ -200,6 +209,16 @@ class AWSVolumeService(BaseVolumeService):
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
 
+    def _refresh_all(self, volumes):
+        current = self.svc.get_many('volume-id', [vol.id for vol in volumes])
+        for vol in volumes:
+            if vol.id in current:
+                # pylint:disable=protected-access
+                vol._volume = current[vol.id]
+            else:
+                # No longer exists; let the resource record that itself
+                vol.refresh()
+
     def create(self, name, size, zone, snapshot=None, description=None):
         log.debug("Creating AWS Volume Service with the parameters "
                   "[name: %s size: %s zone: %s snapshot: %s "
@@ -249,6 +268,17 @@ class AWSSnapshotService(BaseSnapshotService):
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
 
+    def _refresh_all(self, snapshots):
+        current = self.svc.get_many('snapshot-id',
+                                    [snap.id for snap in snapshots])
+        for snap in snapshots:
+            if snap.id in current:
+                # pylint:disable=protected-access
+                snap._snapshot = current[snap.id]
+            else:
+                # No longer exists; let the resource record that itself
+                snap.refresh()
+
     def create(self, name, volume, description=None):
         """
         Creates a new snapshot of a given volume.
@@ -547,11 +577,55 @@ class AWSInstanceService(BaseInstanceService):
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
 
+    def _refresh_all(self, instances):
+        current = self.svc.get_many('instance-id',
+                                    [inst.id for inst in instances])
+        for inst in instances:
+            if inst.id in current:
+                # pylint:disable=protected-access
+                inst._ec2_instance = current[inst.id]
+            else:
+                # No longer exists; let the resource record that itself
+                inst.refresh()
+
 
 class AWSVMTypeService(BaseVMTypeService):
 
     def __init__(self, provider):
         super(AWSVMTypeService, self).__init__(provider)
+        # The instance catalog along with the validators needed to
+        # conditionally re-fetch it once the cached copy has expired
+        self._instance_data = None
+        self._instance_data_etag = None
+        self._instance_data_modified = None
+        self._instance_data_fetched = 0
+        self._vm_types = []
+
+    @property
+    def instance_data_url(self):
+        return self.provider.config.get(
+            "aws_instance_info_url",
+            self.provider.AWS_INSTANCE_DATA_DEFAULT_URL)
+
+    @property
+    def instance_data_ttl(self):
+        """
+        Number of seconds for which a fetched instance catalog is considered
+        fresh before being revalidated against ``instance_data_url``.
+        """
+        return self.provider.config.get(
+            "aws_instance_info_ttl",
+            self.provider.AWS_INSTANCE_DATA_DEFAULT_TTL)
+
+    @property
+    def instance_data_cache_path(self):
+        """
+        Location of the on-disk copy of the instance catalog. A value of
+        ``None`` disables the on-disk copy.
+        """
+        return self.provider.config.get(
+            "aws_instance_info_cache_path",
+            os.path.join(UserCachePath, 'aws-vmtypes.json'))
 
     @property
     def instance_data(self):
@@ -565,17 +639,125 @@ class AWSVMTypeService(BaseVMTypeService):
         file: https://raw.githubusercontent.com/powdahound/ec2instances.info/
         master/www/instances.json).
 
-        TODO: Needs a caching function with timeout
+        The catalog is kept in memory and on disk for ``instance_data_ttl``
+        seconds. Once expired, it is revalidated with a conditional request
+        so that an unchanged catalog is not downloaded again.
         """
-        r = requests.get(self.provider.config.get(
-            "aws_instance_info_url",
-            self.provider.AWS_INSTANCE_DATA_DEFAULT_URL))
-        return r.json()
+        self._refresh_instance_data()
+        return self._instance_data
+
+    def invalidate(self):
+        """
+        Discard the cached instance catalog and VM type index so that they
+        are re-fetched on next access. The on-disk copy is left in place but
+        will only be used as a basis for revalidation.
+        """
+        super(AWSVMTypeService, self).invalidate()
+        self._instance_data_fetched = 0
+
+    def _refresh_instance_data(self):
+        if self._instance_data is None:
+            self._load_cached_instance_data()
+        if (self._instance_data is None or time.time() -
+                self._instance_data_fetched >= self.instance_data_ttl):
+            self._fetch_instance_data()
+
+    def _set_instance_data(self, data, etag, modified, fetched):
+        self._instance_data = data
+        self._instance_data_etag = etag
+        self._instance_data_modified = modified
+        self._instance_data_fetched = fetched
+        self._vm_types = [AWSVMType(self.provider, vm_type)
+                          for vm_type in data]
+        # The catalog has changed, so the VM type index must be rebuilt
+        super(AWSVMTypeService, self).invalidate()
+
+    def _load_cached_instance_data(self):
+        path = self.instance_data_cache_path
+        if not path or not os.path.isfile(path):
+            return
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('url') != self.instance_data_url:
+                log.debug("Ignoring cached AWS instance data from %s",
+                          cached.get('url'))
+                return
+            self._set_instance_data(cached['data'], cached.get('etag'),
+                                    cached.get('last_modified'),
+                                    cached.get('fetched', 0))
+            log.debug("Loaded cached AWS instance data from %s", path)
+        except (IOError, OSError, ValueError, KeyError) as e:
+            log.warning("Could not read cached AWS instance data from %s: %s",
+                        path, e)
+
+    def _save_cached_instance_data(self):
+        path = self.instance_data_cache_path
+        if not path:
+            return
+        try:
+            cache_dir = os.path.dirname(path)
+            if cache_dir and not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            # Write to a temporary file first so that concurrent readers
+            # never observe a partially written catalog
+            tmp_path = "%s.%s.tmp" % (path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump({'url': self.instance_data_url,
+                           'etag': self._instance_data_etag,
+                           'last_modified': self._instance_data_modified,
+                           'fetched': self._instance_data_fetched,
+                           'data': self._instance_data}, f)
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as e:
+            log.warning("Could not cache AWS instance data to %s: %s",
+                        path, e)
+
+    def _fetch_instance_data(self):
+        headers = {}
+        if self._instance_data is not None:
+            if self._instance_data_etag:
+                headers['If-None-Match'] = self._instance_data_etag
+            if self._instance_data_modified:
+                headers['If-Modified-Since'] = self._instance_data_modified
+        log.debug("Fetching AWS instance data from %s with headers: %s",
+                  self.instance_data_url, headers)
+        try:
+            r = requests.get(self.instance_data_url, headers=headers,
+                             timeout=(self.provider.config.http_timeout or
+                                      DEFAULT_HTTP_TIMEOUT))
+            if r.status_code != 304:
+                r.raise_for_status()
+        except requests.RequestException as e:
+            if self._instance_data is None:
+                raise
+            log.warning("Could not refresh AWS instance data, using the"
+                        " cached copy instead: %s", e)
+            # Keep using the cached copy for a while rather than retrying
+            # the request on every lookup
+            retry = min(self.provider.AWS_INSTANCE_DATA_RETRY_INTERVAL,
+                        self.instance_data_ttl)
+            self._instance_data_fetched = (time.time() -
+                                           self.instance_data_ttl + retry)
+            return
+
+        if r.status_code == 304:
+            log.debug("AWS instance data has not been modified.")
+            self._instance_data_fetched = time.time()
+        else:
+            self._set_instance_data(r.json(), r.headers.get('ETag'),
+                                    r.headers.get('Last-Modified'),
+                                    time.time())
+        self._save_cached_instance_data()
+
+    def _lookup(self, key, value):
+        # Make sure the catalog, and therefore the index, is current
+        self._refresh_instance_data()
+        return super(AWSVMTypeService, self)._lookup(key, value)
 
     def list(self, limit=None, marker=None):
-        vm_types = [AWSVMType(self.provider, vm_type)
-                    for vm_type in self.instance_data]
-        return ClientPagedResultList(self.provider, vm_types,
+        self._refresh_instance_data()
+        return ClientPagedResultList(self.provider, self._vm_types,
                                      limit=limit, marker=marker)
 
 
@@ -799,3 +981,83 @@ class AWSRouterService(BaseRouterService):
         if name:
             cb_router.name = name
         return cb_router
+
+
+class AWSBulkService(BaseBulkService):
+
+    # Maximum number of ids accepted by terminate_instances and of keys
+    # accepted by delete_objects in a single request
+    BATCH_SIZE = 1000
+
+    def __init__(self, provider):
+        super(AWSBulkService, self).__init__(provider)
+
+    def _chunks(self, items):
+        for i in range(0, len(items), self.BATCH_SIZE):
+            yield items[i:i + self.BATCH_SIZE]
+
+    def _terminate_instances(self, items):
+        """
+        Terminate instances in batches. A batch that is rejected as a whole
+        (e.g. because one of the ids no longer exists) is returned so that
+        its instances can be deleted individually and errors attributed to
+        the right instance.
+        """
+        client = self.provider.ec2_conn.meta.client
+        rejected = []
+        for chunk in self._chunks(items):
+            try:
+                client.terminate_instances(
+                    InstanceIds=[item.resource.id for item in chunk])
+            except ClientError as e:
+                log.debug("Batch termination of %s instances failed, falling"
+                          " back to individual deletes: %s", len(chunk), e)
+                rejected.extend(chunk)
+        return rejected
+
+    def _delete_objects(self, items):
+        """
+        Delete bucket objects in batches, grouped by bucket.
+        """
+        client = self.provider.s3_conn.meta.client
+        by_bucket = {}
+        for item in items:
+            # pylint:disable=protected-access
+            by_bucket.setdefault(item.resource._obj.bucket_name,
+                                 []).append(item)
+        rejected = []
+        for bucket_name, bucket_items in by_bucket.items():
+            for chunk in self._chunks(bucket_items):
+                try:
+                    response = client.delete_objects(
+                        Bucket=bucket_name,
+                        Delete={'Objects': [{'Key': item.resource.id}
+                                            for item in chunk],
+                                'Quiet': True})
+                except ClientError as e:
+                    log.debug("Batch delete of %s objects from %s failed,"
+                              " falling back to individual deletes: %s",
+                              len(chunk), bucket_name, e)
+                    rejected.extend(chunk)
+                    continue
+                errors = {error['Key']: error
+                          for error in response.get('Errors', [])}
+                for item in chunk:
+                    error = errors.get(item.resource.id)
+                    if error:
+                        item.error = ProviderInternalException(
+                            "Could not delete object %s: %s %s" % (
+                                item.resource.id, error.get('Code'),
+                                error.get('Message')))
+        return rejected
+
+    def _batch_delete(self, items):
+        instances = [item for item in items
+                     if isinstance(item.resource, AWSInstance)]
+        objects = [item for item in items
+                   if isinstance(item.resource, AWSBucketObject)]
+        batched = set(id(item) for item in instances + objects)
+        remaining = [item for item in items if id(item) not in batched]
+        remaining.extend(self._terminate_instances(instances))
+        remaining.extend(self._delete_objects(objects))
+        return remaining
@@ -1,17 +1,20 @@
 import datetime
 import logging
-from io import BytesIO
 
+from azure.common import AzureMissingResourceHttpError
 from azure.common.credentials import ServicePrincipalCredentials
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.network import NetworkManagementClient
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.resource.subscriptions import SubscriptionClient
 from azure.mgmt.storage import StorageManagementClient
+from azure.storage.blob import BlobBlock
 from azure.storage.blob import BlobPermissions
 from azure.storage.blob import BlockBlobService
 from azure.storage.table import TableService
 
+import cloudbridge.cloud.base.helpers as cb_helpers
+
 log = logging.getLogger(__name__)
 
 
@@ -36,6 +39,8 @@ class AzureClient(object):
         self._access_key_result = None
         self._block_blob_service = None
         self._table_service = None
+        # Whether the public key table is known to exist
+        self._public_key_table_ready = False
 
         log.debug("azure subscription : %s", self.subscription_id)
 
@@ -62,41 +67,89 @@ class AzureClient(object):
     def public_key_storage_table_name(self):
         return self._config.get('azure_public_key_storage_table_name')
 
+    def _configure_mgmt_client(self, client, service):
+        """
+        Applies the HTTP settings and instrumentation to a management client.
+        The timeout is passed through to requests as a (connect, read) tuple.
+        """
+        if self._config.get('http_timeout'):
+            client.config.connection.timeout = self._config['http_timeout']
+        # Have the client keep one session, rather than opening a new one
+        # for every request
+        client.config.keep_alive = self._config.get('http_keep_alive', True)
+        if self._config.get('rate_limiter'):
+            client.config.session_configuration_callback = \
+                self._rate_limit_session
+        if self._config.get('instrumentation'):
+            client.config.hooks.append(
+                self._config['instrumentation'].requests_hook(service))
+        return client
+
+    def _rate_limit_session(self, session, global_config, local_config,
+                            **kwargs):
+        """
+        Session configuration callback for the management clients, which
+        mounts the rate limiter on each session they use.
+        """
+        for prefix in ('http://', 'https://'):
+            adapter = session.adapters[prefix]
+            if not isinstance(adapter, cb_helpers.RateLimitedHTTPAdapter):
+                session.mount(prefix, cb_helpers.RateLimitedHTTPAdapter(
+                    self._config['rate_limiter'],
+                    max_retries=adapter.max_retries))
+        return kwargs
+
+    def _storage_service_args(self, service):
+        """
+        Returns the HTTP settings for the storage (blob and table) services.
+        """
+        return {
+            'request_session': cb_helpers.create_http_session(
+                pool_size=self._config.get('http_pool_size'),
+                keep_alive=self._config.get('http_keep_alive', True),
+                rate_limiter=self._config.get('rate_limiter'),
+                instrumentation=self._config.get('instrumentation'),
+                service=service),
+            'socket_timeout': self._config.get('http_timeout')
+        }
+
     @property
     def storage_client(self):
         if not self._storage_client:
-            self._storage_client = \
+            self._storage_client = self._configure_mgmt_client(
                 StorageManagementClient(self._credentials,
-                                        self.subscription_id)
+                                        self.subscription_id), 'storage')
         return self._storage_client
 
     @property
     def subscription_client(self):
         if not self._subscription_client:
-            self._subscription_client = SubscriptionClient(self._credentials)
+            self._subscription_client = self._configure_mgmt_client(
+                SubscriptionClient(self._credentials), 'subscription')
         return self._subscription_client
 
     @property
     def resource_client(self):
         if not self._resource_client:
-            self._resource_client = \
+            self._resource_client = self._configure_mgmt_client(
                 ResourceManagementClient(self._credentials,
-                                         self.subscription_id)
+                                         self.subscription_id), 'resource')
         return self._resource_client
 
     @property
     def compute_client(self):
         if not self._compute_client:
-            self._compute_client = \
+            self._compute_client = self._configure_mgmt_client(
                 ComputeManagementClient(self._credentials,
-                                        self.subscription_id)
+                                        self.subscription_id), 'compute')
         return self._compute_client
 
     @property
     def network_management_client(self):
         if not self._network_management_client:
-            self._network_management_client = NetworkManagementClient(
-                self._credentials, self.subscription_id)
+            self._network_management_client = self._configure_mgmt_client(
+                NetworkManagementClient(self._credentials,
+                                        self.subscription_id), 'network')
         return self._network_management_client
 
     @property
@@ -104,7 +157,8 @@ class AzureClient(object):
         if not self._block_blob_service:
             self._block_blob_service = BlockBlobService(
                 self.storage_account,
-                self.access_key_result.keys[0].value)
+                self.access_key_result.keys[0].value,
+                **self._storage_service_args('blob'))
         return self._block_blob_service
 
     @property
@@ -112,13 +166,39 @@ class AzureClient(object):
         if not self._table_service:
             self._table_service = TableService(
                 self.storage_account,
-                self.access_key_result.keys[0].value)
-        if not self._table_service. \
-                exists(table_name=self.public_key_storage_table_name):
-            self._table_service.create_table(
-                self.public_key_storage_table_name)
+                self.access_key_result.keys[0].value,
+                **self._storage_service_args('table'))
+        if not self._public_key_table_ready:
+            self._ensure_public_key_table()
         return self._table_service
 
+    def _ensure_public_key_table(self):
+        # A single call which creates the table, or does nothing if it
+        # already exists. Only made once per client.
+        self._table_service.create_table(self.public_key_storage_table_name,
+                                         fail_on_exist=False)
+        self._public_key_table_ready = True
+
+    def _public_key_table_call(self, operation, *args, **kwargs):
+        """
+        Invokes a TableService operation on the public key table. If the
+        table has gone missing since it was last checked, it is re-created
+        and the operation retried once.
+        """
+        table_service = self.table_service
+        try:
+            return getattr(table_service, operation)(
+                self.public_key_storage_table_name, *args, **kwargs)
+        except AzureMissingResourceHttpError:
+            # Not found may refer to the entity rather than the table
+            if table_service.exists(self.public_key_storage_table_name):
+                raise
+            log.debug("Public key table %s not found. Re-creating it.",
+                      self.public_key_storage_table_name)
+            self._ensure_public_key_table()
+            return getattr(table_service, operation)(
+                self.public_key_storage_table_name, *args, **kwargs)
+
     def get_resource_group(self, name):
         return self.resource_client.resource_groups.get(name)
 
@@ -173,8 +253,10 @@ class AzureClient(object):
             delete(self.resource_group, name)
         delete_async.wait()
 
-    def list_containers(self, prefix=None):
-        return self.blob_service.list_containers(prefix=prefix)
+    def list_containers(self, prefix=None, limit=None, marker=None):
+        return self.blob_service.list_containers(prefix=prefix,
+                                                 num_results=limit,
+                                                 marker=marker)
 
     def create_container(self, container_name):
         self.blob_service.create_container(container_name)
@@ -186,8 +268,10 @@ class AzureClient(object):
     def delete_container(self, container_name):
         self.blob_service.delete_container(container_name)
 
-    def list_blobs(self, container_name, prefix=None):
-        return self.blob_service.list_blobs(container_name, prefix=prefix)
+    def list_blobs(self, container_name, prefix=None, limit=None,
+                   marker=None):
+        return self.blob_service.list_blobs(container_name, prefix=prefix,
+                                            num_results=limit, marker=marker)
 
     def get_blob(self, container_name, blob_name):
         return self.blob_service.get_blob_properties(container_name, blob_name)
@@ -200,6 +284,15 @@ class AzureClient(object):
         self.blob_service.create_blob_from_path(container_name,
                                                 blob_name, file_path)
 
+    def put_block(self, container_name, blob_name, block, block_id):
+        self.blob_service.put_block(container_name, blob_name, block,
+                                    block_id)
+
+    def put_block_list(self, container_name, blob_name, block_ids):
+        self.blob_service.put_block_list(
+            container_name, blob_name,
+            [BlobBlock(id=block_id) for block_id in block_ids])
+
     def delete_blob(self, container_name, blob_name):
         self.blob_service.delete_blob(container_name, blob_name)
 
@@ -212,11 +305,17 @@ class AzureClient(object):
         return self.blob_service.make_blob_url(container_name, blob_name,
                                                sas_token=sas)
 
-    def get_blob_content(self, container_name, blob_name):
-        out_stream = BytesIO()
-        self.blob_service.get_blob_to_stream(container_name,
-                                             blob_name, out_stream)
-        return out_stream
+    def get_blob_range(self, container_name, blob_name, start, end,
+                       if_match=None):
+        return self.blob_service.get_blob_to_bytes(
+            container_name, blob_name, start_range=start, end_range=end,
+            max_connections=1, if_match=if_match).content
+
+    def get_blob_range_to_stream(self, container_name, blob_name, stream,
+                                 start, end, if_match=None):
+        self.blob_service.get_blob_to_stream(
+            container_name, blob_name, stream, start_range=start,
+            end_range=end, max_connections=1, if_match=if_match)
 
     def create_empty_disk(self, disk_name, params):
         return self.compute_client.disks.create_or_update(
@@ -440,6 +539,10 @@ class AzureClient(object):
             network_interfaces.delete(self.resource_group,
                                       nic_name).wait()
 
+    def list_nics(self):
+        return self.network_management_client. \
+            network_interfaces.list(self.resource_group)
+
     def get_nic(self, name):
         return self.network_management_client. \
             network_interfaces.get(self.resource_group, name)
@@ -467,26 +570,24 @@ class AzureClient(object):
                                        public_ip_name).wait()
 
     def create_public_key(self, entity):
-        return self.table_service. \
-            insert_or_replace_entity(self.public_key_storage_table_name,
-                                     entity)
+        return self._public_key_table_call('insert_or_replace_entity',
+                                           entity)
 
     def get_public_key(self, name):
-        entities = self.table_service. \
-            query_entities(self.public_key_storage_table_name,
-                           "Name eq '{0}'".format(name), num_results=1)
+        entities = self._public_key_table_call(
+            'query_entities', "Name eq '{0}'".format(name), num_results=1)
 
         return entities.items[0] if len(entities.items) > 0 else None
 
     def delete_public_key(self, entity):
-        self.table_service.delete_entity(self.public_key_storage_table_name,
-                                         entity.PartitionKey, entity.RowKey)
+        self._public_key_table_call('delete_entity',
+                                    entity.PartitionKey, entity.RowKey)
 
     def list_public_keys(self, partition_key, limit=None, marker=None):
-        entities = self.table_service. \
-            query_entities(self.public_key_storage_table_name,
-                           "PartitionKey eq '{0}'".format(partition_key),
-                           marker=marker, num_results=limit)
+        entities = self._public_key_table_call(
+            'query_entities',
+            "PartitionKey eq '{0}'".format(partition_key),
+            marker=marker, num_results=limit)
         return (entities.items, entities.next_marker)
 
     def delete_route_table(self, route_table_name):
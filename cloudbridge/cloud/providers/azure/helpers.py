@@ -1,3 +1,13 @@
+import base64
+import binascii
+import collections
+import io
+
+from cloudbridge.cloud.base.transfer import BaseMultipartUpload
+from cloudbridge.cloud.base.transfer import BaseRangedDownload
+from cloudbridge.cloud.base.transfer import get_executor
+
+
 def filter_by_tag(list_items, filters):
     """
     This function filter items on the tags
@@ -36,3 +46,186 @@ def parse_url(template_url, original_url):
             resource_param.update({key[1:-1]: value})
 
     return resource_param
+
+
+class NetworkResourceLookup(object):
+    """
+    Resolves network interfaces and public IPs by name from a single bulk
+    listing of the resource group, so that the instances of a listing can
+    share it instead of fetching each resource individually. The listings
+    are only fetched on first use.
+    """
+    def __init__(self, azure_client):
+        self._azure_client = azure_client
+        self._nics = None
+        self._public_ips = None
+
+    def get_nic(self, name):
+        if self._nics is None:
+            self._nics = {nic.name: nic
+                          for nic in self._azure_client.list_nics()}
+        # Fall back to a direct fetch for resources created since listing
+        return self._nics.get(name) or self._azure_client.get_nic(name)
+
+    def get_public_ip(self, name):
+        if self._public_ips is None:
+            self._public_ips = {ip.name: ip for ip in
+                                self._azure_client.list_floating_ips()}
+        return (self._public_ips.get(name) or
+                self._azure_client.get_public_ip(name))
+
+
+class AzureBlockUpload(BaseMultipartUpload):
+    """
+    Uploads a file to a block blob, one block per part.
+    """
+    MAX_PART_SIZE = 100 * 1024 * 1024
+    MAX_PARTS = 50000
+
+    def __init__(self, provider, container_name, blob_name, path,
+                 part_size=None, max_workers=None):
+        super(AzureBlockUpload, self).__init__(provider, path, part_size,
+                                               max_workers)
+        self._container_name = container_name
+        self._blob_name = blob_name
+
+    @property
+    def _client(self):
+        return self.provider.azure_client
+
+    def _upload_single(self):
+        self._client.create_blob_from_file(self._container_name,
+                                           self._blob_name, self.path)
+
+    def _begin(self):
+        pass
+
+    def _upload_part(self, part):
+        # Block ids must all have the same length
+        block_id = '{0:05d}'.format(part.number)
+        self._client.put_block(self._container_name, self._blob_name,
+                               part.read(), block_id)
+        return block_id
+
+    def _complete(self, results):
+        self._client.put_block_list(self._container_name, self._blob_name,
+                                    results)
+
+    def _abort(self):
+        # Uncommitted blocks are discarded by the service
+        pass
+
+
+class AzureRangedDownload(BaseRangedDownload):
+    """
+    Downloads a blob with ranged gets, each conditional on the blob's ETag.
+    """
+
+    def __init__(self, provider, container_name, blob_name, path,
+                 parts=None, max_workers=None):
+        self._container_name = container_name
+        self._blob_name = blob_name
+        properties = provider.azure_client.get_blob(
+            container_name, blob_name).properties
+        self._etag = properties.etag
+        # Only set on blobs uploaded in a single request, base64 encoded
+        md5 = properties.content_settings.content_md5
+        if md5:
+            md5 = binascii.hexlify(base64.b64decode(md5)).decode('ascii')
+        super(AzureRangedDownload, self).__init__(
+            provider, path, properties.content_length, properties.etag,
+            md5=md5, parts=parts, max_workers=max_workers)
+
+    def _write_range(self, stream, start, end):
+        self.provider.azure_client.get_blob_range_to_stream(
+            self._container_name, self._blob_name, stream, start, end,
+            if_match=self._etag)
+
+
+class AzureBlobStream(io.RawIOBase):
+    """
+    Streams a blob, or a byte range of it, as chunks fetched with ranged
+    gets, each conditional on the blob's ETag.
+
+    Up to ``read_ahead`` chunks are fetched ahead of the reader on the
+    shared transfer pool. Memory use is therefore bounded by the chunk size
+    and read-ahead, whatever the size of the blob, and the first chunk is
+    available as soon as it arrives. The blob's properties are only looked
+    up if its ``size`` and ``etag`` are not given.
+    """
+    CHUNK_SIZE = 4 * 1024 * 1024
+    READ_AHEAD = 2
+
+    def __init__(self, azure_client, container_name, blob_name, start=None,
+                 end=None, chunk_size=None, read_ahead=None, size=None,
+                 etag=None):
+        super(AzureBlobStream, self).__init__()
+        self._client = azure_client
+        self._container_name = container_name
+        self._blob_name = blob_name
+        if size is None or etag is None:
+            properties = azure_client.get_blob(container_name,
+                                               blob_name).properties
+            size, etag = properties.content_length, properties.etag
+        self._etag = etag
+        last = size - 1
+        self._end = last if end is None else min(end, last)
+        self._chunk_size = chunk_size or self.CHUNK_SIZE
+        self._read_ahead = max(read_ahead or self.READ_AHEAD, 1)
+        self._offsets = iter(range(start or 0, self._end + 1,
+                                   self._chunk_size))
+        self._pending = collections.deque()
+        # The part of the current chunk not read yet
+        self._chunk = memoryview(b'')
+
+    def _schedule(self):
+        while len(self._pending) < self._read_ahead:
+            offset = next(self._offsets, None)
+            if offset is None:
+                return
+            self._pending.append(get_executor().submit(
+                self._client.get_blob_range, self._container_name,
+                self._blob_name, offset,
+                min(offset + self._chunk_size - 1, self._end),
+                if_match=self._etag))
+
+    def _next_chunk(self):
+        """
+        Returns the next chunk, or ``None`` at the end of the range.
+        """
+        self._schedule()
+        if not self._pending:
+            return None
+        chunk = self._pending.popleft().result()
+        self._schedule()
+        return chunk
+
+    def __iter__(self):
+        if self._chunk:
+            yield self._chunk.tobytes()
+            self._chunk = memoryview(b'')
+        while True:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return
+            yield chunk
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._chunk:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return 0
+            self._chunk = memoryview(chunk)
+        count = min(len(b), len(self._chunk))
+        b[:count] = self._chunk[:count]
+        self._chunk = self._chunk[count:]
+        return count
+
+    def close(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        super(AzureBlobStream, self).close()
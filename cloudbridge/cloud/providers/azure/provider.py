@@ -91,7 +91,12 @@ class AzureCloudProvider(BaseCloudProvider):
                 'azure_resource_group': self.resource_group,
                 'azure_storage_account': self.storage_account,
                 'azure_public_key_storage_table_name':
-                    self.public_key_storage_table_name
+                    self.public_key_storage_table_name,
+                'http_pool_size': self.config.http_pool_size,
+                'http_timeout': self.config.http_timeout,
+                'http_keep_alive': self.config.http_keep_alive,
+                'rate_limiter': self.rate_limiter,
+                'instrumentation': self.instrumentation
             }
 
             self._azure_client = AzureClient(provider_config)
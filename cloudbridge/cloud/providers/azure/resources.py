@@ -16,7 +16,8 @@ from cloudbridge.cloud.base.resources import BaseAttachmentInfo, \
     BaseInternetGateway, BaseKeyPair, BaseLaunchConfig, \
     BaseMachineImage, BaseNetwork, BasePlacementZone, BaseRegion, BaseRouter, \
     BaseSnapshot, BaseSubnet, BaseVMFirewall, BaseVMFirewallRule, \
-    BaseVMFirewallRuleContainer, BaseVMType, BaseVolume, ClientPagedResultList
+    BaseVMFirewallRuleContainer, BaseVMType, BaseVolume, \
+    ClientPagedResultList, ServerPagedResultList
 from cloudbridge.cloud.interfaces import InstanceState, VolumeState
 from cloudbridge.cloud.interfaces.resources import Instance, \
     MachineImageState, NetworkState, RouterState, \
@@ -278,6 +279,9 @@ class AzureBucketObject(BaseBucketObject):
         super(AzureBucketObject, self).__init__(provider)
         self._container = container
         self._key = key
+        # Whether the properties of the key describe the current content,
+        # which they no longer do once this object has been uploaded to
+        self._key_current = True
 
     @property
     def id(self):
@@ -306,22 +310,35 @@ class AzureBucketObject(BaseBucketObject):
         return self._key.properties.last_modified. \
             strftime("%Y-%m-%dT%H:%M:%S.%f")
 
-    def iter_content(self):
+    def iter_content(self, start=None, end=None):
         """
         Returns this object's content as an
-        iterable.
+        iterable, streamed in chunks.
         """
-        content_stream = self._provider.azure_client. \
-            get_blob_content(self._container.name, self._key.name)
-        if content_stream:
-            content_stream.seek(0)
-        return content_stream
+        if self._key_current:
+            size = self._key.properties.content_length
+            etag = self._key.properties.etag
+        else:
+            size = etag = None
+        return azure_helpers.AzureBlobStream(
+            self._provider.azure_client, self._container.name,
+            self._key.name, start, end, size=size, etag=etag)
+
+    def download_to_file(self, path, parts=None, max_workers=None,
+                         resume=False, verify=False):
+        """
+        Download this object to a file, as byte ranges fetched in parallel.
+        """
+        return azure_helpers.AzureRangedDownload(
+            self._provider, self._container.name, self.name, path, parts,
+            max_workers).download(resume, verify)
 
     def upload(self, data):
         """
         Set the contents of this object to the data read from the source
         string.
         """
+        self._key_current = False
         try:
             self._provider.azure_client.create_blob_from_text(
                 self._container.name, self.name, data)
@@ -330,14 +347,15 @@ class AzureBucketObject(BaseBucketObject):
             log.exception(azureEx)
             return False
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, part_size=None, max_workers=None):
         """
         Store the contents of the file pointed by the "path" variable.
         """
+        self._key_current = False
         try:
-            self._provider.azure_client.create_blob_from_file(
-                self._container.name, self.name, path)
-            return True
+            return azure_helpers.AzureBlockUpload(
+                self._provider, self._container.name, self.name, path,
+                part_size, max_workers).upload()
         except AzureException as azureEx:
             log.exception(azureEx)
             return False
@@ -427,12 +445,18 @@ class AzureBucketContainer(BaseBucketContainer):
         :rtype: BucketObject
         :return: List of all available BucketObjects within this bucket.
         """
+        blobs = self._provider.azure_client.list_blobs(
+            self.bucket.name, prefix=prefix,
+            limit=limit or self._provider.config.default_result_limit,
+            marker=marker)
         objects = [AzureBucketObject(self._provider, self.bucket, obj)
-                   for obj in
-                   self._provider.azure_client.list_blobs(
-                       self.bucket.name, prefix=prefix)]
-        return ClientPagedResultList(self._provider, objects,
-                                     limit=limit, marker=marker)
+                   for obj in blobs]
+        # The generator only carries a continuation marker once exhausted
+        resume_marker = blobs.next_marker or None
+        return ServerPagedResultList(is_truncated=bool(resume_marker),
+                                     marker=resume_marker,
+                                     supports_total=False,
+                                     data=objects)
 
     def find(self, **kwargs):
         obj_list = self
@@ -981,7 +1005,7 @@ class AzureNetwork(BaseNetwork):
         List all the subnets in this network
         :return:
         """
-        return self._provider.networking.subnets.list(network=self.id)
+        return self._provider.networking.subnets.list(network=self)
 
     def create_subnet(self, cidr_block, name=None, zone=None):
         """
@@ -1147,14 +1171,34 @@ class AzureSubnet(BaseSubnet):
         'Succeeded': SubnetState.AVAILABLE,
     }
 
-    def __init__(self, provider, subnet):
+    def __init__(self, provider, subnet, network=None, network_cache=None):
+        """
+        :type network: Azure ``VirtualNetwork``
+        :param network: The parent network of this subnet, if already
+                        fetched. Otherwise, it is fetched on first use.
+
+        :type network_cache: ``dict``
+        :param network_cache: Networks fetched so far, keyed by name. Can be
+                              shared by the subnets of a listing so that each
+                              parent network is fetched at most once.
+        """
         super(AzureSubnet, self).__init__(provider)
         self._subnet = subnet
         self._state = self._subnet.provisioning_state
         self._url_params = azure_helpers\
             .parse_url(SUBNET_RESOURCE_ID, subnet.id)
-        self._network = self._provider.azure_client.\
-            get_network(self._url_params.get(NETWORK_NAME))
+        self._azure_network = network
+        self._network_cache = {} if network_cache is None else network_cache
+
+    @property
+    def _network(self):
+        if self._azure_network is None:
+            network_name = self._url_params.get(NETWORK_NAME)
+            if network_name not in self._network_cache:
+                self._network_cache[network_name] = self._provider.\
+                    azure_client.get_network(network_name)
+            self._azure_network = self._network_cache[network_name]
+        return self._azure_network
 
     @property
     def id(self):
@@ -1212,9 +1256,9 @@ class AzureSubnet(BaseSubnet):
         for its latest state.
         """
         try:
-            self._network = self._provider.azure_client. \
+            self._azure_network = self._provider.azure_client. \
                 get_network(self.id)
-            self._state = self._network.provisioning_state
+            self._state = self._azure_network.provisioning_state
         except (CloudError, ValueError) as cloudError:
             log.exception(cloudError.message)
             # The network no longer exists and cannot be refreshed.
@@ -1242,20 +1286,40 @@ class AzureInstance(BaseInstance):
         'VM starting': InstanceState.CONFIGURING
     }
 
-    def __init__(self, provider, vm_instance):
+    def __init__(self, provider, vm_instance, network_lookup=None):
+        """
+        :type network_lookup: :class:`.NetworkResourceLookup`
+        :param network_lookup: Bulk lookup of network interfaces and public
+                               IPs shared by the instances of a listing. If
+                               not supplied, they are fetched one at a time.
+        """
         super(AzureInstance, self).__init__(provider)
         self._vm = vm_instance
+        self._network_attributes_loaded = False
         self._update_state()
-        self._get_network_attributes()
+        # Must be set after updating the state, since a refresh discards it
+        self._network_lookup = network_lookup
         if not self._vm.tags:
             self._vm.tags = {}
 
+    def _load_network_attributes(self):
+        """
+        Network attributes are only resolved when first needed.
+        """
+        if not self._network_attributes_loaded:
+            self._get_network_attributes()
+
+    def _reset_network_attributes(self):
+        self._network_lookup = None
+        self._network_attributes_loaded = False
+
     def _get_network_attributes(self):
         """
         This method used identify the public , private ip addresses
         and security groups associated with network interfaces.
         :return:
         """
+        lookup = self._network_lookup or self._provider.azure_client
         self._private_ips = []
         self._public_ips = []
         self._vm_firewall_ids = []
@@ -1266,7 +1330,7 @@ class AzureInstance(BaseInstance):
                 parse_url(NETWORK_INTERFACE_RESOURCE_ID, nic.id)
             nic_name = nic_params.get(NETWORK_INTERFACE_NAME)
             self._nic_ids.append(nic_name)
-            nic = self._provider.azure_client.get_nic(nic_name)
+            nic = lookup.get_nic(nic_name)
             if nic.network_security_group:
                 fw_params = azure_helpers. \
                     parse_url(VM_FIREWALL_RESOURCE_ID,
@@ -1281,10 +1345,10 @@ class AzureInstance(BaseInstance):
                             parse_url(PUBLIC_IP_RESOURCE_ID,
                                       ip_config.public_ip_address.id)
                         public_ip_name = url_params.get(PUBLIC_IP_NAME)
-                        public_ip = self._provider.azure_client.\
-                            get_public_ip(public_ip_name)
+                        public_ip = lookup.get_public_ip(public_ip_name)
                         self._public_ip_ids.append(public_ip_name)
                         self._public_ips.append(public_ip.ip_address)
+        self._network_attributes_loaded = True
 
     @property
     def id(self):
@@ -1322,6 +1386,7 @@ class AzureInstance(BaseInstance):
         """
         Get all the public IP addresses for this instance.
         """
+        self._load_network_attributes()
         return self._public_ips
 
     @property
@@ -1329,6 +1394,7 @@ class AzureInstance(BaseInstance):
         """
         Get all the private IP addresses for this instance.
         """
+        self._load_network_attributes()
         return self._private_ips
 
     @property
@@ -1343,8 +1409,7 @@ class AzureInstance(BaseInstance):
         """
         Get the instance type.
         """
-        return self._provider.compute.vm_types.find(
-            name=self.vm_type_id)[0]
+        return self._provider.compute.vm_types.get(self.vm_type_id)
 
     def reboot(self):
         """
@@ -1360,6 +1425,7 @@ class AzureInstance(BaseInstance):
         the instance and also removing OS disk and data disks where
         tag with name 'delete_on_terminate' has value True.
         """
+        self._load_network_attributes()
         self._provider.azure_client.deallocate_vm(self.id)
         self._provider.azure_client.delete_vm(self.id)
         for nic_id in self._nic_ids:
@@ -1408,10 +1474,11 @@ class AzureInstance(BaseInstance):
     @property
     def vm_firewalls(self):
         return [self._provider.security.vm_firewalls.get(group_id)
-                for group_id in self._vm_firewall_ids]
+                for group_id in self.vm_firewall_ids]
 
     @property
     def vm_firewall_ids(self):
+        self._load_network_attributes()
         return self._vm_firewall_ids
 
     @property
@@ -1441,7 +1508,7 @@ class AzureInstance(BaseInstance):
             if not self._state == 'VM running':
                 self._provider.azure_client.start_vm(self.id)
                 time.sleep(10)  # Some time is required
-                self._get_network_attributes()
+                self._reset_network_attributes()
 
             # if private_key_path:
             self._deprovision(private_key_path)
@@ -1478,6 +1545,7 @@ class AzureInstance(BaseInstance):
         """
         Attaches public ip to the instance.
         """
+        self._load_network_attributes()
         nic = self._provider.azure_client.get_nic(self._nic_ids[0])
         nic.ip_configurations[0].public_ip_address = {
             'id': floating_ip.id
@@ -1488,6 +1556,7 @@ class AzureInstance(BaseInstance):
         """
         Remove a public IP address from this instance.
         """
+        self._load_network_attributes()
         nic = self._provider.azure_client.get_nic(self._nic_ids[0])
         for ip_config in nic.ip_configurations:
             if ip_config.public_ip_address.id == floating_ip.id:
@@ -1509,6 +1578,7 @@ class AzureInstance(BaseInstance):
         '''
         fw = (self._provider.security.vm_firewalls.get(fw)
               if isinstance(fw, str) else fw)
+        self._load_network_attributes()
         nic = self._provider.azure_client.get_nic(self._nic_ids[0])
         if not nic.network_security_group:
             nic.network_security_group = NetworkSecurityGroup()
@@ -1544,6 +1614,7 @@ class AzureInstance(BaseInstance):
         else we are ignoring.
         '''
 
+        self._load_network_attributes()
         nic = self._provider.azure_client.get_nic(self._nic_ids[0])
         fw = (self._provider.security.vm_firewalls.get(fw)
               if isinstance(fw, str) else fw)
@@ -1585,7 +1656,7 @@ class AzureInstance(BaseInstance):
             if not self._vm.tags:
                 self._vm.tags = {}
             self._update_state()
-            self._get_network_attributes()
+            self._reset_network_attributes()
         except (CloudError, ValueError) as cloudError:
             log.exception(cloudError.message)
             # The volume no longer exists and cannot be refreshed.
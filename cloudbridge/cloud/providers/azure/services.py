@@ -3,6 +3,7 @@ import logging
 import uuid
 
 from azure.common import AzureException
+from azure.storage.table import Entity
 
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import ClientPagedResultList, \
@@ -182,15 +183,17 @@ class AzureKeyPairService(BaseKeyPairService):
         if not public_key_material:
             public_key_material, private_key = cb_helpers.generate_key_pair()
 
-        entity = {
+        entity = Entity({
                   'PartitionKey': AzureKeyPairService.PARTITION_KEY,
                   'RowKey': str(uuid.uuid4()),
                   'Name': name,
                   'Key': public_key_material
-                 }
+                 })
 
         self.provider.azure_client.create_public_key(entity)
-        key_pair = self.get(name)
+        # The stored entity is exactly what was sent, so there is no need
+        # to read it back
+        key_pair = AzureKeyPair(self.provider, entity)
         key_pair.material = private_key
         return key_pair
 
@@ -229,10 +232,17 @@ class AzureBucketService(BaseBucketService):
         """
         List all containers.
         """
+        containers = self.provider.azure_client.list_containers(
+            limit=limit or self.provider.config.default_result_limit,
+            marker=marker)
         buckets = [AzureBucket(self.provider, bucket)
-                   for bucket in self.provider.azure_client.list_containers()]
-        return ClientPagedResultList(self.provider, buckets,
-                                     limit=limit, marker=marker)
+                   for bucket in containers]
+        # The generator only carries a continuation marker once exhausted
+        resume_marker = containers.next_marker or None
+        return ServerPagedResultList(is_truncated=bool(resume_marker),
+                                     marker=resume_marker,
+                                     supports_total=False,
+                                     data=buckets)
 
     def create(self, name, location=None):
         """
@@ -690,8 +700,7 @@ class AzureInstanceService(BaseInstanceService):
         """
         List all instances.
         """
-        instances = [AzureInstance(self.provider, inst)
-                     for inst in self.provider.azure_client.list_vm()]
+        instances = self._to_instances(self.provider.azure_client.list_vm())
         return ClientPagedResultList(self.provider, instances,
                                      limit=limit, marker=marker)
 
@@ -717,11 +726,21 @@ class AzureInstanceService(BaseInstanceService):
                             " Supported attributes: %s" % (kwargs, 'name'))
 
         filtr = {'Name': name}
-        instances = [AzureInstance(self.provider, inst)
-                     for inst in azure_helpers.filter_by_tag(
-                self.provider.azure_client.list_vm(), filtr)]
+        instances = self._to_instances(azure_helpers.filter_by_tag(
+            self.provider.azure_client.list_vm(), filtr))
         return ClientPagedResultList(self.provider, instances)
 
+    def _to_instances(self, vms):
+        """
+        Wrap a list of VMs, resolving their network interfaces and public
+        IPs from one bulk listing of the resource group instead of fetching
+        them per instance.
+        """
+        lookup = azure_helpers.NetworkResourceLookup(
+            self.provider.azure_client)
+        return [AzureInstance(self.provider, vm, network_lookup=lookup)
+                for vm in vms]
+
 
 class AzureImageService(BaseImageService):
     def __init__(self, provider):
@@ -935,18 +954,26 @@ class AzureSubnetService(BaseSubnetService):
                                      limit=limit, marker=marker)
 
     def _list_subnets(self, network=None):
-        result_list = []
+        subnets = []
         if network:
             network_id = network.id \
                 if isinstance(network, Network) else network
-            result_list = self.provider.azure_client.list_subnets(network_id)
+            # pylint:disable=protected-access
+            azure_network = network._network \
+                if isinstance(network, AzureNetwork) else None
+            # When only the network id is known, the network is fetched
+            # lazily and at most once for the whole listing
+            network_cache = {}
+            subnets = [AzureSubnet(self.provider, subnet,
+                                   network=azure_network,
+                                   network_cache=network_cache)
+                       for subnet in self.provider.azure_client.
+                       list_subnets(network_id)]
         else:
             for net in self.provider.azure_client.list_networks():
-                result_list.extend(self.provider.azure_client.list_subnets(
-                    net.name
-                ))
-        subnets = [AzureSubnet(self.provider, subnet)
-                   for subnet in result_list]
+                subnets.extend(AzureSubnet(self.provider, subnet, network=net)
+                               for subnet in self.provider.azure_client.
+                               list_subnets(net.name))
 
         return subnets
 
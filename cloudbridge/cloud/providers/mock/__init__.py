@@ -0,0 +1,5 @@
+"""
+Exports from this provider
+"""
+
+from .provider import MockCloudProvider  # noqa
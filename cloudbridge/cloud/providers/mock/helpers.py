@@ -0,0 +1,153 @@
+"""A set of helper methods used by the mock provider."""
+import logging
+from datetime import datetime
+
+from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.base.transfer import BaseMultipartUpload
+from cloudbridge.cloud.base.transfer import BaseRangedDownload
+from cloudbridge.cloud.interfaces.exceptions import ProviderInternalException
+
+log = logging.getLogger(__name__)
+
+
+def iso_time(timestamp):
+    """
+    Formats a timestamp as returned by ``time.time()`` in the format of
+    AWS resource times (e.g. ``2017-10-16T12:00:00.000000``).
+    """
+    return datetime.utcfromtimestamp(timestamp).strftime(
+        "%Y-%m-%dT%H:%M:%S.%f")
+
+
+class MockResourceService(object):
+    """
+    Generic implementation of the basic CloudBridge service methods for a
+    collection of the mock cloud.
+    """
+
+    def __init__(self, provider, cb_resource, collection):
+        """
+        :type provider: :class:`MockCloudProvider`
+        :param provider: CloudBridge mock provider to use
+
+        :type cb_resource: :class:`CloudResource`
+        :param cb_resource: CloudBridge Resource class to wrap records in
+
+        :type collection: ``str``
+        :param collection: Name of the mock cloud collection holding the
+                           records (e.g. ``instances``)
+        """
+        self.provider = provider
+        self.cb_resource = cb_resource
+        self.collection = collection
+
+    @property
+    def client(self):
+        return self.provider.mock_client
+
+    def get(self, resource_id):
+        record = self.client.get(self.collection, resource_id)
+        return self.cb_resource(self.provider, record) if record else None
+
+    def get_many(self, resource_ids):
+        """
+        Returns the records with the given ids, keyed by id, in a single
+        call. Records which no longer exist are omitted.
+        """
+        return self.client.get_many(self.collection, resource_ids)
+
+    def list(self, limit=None, marker=None, **filters):
+        """
+        Returns a server paged list of the records whose attributes equal the
+        given ``filters``.
+        """
+        limit = limit or self.provider.config.default_result_limit
+        records, is_truncated = self.client.list(
+            self.collection, limit=limit, marker=marker, **filters)
+        results = [self.cb_resource(self.provider, record)
+                   for record in records]
+        return ServerPagedResultList(
+            is_truncated, results[-1].id if is_truncated else None, False,
+            data=results)
+
+    def find(self, limit=None, marker=None, **kwargs):
+        name = kwargs.pop('name', None)
+
+        # All kwargs should have been popped at this time.
+        if len(kwargs) > 0:
+            raise TypeError("Unrecognised parameters for search: %s."
+                            " Supported attributes: %s" % (kwargs, 'name'))
+
+        log.debug("Searching for %s %s", self.collection, name)
+        if name is None:
+            return self.list(limit=limit, marker=marker)
+        return self.list(limit=limit, marker=marker, name=name)
+
+    def create(self, **attributes):
+        return self.cb_resource(self.provider, self.client.create(
+            self.collection, **attributes))
+
+    def delete(self, resource_id):
+        log.debug("Deleting %s %s", self.collection, resource_id)
+        self.client.delete(self.collection, resource_id)
+
+
+class MockMultipartUpload(BaseMultipartUpload):
+    """
+    Uploads a file to an object of the in-memory cloud, with its S3 like
+    multipart upload API.
+    """
+
+    def __init__(self, provider, bucket_name, key, path, part_size=None,
+                 max_workers=None):
+        super(MockMultipartUpload, self).__init__(provider, path, part_size,
+                                                  max_workers)
+        self._bucket_name = bucket_name
+        self._key = key
+        self._upload_id = None
+
+    @property
+    def _client(self):
+        return self.provider.mock_client
+
+    def _upload_single(self):
+        with open(self.path, 'rb') as f:
+            self._client.put_object(self._bucket_name, self._key, f.read())
+
+    def _begin(self):
+        self._upload_id = self._client.create_multipart_upload(
+            self._bucket_name, self._key)
+
+    def _upload_part(self, part):
+        self._client.upload_part(self._upload_id, part.number, part.read())
+        return part.number
+
+    def _complete(self, results):
+        self._client.complete_multipart_upload(self._upload_id, results)
+
+    def _abort(self):
+        self._client.abort_multipart_upload(self._upload_id)
+
+
+class MockRangedDownload(BaseRangedDownload):
+    """
+    Downloads an object of the in-memory cloud with ranged gets.
+    """
+
+    def __init__(self, provider, bucket_name, key, path, parts=None,
+                 max_workers=None):
+        self._bucket_name = bucket_name
+        self._key = key
+        obj = provider.mock_client.get_object(bucket_name, key)
+        if obj is None:
+            raise ProviderInternalException(
+                "Object {0} does not exist".format(key))
+        etag = obj['etag']
+        super(MockRangedDownload, self).__init__(
+            provider, path, obj['size'], etag,
+            md5=None if '-' in etag else etag, parts=parts,
+            max_workers=max_workers)
+
+    def _write_range(self, stream, start, end):
+        stream.write(self.provider.mock_client.get_object_range(
+            self._bucket_name, self._key, start, end))
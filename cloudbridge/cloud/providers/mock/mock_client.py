@@ -0,0 +1,407 @@
+"""
+An in-memory cloud, which serves as the backend of the mock provider.
+
+All resources are kept as plain dicts in :class:`MockCollection` objects,
+ordered by key so that they can be paged through with a marker. Generated
+ids are made from a counter and are the same from one run to the next.
+
+Every call made to the client goes through the provider's rate limiter and
+instrumentation, exactly as a call to a real cloud would, and can be given a
+fixed latency and a rate of randomly (but reproducibly) throttled requests.
+"""
+import bisect
+import hashlib
+import logging
+import random
+import threading
+import time
+
+from cloudbridge.cloud.base.ratelimit import operation_kind
+from cloudbridge.cloud.interfaces.exceptions import ProviderInternalException
+
+log = logging.getLogger(__name__)
+
+SERVICE_NAME = 'mock'
+
+# Singular names, used in operation names, and id prefixes of each
+# collection
+COLLECTIONS = {
+    'images': ('Image', 'img'),
+    'instances': ('Instance', 'i'),
+    'volumes': ('Volume', 'vol'),
+    'snapshots': ('Snapshot', 'snap'),
+    'key_pairs': ('KeyPair', None),
+    'vm_firewalls': ('VMFirewall', 'fw'),
+    'networks': ('Network', 'net'),
+    'subnets': ('Subnet', 'subnet'),
+    'routers': ('Router', 'rtr'),
+    'gateways': ('InternetGateway', 'igw'),
+    'floating_ips': ('FloatingIP', 'fip'),
+    'buckets': ('Bucket', None)
+}
+
+REGIONS = {
+    'mock-region-1': ['mock-region-1a', 'mock-region-1b'],
+    'mock-region-2': ['mock-region-2a', 'mock-region-2b']
+}
+
+VM_TYPES = [
+    {'name': 'mock.tiny', 'family': 'General Purpose', 'vcpus': 1,
+     'ram': 0.5, 'size_root_disk': 1, 'size_ephemeral_disks': 0,
+     'num_ephemeral_disks': 0},
+    {'name': 'mock.small', 'family': 'General Purpose', 'vcpus': 1,
+     'ram': 2, 'size_root_disk': 10, 'size_ephemeral_disks': 0,
+     'num_ephemeral_disks': 0},
+    {'name': 'mock.large', 'family': 'Compute Optimized', 'vcpus': 4,
+     'ram': 8, 'size_root_disk': 20, 'size_ephemeral_disks': 80,
+     'num_ephemeral_disks': 2}
+]
+
+# Public images, which exist in every region from the start
+IMAGES = [
+    {'id': 'img-00000000', 'name': 'mock-image', 'description':
+     'A public image provided by the mock cloud', 'min_disk': 1,
+     'owner': None}
+]
+
+
+class MockCollection(object):
+    """
+    A collection of records, kept in key order. Generated ids sort in the
+    order in which they were created.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._keys = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, key):
+        return self._records.get(key)
+
+    def add(self, key, record):
+        if key not in self._records:
+            bisect.insort(self._keys, key)
+        self._records[key] = record
+        return record
+
+    def remove(self, key):
+        record = self._records.pop(key, None)
+        if record is not None:
+            del self._keys[bisect.bisect_left(self._keys, key)]
+        return record
+
+    def page(self, limit=None, marker=None, match=None):
+        """
+        Returns up to ``limit`` records following the ``marker`` key, which
+        satisfy ``match``, and whether there are further records.
+        """
+        position = bisect.bisect_right(self._keys, marker) if marker else 0
+        records = []
+        while position < len(self._keys):
+            record = self._records[self._keys[position]]
+            position += 1
+            if match and not match(record):
+                continue
+            if limit is not None and len(records) == limit:
+                return records, True
+            records.append(record)
+        return records, False
+
+
+class MockClient(object):
+    """
+    A client for an in-memory cloud, holding the resources of a single
+    region.
+    """
+
+    def __init__(self, config):
+        self._config = config
+        self.region_name = config.get('mock_region_name')
+        self.latency = float(config.get('mock_latency') or 0)
+        self.throttle_rate = float(config.get('mock_throttle_rate') or 0)
+        self.seed = config.get('mock_seed') or 0
+        self.rate_limiter = config['rate_limiter']
+        self.instrumentation = config['instrumentation']
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """
+        Discard all resources, and restart the id counter and the random
+        sequence of throttled requests.
+        """
+        with self._lock:
+            self._random = random.Random(self.seed)
+            self._counter = 0
+            self._collections = {name: MockCollection()
+                                 for name in COLLECTIONS}
+            # Multipart uploads in progress, by upload id
+            self._uploads = {}
+            for image in IMAGES:
+                self._collections['images'].add(image['id'], dict(
+                    image, state='available', create_time=time.time()))
+
+    def _next_id(self, collection):
+        self._counter += 1
+        return '{0}-{1:08x}'.format(COLLECTIONS[collection][1],
+                                    self._counter)
+
+    def next_ip(self, prefix):
+        """
+        Returns an unused address, as the last two octets of the counter
+        appended to the given prefix (e.g. ``10.0``).
+        """
+        with self._lock:
+            self._counter += 1
+            return '{0}.{1}.{2}'.format(prefix, self._counter // 254 % 256,
+                                        self._counter % 254 + 1)
+
+    def _throttled(self):
+        if not self.throttle_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.throttle_rate
+
+    def _record(self, operation, start, retries, status, error=None):
+        if self.instrumentation.enabled:
+            self.instrumentation.record(
+                SERVICE_NAME, operation, time.time() - start, status=status,
+                retries=retries, error=error)
+
+    def call(self, operation, function, *args, **kwargs):
+        """
+        Make an API call, applying the configured latency and throttling.
+        Throttled calls are retried as the rate limiter decides.
+
+        :type operation: ``str``
+        :param operation: The operation name (e.g. ``CreateVolume``).
+
+        :type function: ``function``
+        :param function: Carries out the operation on the stored resources.
+        """
+        kind = operation_kind(operation)
+        start = None
+        attempts = 0
+        while True:
+            attempts += 1
+            self.rate_limiter.acquire(kind)
+            start = start or time.time()
+            if self.latency:
+                time.sleep(self.latency)
+            if not self._throttled():
+                break
+            delay = self.rate_limiter.throttled(kind, attempts)
+            if delay is None:
+                self._record(operation, start, attempts - 1, 429,
+                             'Throttling')
+                raise ProviderInternalException(
+                    "{0} request was throttled {1} times".format(
+                        operation, attempts))
+            time.sleep(delay)
+        try:
+            with self._lock:
+                result = function(*args, **kwargs)
+        except Exception as e:
+            self._record(operation, start, attempts - 1, 400,
+                         e.__class__.__name__)
+            raise
+        self.rate_limiter.succeeded(kind)
+        self._record(operation, start, attempts - 1, 200)
+        return result
+
+    def create(self, collection, key=None, **attributes):
+        """
+        Store a new resource. Resources without a natural ``key`` (e.g. a
+        bucket name) are given a generated id.
+
+        :rtype: ``dict``
+        :return: The stored record.
+        """
+        def create_record():
+            record_id = key or self._next_id(collection)
+            if self._collections[collection].get(record_id):
+                raise ProviderInternalException(
+                    "{0} {1} already exists".format(
+                        COLLECTIONS[collection][0], record_id))
+            record = dict(attributes, id=record_id, create_time=time.time())
+            return self._collections[collection].add(record_id, record)
+        return self.call('Create' + COLLECTIONS[collection][0],
+                         create_record)
+
+    def get(self, collection, key):
+        """
+        :rtype: ``dict``
+        :return: The record stored under ``key``, or ``None``.
+        """
+        return self.call('Get' + COLLECTIONS[collection][0],
+                         self._collections[collection].get, key)
+
+    def get_many(self, collection, keys):
+        """
+        Fetch several records in a single call.
+
+        :rtype: ``dict``
+        :return: The records which exist, keyed by id.
+        """
+        def get_records():
+            records = (self._collections[collection].get(key)
+                       for key in keys)
+            return {record['id']: record for record in records if record}
+        return self.call('Describe' + COLLECTIONS[collection][0] + 's',
+                         get_records)
+
+    def list(self, collection, limit=None, marker=None, **filters):
+        """
+        Returns a page of the stored records whose attributes equal the given
+        ``filters``.
+
+        :rtype: ``tuple``
+        :return: A list of at most ``limit`` records, and whether the
+                 collection has further records.
+        """
+        def match(record):
+            return all(record.get(attribute) == value
+                       for attribute, value in filters.items())
+        return self.call('List' + COLLECTIONS[collection][0] + 's',
+                         self._collections[collection].page, limit, marker,
+                         match if filters else None)
+
+    def update(self, collection, key, **attributes):
+        """
+        Change the attributes of a stored record, in place.
+
+        :rtype: ``dict``
+        :return: The updated record, or ``None`` if it does not exist.
+        """
+        def update_record():
+            record = self._collections[collection].get(key)
+            if record is not None:
+                record.update(attributes)
+            return record
+        return self.call('Update' + COLLECTIONS[collection][0],
+                         update_record)
+
+    def delete(self, collection, key):
+        """
+        :rtype: ``dict``
+        :return: The deleted record, or ``None`` if it did not exist.
+        """
+        return self.call('Delete' + COLLECTIONS[collection][0],
+                         self._collections[collection].remove, key)
+
+    def delete_many(self, collection, keys):
+        """
+        Delete several records in a single call, ignoring those which do not
+        exist.
+        """
+        def delete_records():
+            return [self._collections[collection].remove(key)
+                    for key in keys]
+        return self.call('Delete' + COLLECTIONS[collection][0] + 's',
+                         delete_records)
+
+    def list_regions(self):
+        return self.call('DescribeRegions', lambda: sorted(REGIONS))
+
+    def list_zones(self, region_name):
+        return self.call('DescribeAvailabilityZones',
+                         lambda: list(REGIONS.get(region_name, [])))
+
+    def _objects(self, bucket_name):
+        bucket = self._collections['buckets'].get(bucket_name)
+        if bucket is None:
+            raise ProviderInternalException(
+                "Bucket {0} does not exist".format(bucket_name))
+        return bucket['objects']
+
+    def create_bucket(self, name, **attributes):
+        return self.create('buckets', key=name, name=name,
+                           objects=MockCollection(),
+                           **attributes)
+
+    def _put_object(self, bucket_name, key, data, etag=None):
+        return self._objects(bucket_name).add(key, {
+            'id': key, 'data': data, 'size': len(data),
+            'etag': etag or hashlib.md5(data).hexdigest(),
+            'last_modified': time.time()})
+
+    def put_object(self, bucket_name, key, data):
+        return self.call('PutObject', self._put_object, bucket_name, key,
+                         data)
+
+    def _upload(self, upload_id):
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise ProviderInternalException(
+                "Upload {0} does not exist".format(upload_id))
+        return upload
+
+    def create_multipart_upload(self, bucket_name, key):
+        def create():
+            self._objects(bucket_name)
+            self._counter += 1
+            upload_id = 'upload-{0:08x}'.format(self._counter)
+            self._uploads[upload_id] = {'bucket': bucket_name, 'key': key,
+                                        'parts': {}}
+            return upload_id
+        return self.call('CreateMultipartUpload', create)
+
+    def upload_part(self, upload_id, number, data):
+        def upload():
+            self._upload(upload_id)['parts'][number] = data
+        return self.call('UploadPart', upload)
+
+    def complete_multipart_upload(self, upload_id, numbers):
+        """
+        Store the object made of the given parts, in the given order.
+        """
+        def complete():
+            upload = self._upload(upload_id)
+            parts = [upload['parts'][number] for number in numbers]
+            # As in S3, the ETag is not the MD5 digest of the object
+            etag = '{0}-{1}'.format(hashlib.md5(b''.join(
+                hashlib.md5(part).digest() for part in parts)).hexdigest(),
+                len(parts))
+            del self._uploads[upload_id]
+            return self._put_object(upload['bucket'], upload['key'],
+                                    b''.join(parts), etag)
+        return self.call('CompleteMultipartUpload', complete)
+
+    def abort_multipart_upload(self, upload_id):
+        def abort():
+            self._upload(upload_id)
+            del self._uploads[upload_id]
+        return self.call('AbortMultipartUpload', abort)
+
+    def get_object(self, bucket_name, key):
+        return self.call('GetObject',
+                         lambda: self._objects(bucket_name).get(key))
+
+    def get_object_range(self, bucket_name, key, start, end):
+        """
+        Returns the bytes of an object from ``start`` to ``end``, inclusive,
+        or to the end of the object if ``end`` is ``None``.
+        """
+        def get_range():
+            obj = self._objects(bucket_name).get(key)
+            if obj is None:
+                raise ProviderInternalException(
+                    "Object {0} does not exist".format(key))
+            return obj['data'][start:None if end is None else end + 1]
+        return self.call('GetObject', get_range)
+
+    def list_objects(self, bucket_name, limit=None, marker=None, prefix=None):
+        def match(record):
+            return record['id'].startswith(prefix)
+        return self.call('ListObjects',
+                         lambda: self._objects(bucket_name).page(
+                             limit, marker, match if prefix else None))
+
+    def delete_objects(self, bucket_name, keys):
+        def delete():
+            objects = self._objects(bucket_name)
+            return [objects.remove(key) for key in keys]
+        return self.call('DeleteObjects', delete)
@@ -0,0 +1,94 @@
+"""
+A pure Python provider which keeps all resources in memory, for use in unit
+tests and for load testing CloudBridge itself.
+"""
+import logging
+
+from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.interfaces import TestMockHelperMixin
+
+from .mock_client import MockClient
+from .mock_client import REGIONS
+from .services import MockBulkService
+from .services import MockComputeService
+from .services import MockNetworkingService
+from .services import MockSecurityService
+from .services import MockStorageService
+
+log = logging.getLogger(__name__)
+
+
+class MockCloudProvider(BaseCloudProvider, TestMockHelperMixin):
+    """
+    A provider for an in-memory cloud. Resources exist only as long as the
+    provider, and each provider (or region) has its own.
+
+    The following configuration values are supported, in addition to the
+    general ones:
+
+    * ``mock_region_name``: The region to connect to.
+    * ``mock_latency``: Seconds added to every API call.
+    * ``mock_throttle_rate``: The fraction of API calls which are throttled.
+      Throttled calls are retried according to the ``throttle_*`` settings.
+    * ``mock_seed``: Seed of the random sequence of throttled calls.
+    """
+    PROVIDER_ID = 'mock'
+
+    def __init__(self, config):
+        super(MockCloudProvider, self).__init__(config)
+        self.region_name = self._get_config_value('mock_region_name',
+                                                  sorted(REGIONS)[0])
+        self._mock_client = None
+
+        self._compute = MockComputeService(self)
+        self._networking = MockNetworkingService(self)
+        self._security = MockSecurityService(self)
+        self._storage = MockStorageService(self)
+        self._bulk = MockBulkService(self)
+
+    @property
+    def compute(self):
+        return self._compute
+
+    @property
+    def networking(self):
+        return self._networking
+
+    @property
+    def security(self):
+        return self._security
+
+    @property
+    def storage(self):
+        return self._storage
+
+    @property
+    def mock_client(self):
+        if not self._mock_client:
+            self._mock_client = MockClient({
+                'mock_region_name': self.region_name,
+                'mock_latency': self._get_config_value('mock_latency', 0),
+                'mock_throttle_rate': self._get_config_value(
+                    'mock_throttle_rate', 0),
+                'mock_seed': self._get_config_value('mock_seed', 0),
+                'rate_limiter': self.rate_limiter,
+                'instrumentation': self.instrumentation
+            })
+        return self._mock_client
+
+    def _region_config(self, region_name):
+        config = dict(self.config)
+        config['mock_region_name'] = region_name
+        return config
+
+    def setUpMock(self):
+        """
+        Start each test with an empty cloud.
+        """
+        self.mock_client.reset()
+
+    def tearDownMock(self):
+        """
+        Discard the resources left over by a test.
+        """
+        self.mock_client.reset()
@@ -0,0 +1,1003 @@
+"""
+DataTypes used by this provider
+"""
+import hashlib
+import inspect
+import logging
+import time
+from io import BytesIO
+
+import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.resources import BaseAttachmentInfo
+from cloudbridge.cloud.base.resources import BaseBucket
+from cloudbridge.cloud.base.resources import BaseBucketContainer
+from cloudbridge.cloud.base.resources import BaseBucketObject
+from cloudbridge.cloud.base.resources import BaseFloatingIP
+from cloudbridge.cloud.base.resources import BaseFloatingIPContainer
+from cloudbridge.cloud.base.resources import BaseGatewayContainer
+from cloudbridge.cloud.base.resources import BaseInstance
+from cloudbridge.cloud.base.resources import BaseInternetGateway
+from cloudbridge.cloud.base.resources import BaseKeyPair
+from cloudbridge.cloud.base.resources import BaseLaunchConfig
+from cloudbridge.cloud.base.resources import BaseMachineImage
+from cloudbridge.cloud.base.resources import BaseNetwork
+from cloudbridge.cloud.base.resources import BasePlacementZone
+from cloudbridge.cloud.base.resources import BaseRegion
+from cloudbridge.cloud.base.resources import BaseRouter
+from cloudbridge.cloud.base.resources import BaseSnapshot
+from cloudbridge.cloud.base.resources import BaseSubnet
+from cloudbridge.cloud.base.resources import BaseVMFirewall
+from cloudbridge.cloud.base.resources import BaseVMFirewallRule
+from cloudbridge.cloud.base.resources import BaseVMFirewallRuleContainer
+from cloudbridge.cloud.base.resources import BaseVMType
+from cloudbridge.cloud.base.resources import BaseVolume
+from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
+from cloudbridge.cloud.interfaces.exceptions \
+    import ProviderInternalException
+from cloudbridge.cloud.interfaces.resources import GatewayState
+from cloudbridge.cloud.interfaces.resources import Instance
+from cloudbridge.cloud.interfaces.resources import InstanceState
+from cloudbridge.cloud.interfaces.resources import InternetGateway
+from cloudbridge.cloud.interfaces.resources import MachineImageState
+from cloudbridge.cloud.interfaces.resources import NetworkState
+from cloudbridge.cloud.interfaces.resources import RouterState
+from cloudbridge.cloud.interfaces.resources import SnapshotState
+from cloudbridge.cloud.interfaces.resources import Subnet
+from cloudbridge.cloud.interfaces.resources import SubnetState
+from cloudbridge.cloud.interfaces.resources import TrafficDirection
+from cloudbridge.cloud.interfaces.resources import VMFirewall
+from cloudbridge.cloud.interfaces.resources import VolumeState
+
+from .helpers import MockMultipartUpload
+from .helpers import MockRangedDownload
+from .helpers import MockResourceService
+from .helpers import iso_time
+
+log = logging.getLogger(__name__)
+
+
+class MockMachineImage(BaseMachineImage):
+
+    def __init__(self, provider, image):
+        super(MockMachineImage, self).__init__(provider)
+        self._record = image
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self._record.get('name')
+
+    @property
+    def description(self):
+        return self._record.get('description')
+
+    @property
+    def min_disk(self):
+        return self._record.get('min_disk')
+
+    def delete(self):
+        self._provider.mock_client.delete('images', self.id)
+
+    @property
+    def state(self):
+        return self._record.get('state', MachineImageState.UNKNOWN)
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'images', self.id) or dict(self._record,
+                                       state=MachineImageState.UNKNOWN)
+
+
+class MockPlacementZone(BasePlacementZone):
+
+    def __init__(self, provider, zone, region):
+        super(MockPlacementZone, self).__init__(provider)
+        self._zone = zone
+        self._region = region
+
+    @property
+    def id(self):
+        return self._zone
+
+    @property
+    def name(self):
+        return self._zone
+
+    @property
+    def region_name(self):
+        return self._region
+
+
+class MockVMType(BaseVMType):
+
+    def __init__(self, provider, vm_type):
+        super(MockVMType, self).__init__(provider)
+        self._vm_type = vm_type
+
+    @property
+    def id(self):
+        return self._vm_type['name']
+
+    @property
+    def name(self):
+        return self._vm_type['name']
+
+    @property
+    def family(self):
+        return self._vm_type.get('family')
+
+    @property
+    def vcpus(self):
+        return self._vm_type.get('vcpus')
+
+    @property
+    def ram(self):
+        return self._vm_type.get('ram')
+
+    @property
+    def size_root_disk(self):
+        return self._vm_type.get('size_root_disk')
+
+    @property
+    def size_ephemeral_disks(self):
+        return self._vm_type.get('size_ephemeral_disks')
+
+    @property
+    def num_ephemeral_disks(self):
+        return self._vm_type.get('num_ephemeral_disks')
+
+    @property
+    def extra_data(self):
+        return {}
+
+
+class MockInstance(BaseInstance):
+
+    def __init__(self, provider, instance):
+        super(MockInstance, self).__init__(provider)
+        self._record = instance
+
+    def _update(self, **attributes):
+        self._provider.mock_client.update('instances', self.id, **attributes)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    # pylint:disable=arguments-differ
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._update(name=value)
+
+    @property
+    def public_ips(self):
+        return ([self._record['public_ip']]
+                if self._record.get('public_ip') else [])
+
+    @property
+    def private_ips(self):
+        return ([self._record['private_ip']]
+                if self._record.get('private_ip') else [])
+
+    @property
+    def vm_type_id(self):
+        return self._record.get('vm_type_id')
+
+    @property
+    def vm_type(self):
+        return self._provider.compute.vm_types.get(self.vm_type_id)
+
+    def reboot(self):
+        self._update(state=InstanceState.RUNNING)
+
+    def delete(self):
+        self._provider.mock_client.delete('instances', self.id)
+
+    @property
+    def image_id(self):
+        return self._record.get('image_id')
+
+    @property
+    def zone_id(self):
+        return self._record.get('zone_id')
+
+    @property
+    def vm_firewalls(self):
+        return [self._provider.security.vm_firewalls.get(fw_id)
+                for fw_id in self.vm_firewall_ids]
+
+    @property
+    def vm_firewall_ids(self):
+        return list(self._record.get('vm_firewall_ids') or [])
+
+    @property
+    def key_pair_name(self):
+        return self._record.get('key_pair_name')
+
+    def create_image(self, name):
+        self.assert_valid_resource_name(name)
+        return MockMachineImage(self._provider,
+                                self._provider.mock_client.create(
+                                    'images', name=name, description=None,
+                                    min_disk=self.vm_type.size_root_disk,
+                                    owner='self',
+                                    state=MachineImageState.AVAILABLE))
+
+    def add_floating_ip(self, floating_ip):
+        client = self._provider.mock_client
+        client.update('floating_ips', floating_ip.id, instance_id=self.id,
+                      private_ip=self._record.get('private_ip'))
+        self._update(public_ip=floating_ip.public_ip)
+        self.refresh()
+
+    def remove_floating_ip(self, floating_ip):
+        client = self._provider.mock_client
+        client.update('floating_ips', floating_ip.id, instance_id=None,
+                      private_ip=None)
+        self._update(public_ip=None)
+        self.refresh()
+
+    def add_vm_firewall(self, firewall):
+        if firewall.id not in self.vm_firewall_ids:
+            self._update(
+                vm_firewall_ids=self.vm_firewall_ids + [firewall.id])
+
+    def remove_vm_firewall(self, firewall):
+        self._update(vm_firewall_ids=[fw_id for fw_id in self.vm_firewall_ids
+                                      if fw_id != firewall.id])
+
+    @property
+    def state(self):
+        return self._record.get('state', InstanceState.UNKNOWN)
+
+    def refresh(self):
+        # A deleted instance is no longer listed at all, so its state is
+        # unknown rather than deleted
+        self._record = self._provider.mock_client.get(
+            'instances', self.id) or dict(self._record,
+                                          state=InstanceState.UNKNOWN)
+
+
+class MockVolume(BaseVolume):
+
+    def __init__(self, provider, volume):
+        super(MockVolume, self).__init__(provider)
+        self._record = volume
+
+    def _update(self, **attributes):
+        self._provider.mock_client.update('volumes', self.id, **attributes)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    # pylint:disable=arguments-differ
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._update(name=value)
+
+    @property
+    def description(self):
+        return self._record.get('description')
+
+    @description.setter
+    def description(self, value):
+        self._update(description=value)
+
+    @property
+    def size(self):
+        return self._record.get('size')
+
+    @property
+    def create_time(self):
+        return iso_time(self._record['create_time'])
+
+    @property
+    def zone_id(self):
+        return self._record.get('zone_id')
+
+    @property
+    def source(self):
+        if self._record.get('snapshot_id'):
+            return self._provider.storage.snapshots.get(
+                self._record['snapshot_id'])
+        return None
+
+    @property
+    def attachments(self):
+        attachment = self._record.get('attachment')
+        if attachment:
+            return BaseAttachmentInfo(self, attachment['instance_id'],
+                                      attachment['device'])
+        return None
+
+    def attach(self, instance, device):
+        instance_id = (instance.id if isinstance(instance, Instance)
+                       else instance)
+        self._update(attachment={'instance_id': instance_id,
+                                 'device': device},
+                     state=VolumeState.IN_USE)
+
+    def detach(self, force=False):
+        self._update(attachment=None, state=VolumeState.AVAILABLE)
+
+    def create_snapshot(self, name, description=None):
+        return self._provider.storage.snapshots.create(
+            name, self, description=description)
+
+    def delete(self):
+        self._provider.mock_client.delete('volumes', self.id)
+
+    @property
+    def state(self):
+        return self._record.get('state', VolumeState.UNKNOWN)
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'volumes', self.id) or dict(self._record,
+                                        state=VolumeState.UNKNOWN)
+
+
+class MockSnapshot(BaseSnapshot):
+
+    def __init__(self, provider, snapshot):
+        super(MockSnapshot, self).__init__(provider)
+        self._record = snapshot
+
+    def _update(self, **attributes):
+        self._provider.mock_client.update('snapshots', self.id, **attributes)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    # pylint:disable=arguments-differ
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._update(name=value)
+
+    @property
+    def description(self):
+        return self._record.get('description')
+
+    @description.setter
+    def description(self, value):
+        self._update(description=value)
+
+    @property
+    def size(self):
+        return self._record.get('size')
+
+    @property
+    def volume_id(self):
+        return self._record.get('volume_id')
+
+    @property
+    def create_time(self):
+        return iso_time(self._record['create_time'])
+
+    @property
+    def state(self):
+        return self._record.get('state', SnapshotState.UNKNOWN)
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'snapshots', self.id) or dict(self._record,
+                                          state=SnapshotState.UNKNOWN)
+
+    def delete(self):
+        self._provider.mock_client.delete('snapshots', self.id)
+
+    def create_volume(self, placement, size=None, volume_type=None, iops=None):
+        return self._provider.storage.volumes.create(
+            name=self.name, size=size or self.size, zone=placement,
+            snapshot=self.id)
+
+
+class MockKeyPair(BaseKeyPair):
+
+    def __init__(self, provider, key_pair):
+        super(MockKeyPair, self).__init__(provider, key_pair)
+
+    @property
+    def id(self):
+        return self._key_pair['name']
+
+    @property
+    def name(self):
+        return self._key_pair['name']
+
+    def delete(self):
+        self._provider.mock_client.delete('key_pairs', self.id)
+
+
+class MockVMFirewall(BaseVMFirewall):
+
+    def __init__(self, provider, vm_firewall):
+        super(MockVMFirewall, self).__init__(provider, vm_firewall)
+        self._rule_container = MockVMFirewallRuleContainer(provider, self)
+
+    @property
+    def id(self):
+        return self._vm_firewall['id']
+
+    @property
+    def name(self):
+        return self._vm_firewall.get('name')
+
+    @property
+    def description(self):
+        return self._vm_firewall.get('description')
+
+    @property
+    def network_id(self):
+        return self._vm_firewall.get('network_id')
+
+    @property
+    def rules(self):
+        return self._rule_container
+
+    def delete(self):
+        self._provider.mock_client.delete('vm_firewalls', self.id)
+
+    def refresh(self):
+        self._vm_firewall = self._provider.mock_client.get(
+            'vm_firewalls', self.id) or self._vm_firewall
+
+    def to_json(self):
+        attr = inspect.getmembers(self, lambda a: not inspect.isroutine(a))
+        js = {k: v for (k, v) in attr if not k.startswith('_')}
+        json_rules = [r.to_json() for r in self.rules]
+        js['rules'] = json_rules
+        if js.get('network_id'):
+            js.pop('network_id')  # Omit for consistency across cloud providers
+        return js
+
+
+class MockVMFirewallRuleContainer(BaseVMFirewallRuleContainer):
+
+    def __init__(self, provider, firewall):
+        super(MockVMFirewallRuleContainer, self).__init__(provider, firewall)
+
+    def _set_rules(self, rules):
+        self._provider.mock_client.update('vm_firewalls', self.firewall.id,
+                                          rules=rules)
+        self.firewall.refresh()
+
+    def list(self, limit=None, marker=None):
+        # pylint:disable=protected-access
+        rules = [MockVMFirewallRule(self.firewall, r)
+                 for r in self.firewall._vm_firewall.get('rules', [])]
+        return ClientPagedResultList(self._provider, rules,
+                                     limit=limit, marker=marker)
+
+    def create(self, direction, protocol=None, from_port=None,
+               to_port=None, cidr=None, src_dest_fw=None):
+        if direction not in (TrafficDirection.INBOUND,
+                             TrafficDirection.OUTBOUND):
+            raise InvalidValueException("direction", direction)
+        src_dest_fw_id = (src_dest_fw.id if isinstance(src_dest_fw, VMFirewall)
+                          else src_dest_fw)
+        rule = {'direction': direction, 'protocol': protocol,
+                'from_port': from_port, 'to_port': to_port, 'cidr': cidr,
+                'src_dest_fw_id': src_dest_fw_id}
+        # pylint:disable=protected-access
+        rules = list(self.firewall._vm_firewall.get('rules', []))
+        # Adding an existing rule again succeeds without duplicating it
+        if rule not in rules:
+            self._set_rules(rules + [rule])
+        return MockVMFirewallRule(self.firewall, rule)
+
+
+class MockVMFirewallRule(BaseVMFirewallRule):
+
+    def __init__(self, parent_fw, rule):
+        super(MockVMFirewallRule, self).__init__(parent_fw, rule)
+
+        # cache id
+        md5 = hashlib.md5()
+        md5.update(self._name.encode('ascii'))
+        self._id = md5.hexdigest()
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def direction(self):
+        return self._rule.get('direction')
+
+    @property
+    def protocol(self):
+        return self._rule.get('protocol')
+
+    @property
+    def from_port(self):
+        return self._rule.get('from_port')
+
+    @property
+    def to_port(self):
+        return self._rule.get('to_port')
+
+    @property
+    def cidr(self):
+        return self._rule.get('cidr')
+
+    @property
+    def src_dest_fw_id(self):
+        return self._rule.get('src_dest_fw_id')
+
+    @property
+    def src_dest_fw(self):
+        if self.src_dest_fw_id:
+            return self._provider.security.vm_firewalls.get(
+                self.src_dest_fw_id)
+        return None
+
+    def delete(self):
+        # pylint:disable=protected-access
+        self.firewall.rules._set_rules(
+            [r for r in self.firewall._vm_firewall.get('rules', [])
+             if r != self._rule])
+
+
+class MockBucketObject(BaseBucketObject):
+
+    def __init__(self, provider, bucket_name, obj):
+        super(MockBucketObject, self).__init__(provider)
+        self._bucket_name = bucket_name
+        self._record = obj
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self.id
+
+    @property
+    def size(self):
+        return self._record['size']
+
+    @property
+    def last_modified(self):
+        return iso_time(self._record['last_modified'])
+
+    def iter_content(self, start=None, end=None):
+        if start is not None or end is not None:
+            return BytesIO(self._provider.mock_client.get_object_range(
+                self._bucket_name, self.id, start or 0, end))
+        obj = self._provider.mock_client.get_object(self._bucket_name,
+                                                    self.id)
+        return BytesIO(obj['data'] if obj else b'')
+
+    def download_to_file(self, path, parts=None, max_workers=None,
+                         resume=False, verify=False):
+        download = MockRangedDownload(self._provider, self._bucket_name,
+                                      self.id, path, parts, max_workers)
+        return download.download(resume, verify)
+
+    def upload(self, data):
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        self._record = self._provider.mock_client.put_object(
+            self._bucket_name, self.id, data)
+
+    def upload_from_file(self, path, part_size=None, max_workers=None):
+        upload = MockMultipartUpload(self._provider, self._bucket_name,
+                                     self.id, path, part_size, max_workers)
+        upload.upload()
+        self._record = self._provider.mock_client.get_object(
+            self._bucket_name, self.id)
+        return True
+
+    def delete(self):
+        self._provider.mock_client.delete_objects(self._bucket_name,
+                                                  [self.id])
+
+    def generate_url(self, expires_in=0):
+        return 'mock://{0}/{1}?expires_in={2}'.format(self._bucket_name,
+                                                      self.id, expires_in)
+
+
+class MockBucket(BaseBucket):
+
+    def __init__(self, provider, bucket):
+        super(MockBucket, self).__init__(provider)
+        self._record = bucket
+        self._object_container = MockBucketContainer(provider, self)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self._record['id']
+
+    @property
+    def objects(self):
+        return self._object_container
+
+    def delete(self, delete_contents=False):
+        client = self._provider.mock_client
+        keys = [obj['id'] for obj in client.list_objects(self.name)[0]]
+        if keys and not delete_contents:
+            raise ProviderInternalException(
+                "Bucket {0} is not empty".format(self.name))
+        if keys:
+            client.delete_objects(self.name, keys)
+        client.delete('buckets', self.name)
+
+
+class MockBucketContainer(BaseBucketContainer):
+
+    def __init__(self, provider, bucket):
+        super(MockBucketContainer, self).__init__(provider, bucket)
+
+    def get(self, name):
+        obj = self._provider.mock_client.get_object(self.bucket.name, name)
+        return (MockBucketObject(self._provider, self.bucket.name, obj)
+                if obj else None)
+
+    def list(self, limit=None, marker=None, prefix=None):
+        limit = limit or self._provider.config.default_result_limit
+        records, is_truncated = self._provider.mock_client.list_objects(
+            self.bucket.name, limit=limit, marker=marker, prefix=prefix)
+        results = [MockBucketObject(self._provider, self.bucket.name, obj)
+                   for obj in records]
+        return ServerPagedResultList(
+            is_truncated, results[-1].id if is_truncated else None, False,
+            data=results)
+
+    def find(self, **kwargs):
+        obj_list = self
+        filters = ['name']
+        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
+        return ClientPagedResultList(self._provider, list(matches),
+                                     limit=None, marker=None)
+
+    def create(self, name):
+        MockBucketObject.assert_valid_resource_name(name)
+        # As with S3, the object is only stored once content is uploaded
+        return MockBucketObject(self._provider, self.bucket.name, {
+            'id': name, 'data': b'', 'size': 0,
+            'last_modified': time.time()})
+
+
+class MockRegion(BaseRegion):
+
+    def __init__(self, provider, region_name):
+        super(MockRegion, self).__init__(provider)
+        self._region_name = region_name
+
+    @property
+    def id(self):
+        return self._region_name
+
+    @property
+    def name(self):
+        return self._region_name
+
+    @property
+    def zones(self):
+        # Reuses the client for the region
+        client = self._provider.for_region(self.id).mock_client
+        return [MockPlacementZone(self._provider, zone, self.id)
+                for zone in client.list_zones(self.id)]
+
+
+class MockNetwork(BaseNetwork):
+
+    def __init__(self, provider, network):
+        super(MockNetwork, self).__init__(provider)
+        self._record = network
+        self._gtw_container = MockGatewayContainer(provider, self)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._provider.mock_client.update('networks', self.id, name=value)
+
+    @property
+    def external(self):
+        return True
+
+    @property
+    def state(self):
+        return self._record.get('state', NetworkState.UNKNOWN)
+
+    @property
+    def cidr_block(self):
+        return self._record.get('cidr_block')
+
+    def delete(self):
+        self._provider.mock_client.delete('networks', self.id)
+
+    @property
+    def subnets(self):
+        records, _ = self._provider.mock_client.list('subnets',
+                                                     network_id=self.id)
+        return [MockSubnet(self._provider, record) for record in records]
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'networks', self.id) or dict(self._record,
+                                         state=NetworkState.UNKNOWN)
+
+    @property
+    def gateways(self):
+        return self._gtw_container
+
+
+class MockSubnet(BaseSubnet):
+
+    def __init__(self, provider, subnet):
+        super(MockSubnet, self).__init__(provider)
+        self._record = subnet
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._provider.mock_client.update('subnets', self.id, name=value)
+
+    @property
+    def cidr_block(self):
+        return self._record.get('cidr_block')
+
+    @property
+    def network_id(self):
+        return self._record.get('network_id')
+
+    @property
+    def zone(self):
+        return MockPlacementZone(self._provider, self._record.get('zone_id'),
+                                 self._provider.region_name)
+
+    def delete(self):
+        self._provider.mock_client.delete('subnets', self.id)
+
+    @property
+    def state(self):
+        return self._record.get('state', SubnetState.UNKNOWN)
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'subnets', self.id) or dict(self._record,
+                                        state=SubnetState.UNKNOWN)
+
+
+class MockFloatingIPContainer(BaseFloatingIPContainer):
+
+    def __init__(self, provider, gateway):
+        super(MockFloatingIPContainer, self).__init__(provider, gateway)
+        self.svc = MockResourceService(provider, MockFloatingIP,
+                                       'floating_ips')
+
+    def get(self, fip_id):
+        fip = self.svc.get(fip_id)
+        # pylint:disable=protected-access
+        return fip if fip and fip._record.get(
+            'gateway_id') == self.gateway.id else None
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker,
+                             gateway_id=self.gateway.id)
+
+    def create(self):
+        return self.svc.create(
+            gateway_id=self.gateway.id, instance_id=None, private_ip=None,
+            public_ip=self._provider.mock_client.next_ip('203.0'))
+
+
+class MockFloatingIP(BaseFloatingIP):
+
+    def __init__(self, provider, floating_ip):
+        super(MockFloatingIP, self).__init__(provider)
+        self._record = floating_ip
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def public_ip(self):
+        return self._record.get('public_ip')
+
+    @property
+    def private_ip(self):
+        return self._record.get('private_ip')
+
+    @property
+    def in_use(self):
+        return True if self._record.get('instance_id') else False
+
+    def delete(self):
+        self._provider.mock_client.delete('floating_ips', self.id)
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'floating_ips', self.id) or self._record
+
+
+class MockRouter(BaseRouter):
+
+    def __init__(self, provider, router):
+        super(MockRouter, self).__init__(provider)
+        self._record = router
+
+    def _update(self, **attributes):
+        self._provider.mock_client.update('routers', self.id, **attributes)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._update(name=value)
+
+    def refresh(self):
+        self._record = self._provider.mock_client.get(
+            'routers', self.id) or dict(self._record, subnet_ids=[])
+
+    @property
+    def state(self):
+        if self._record.get('subnet_ids'):
+            return RouterState.ATTACHED
+        return RouterState.DETACHED
+
+    @property
+    def network_id(self):
+        return self._record.get('network_id')
+
+    def delete(self):
+        self._provider.mock_client.delete('routers', self.id)
+
+    def attach_subnet(self, subnet):
+        subnet_id = subnet.id if isinstance(subnet, Subnet) else subnet
+        subnet_ids = list(self._record.get('subnet_ids') or [])
+        if subnet_id not in subnet_ids:
+            self._update(subnet_ids=subnet_ids + [subnet_id])
+        self.refresh()
+
+    def detach_subnet(self, subnet):
+        subnet_id = subnet.id if isinstance(subnet, Subnet) else subnet
+        self._update(subnet_ids=[sn_id for sn_id
+                                 in self._record.get('subnet_ids') or []
+                                 if sn_id != subnet_id])
+        self.refresh()
+
+    def attach_gateway(self, gateway):
+        gw_id = (gateway.id if isinstance(gateway, InternetGateway)
+                 else gateway)
+        self._update(gateway_id=gw_id)
+        return True
+
+    def detach_gateway(self, gateway):
+        self._update(gateway_id=None)
+        return True
+
+
+class MockGatewayContainer(BaseGatewayContainer):
+
+    def __init__(self, provider, network):
+        super(MockGatewayContainer, self).__init__(provider, network)
+        self.svc = MockResourceService(provider, MockInternetGateway,
+                                       'gateways')
+
+    def get_or_create_inet_gateway(self, name=None):
+        if name:
+            MockInternetGateway.assert_valid_resource_name(name)
+        gtw = self.svc.list(network_id=self._network.id)
+        if gtw:
+            return gtw[0]  # There can be only one gtw attached to a network
+        return self.svc.create(name=name, network_id=self._network.id)
+
+    def delete(self, gateway):
+        gateway_id = (gateway.id if isinstance(gateway, InternetGateway)
+                      else gateway)
+        self.svc.delete(gateway_id)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker,
+                             network_id=self._network.id)
+
+
+class MockInternetGateway(BaseInternetGateway):
+
+    def __init__(self, provider, gateway):
+        super(MockInternetGateway, self).__init__(provider)
+        self._record = gateway
+        self._state = GatewayState.AVAILABLE
+        self._fips_container = MockFloatingIPContainer(provider, self)
+
+    @property
+    def id(self):
+        return self._record['id']
+
+    @property
+    def name(self):
+        return self._record.get('name')
+
+    @name.setter
+    # pylint:disable=arguments-differ
+    def name(self, value):
+        self.assert_valid_resource_name(value)
+        self._provider.mock_client.update('gateways', self.id, name=value)
+
+    def refresh(self):
+        record = self._provider.mock_client.get('gateways', self.id)
+        if record:
+            self._record = record
+        else:
+            self._state = GatewayState.UNKNOWN
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def network_id(self):
+        return self._record.get('network_id')
+
+    def delete(self):
+        self._provider.mock_client.delete('gateways', self.id)
+
+    @property
+    def floating_ips(self):
+        return self._fips_container
+
+
+class MockLaunchConfig(BaseLaunchConfig):
+
+    def __init__(self, provider):
+        super(MockLaunchConfig, self).__init__(provider)
@@ -0,0 +1,540 @@
+"""Services implemented by the mock provider."""
+import logging
+
+import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.services import BaseBucketService
+from cloudbridge.cloud.base.services import BaseBulkService
+from cloudbridge.cloud.base.services import BaseComputeService
+from cloudbridge.cloud.base.services import BaseImageService
+from cloudbridge.cloud.base.services import BaseInstanceService
+from cloudbridge.cloud.base.services import BaseKeyPairService
+from cloudbridge.cloud.base.services import BaseNetworkService
+from cloudbridge.cloud.base.services import BaseNetworkingService
+from cloudbridge.cloud.base.services import BaseRegionService
+from cloudbridge.cloud.base.services import BaseRouterService
+from cloudbridge.cloud.base.services import BaseSecurityService
+from cloudbridge.cloud.base.services import BaseSnapshotService
+from cloudbridge.cloud.base.services import BaseStorageService
+from cloudbridge.cloud.base.services import BaseSubnetService
+from cloudbridge.cloud.base.services import BaseVMFirewallService
+from cloudbridge.cloud.base.services import BaseVMTypeService
+from cloudbridge.cloud.base.services import BaseVolumeService
+from cloudbridge.cloud.interfaces.exceptions \
+    import ProviderInternalException
+from cloudbridge.cloud.interfaces.resources import InstanceState
+from cloudbridge.cloud.interfaces.resources import KeyPair
+from cloudbridge.cloud.interfaces.resources import MachineImage
+from cloudbridge.cloud.interfaces.resources import Network
+from cloudbridge.cloud.interfaces.resources import NetworkState
+from cloudbridge.cloud.interfaces.resources import PlacementZone
+from cloudbridge.cloud.interfaces.resources import Snapshot
+from cloudbridge.cloud.interfaces.resources import SnapshotState
+from cloudbridge.cloud.interfaces.resources import Subnet
+from cloudbridge.cloud.interfaces.resources import SubnetState
+from cloudbridge.cloud.interfaces.resources import TrafficDirection
+from cloudbridge.cloud.interfaces.resources import VMFirewall
+from cloudbridge.cloud.interfaces.resources import VMType
+from cloudbridge.cloud.interfaces.resources import Volume
+from cloudbridge.cloud.interfaces.resources import VolumeState
+
+from .helpers import MockResourceService
+from .mock_client import REGIONS
+from .mock_client import VM_TYPES
+from .resources import MockBucket
+from .resources import MockBucketObject
+from .resources import MockInstance
+from .resources import MockKeyPair
+from .resources import MockLaunchConfig
+from .resources import MockMachineImage
+from .resources import MockNetwork
+from .resources import MockRegion
+from .resources import MockRouter
+from .resources import MockSnapshot
+from .resources import MockSubnet
+from .resources import MockVMFirewall
+from .resources import MockVMType
+from .resources import MockVolume
+
+log = logging.getLogger(__name__)
+
+
+class MockSecurityService(BaseSecurityService):
+
+    def __init__(self, provider):
+        super(MockSecurityService, self).__init__(provider)
+
+        # Initialize provider services
+        self._key_pairs = MockKeyPairService(provider)
+        self._vm_firewalls = MockVMFirewallService(provider)
+
+    @property
+    def key_pairs(self):
+        return self._key_pairs
+
+    @property
+    def vm_firewalls(self):
+        return self._vm_firewalls
+
+
+class MockKeyPairService(BaseKeyPairService):
+
+    def __init__(self, provider):
+        super(MockKeyPairService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockKeyPair, 'key_pairs')
+
+    def get(self, key_pair_id):
+        return self.svc.get(key_pair_id)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def create(self, name, public_key_material=None):
+        MockKeyPair.assert_valid_resource_name(name)
+        private_key = None
+        if not public_key_material:
+            public_key_material, private_key = cb_helpers.generate_key_pair()
+        kp = self.svc.create(key=name, name=name,
+                             public_key=public_key_material)
+        kp.material = private_key
+        return kp
+
+
+class MockVMFirewallService(BaseVMFirewallService):
+
+    def __init__(self, provider):
+        super(MockVMFirewallService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockVMFirewall,
+                                       'vm_firewalls')
+
+    def get(self, firewall_id):
+        return self.svc.get(firewall_id)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def create(self, name, description, network_id):
+        MockVMFirewall.assert_valid_resource_name(name)
+        network_id = (network_id.id if isinstance(network_id, Network)
+                      else network_id)
+        # Like a new AWS security group, allow all outbound traffic
+        return self.svc.create(
+            name=name, description=description, network_id=network_id,
+            rules=[{'direction': TrafficDirection.OUTBOUND, 'protocol': '-1',
+                    'from_port': None, 'to_port': None,
+                    'cidr': '0.0.0.0/0', 'src_dest_fw_id': None}])
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def delete(self, firewall_id):
+        self.svc.delete(firewall_id)
+
+
+class MockStorageService(BaseStorageService):
+
+    def __init__(self, provider):
+        super(MockStorageService, self).__init__(provider)
+
+        # Initialize provider services
+        self._volume_svc = MockVolumeService(self.provider)
+        self._snapshot_svc = MockSnapshotService(self.provider)
+        self._bucket_svc = MockBucketService(self.provider)
+
+    @property
+    def volumes(self):
+        return self._volume_svc
+
+    @property
+    def snapshots(self):
+        return self._snapshot_svc
+
+    @property
+    def buckets(self):
+        return self._bucket_svc
+
+
+class MockVolumeService(BaseVolumeService):
+
+    def __init__(self, provider):
+        super(MockVolumeService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockVolume, 'volumes')
+
+    def get(self, volume_id):
+        return self.svc.get(volume_id)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def _refresh_all(self, volumes):
+        current = self.svc.get_many([vol.id for vol in volumes])
+        for vol in volumes:
+            if vol.id in current:
+                # pylint:disable=protected-access
+                vol._record = current[vol.id]
+            else:
+                # No longer exists; let the resource record that itself
+                vol.refresh()
+
+    def create(self, name, size, zone, snapshot=None, description=None):
+        MockVolume.assert_valid_resource_name(name)
+        zone_id = zone.id if isinstance(zone, PlacementZone) else zone
+        snapshot_id = snapshot.id if isinstance(
+            snapshot, Snapshot) else snapshot
+        return self.svc.create(name=name, size=size, zone_id=zone_id,
+                               snapshot_id=snapshot_id,
+                               description=description, attachment=None,
+                               state=VolumeState.AVAILABLE)
+
+
+class MockSnapshotService(BaseSnapshotService):
+
+    def __init__(self, provider):
+        super(MockSnapshotService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockSnapshot, 'snapshots')
+
+    def get(self, snapshot_id):
+        return self.svc.get(snapshot_id)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def _refresh_all(self, snapshots):
+        current = self.svc.get_many([snap.id for snap in snapshots])
+        for snap in snapshots:
+            if snap.id in current:
+                # pylint:disable=protected-access
+                snap._record = current[snap.id]
+            else:
+                # No longer exists; let the resource record that itself
+                snap.refresh()
+
+    def create(self, name, volume, description=None):
+        MockSnapshot.assert_valid_resource_name(name)
+        volume = (volume if isinstance(volume, Volume)
+                  else self.provider.storage.volumes.get(volume))
+        return self.svc.create(name=name, volume_id=volume.id,
+                               size=volume.size, description=description,
+                               state=SnapshotState.AVAILABLE)
+
+
+class MockBucketService(BaseBucketService):
+
+    def __init__(self, provider):
+        super(MockBucketService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockBucket, 'buckets')
+
+    def get(self, bucket_id):
+        return self.svc.get(bucket_id)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def create(self, name, location=None):
+        MockBucket.assert_valid_resource_name(name)
+        return MockBucket(self.provider, self.provider.mock_client
+                          .create_bucket(name, location=location or
+                                         self.provider.region_name))
+
+
+class MockImageService(BaseImageService):
+
+    def __init__(self, provider):
+        super(MockImageService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockMachineImage, 'images')
+
+    def get(self, image_id):
+        return self.svc.get(image_id)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def list(self, filter_by_owner=True, limit=None, marker=None):
+        if filter_by_owner:
+            return self.svc.list(limit=limit, marker=marker, owner='self')
+        return self.svc.list(limit=limit, marker=marker)
+
+
+class MockComputeService(BaseComputeService):
+
+    def __init__(self, provider):
+        super(MockComputeService, self).__init__(provider)
+        self._vm_type_svc = MockVMTypeService(self.provider)
+        self._instance_svc = MockInstanceService(self.provider)
+        self._region_svc = MockRegionService(self.provider)
+        self._images_svc = MockImageService(self.provider)
+
+    @property
+    def images(self):
+        return self._images_svc
+
+    @property
+    def vm_types(self):
+        return self._vm_type_svc
+
+    @property
+    def instances(self):
+        return self._instance_svc
+
+    @property
+    def regions(self):
+        return self._region_svc
+
+
+class MockInstanceService(BaseInstanceService):
+
+    def __init__(self, provider):
+        super(MockInstanceService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockInstance, 'instances')
+
+    def create(self, name, image, vm_type, subnet, zone=None,
+               key_pair=None, vm_firewalls=None, user_data=None,
+               launch_config=None, **kwargs):
+        MockInstance.assert_valid_resource_name(name)
+
+        image_id = image.id if isinstance(image, MachineImage) else image
+        vm_type_id = vm_type.id if isinstance(vm_type, VMType) else vm_type
+        subnet = (subnet if isinstance(subnet, Subnet)
+                  else self.provider.networking.subnets.get(subnet))
+        zone_id = zone.id if isinstance(zone, PlacementZone) else zone
+        if subnet:
+            # subnet's zone takes precedence
+            zone_id = subnet.zone.id
+        key_pair_name = (key_pair.name if isinstance(key_pair, KeyPair)
+                         else key_pair)
+        vm_firewall_ids = [fw.id if isinstance(fw, VMFirewall) else fw
+                           for fw in vm_firewalls or []]
+        block_devices = len(launch_config.block_devices
+                            if launch_config else [])
+
+        return self.svc.create(
+            name=name, image_id=image_id, vm_type_id=vm_type_id,
+            subnet_id=subnet.id if subnet else None, zone_id=zone_id,
+            key_pair_name=key_pair_name, vm_firewall_ids=vm_firewall_ids,
+            user_data=user_data, block_devices=block_devices,
+            private_ip=self.provider.mock_client.next_ip('10.0'),
+            public_ip=None, state=InstanceState.RUNNING)
+
+    def create_launch_config(self):
+        return MockLaunchConfig(self.provider)
+
+    def get(self, instance_id):
+        return self.svc.get(instance_id)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def _refresh_all(self, instances):
+        current = self.svc.get_many([inst.id for inst in instances])
+        for inst in instances:
+            if inst.id in current:
+                # pylint:disable=protected-access
+                inst._record = current[inst.id]
+            else:
+                # No longer exists; let the resource record that itself
+                inst.refresh()
+
+
+class MockVMTypeService(BaseVMTypeService):
+
+    def __init__(self, provider):
+        super(MockVMTypeService, self).__init__(provider)
+        self._vm_types = [MockVMType(provider, vm_type)
+                          for vm_type in VM_TYPES]
+
+    def list(self, limit=None, marker=None):
+        return ClientPagedResultList(self.provider, self._vm_types,
+                                     limit=limit, marker=marker)
+
+
+class MockRegionService(BaseRegionService):
+
+    def __init__(self, provider):
+        super(MockRegionService, self).__init__(provider)
+
+    def get(self, region_id):
+        if region_id in self.provider.mock_client.list_regions():
+            return MockRegion(self.provider, region_id)
+        return None
+
+    def list(self, limit=None, marker=None):
+        regions = [MockRegion(self.provider, region_name) for region_name
+                   in self.provider.mock_client.list_regions()]
+        return ClientPagedResultList(self.provider, regions,
+                                     limit=limit, marker=marker)
+
+    @property
+    def current(self):
+        return self.get(self.provider.region_name)
+
+
+class MockNetworkingService(BaseNetworkingService):
+
+    def __init__(self, provider):
+        super(MockNetworkingService, self).__init__(provider)
+        self._network_service = MockNetworkService(self.provider)
+        self._subnet_service = MockSubnetService(self.provider)
+        self._router_service = MockRouterService(self.provider)
+
+    @property
+    def networks(self):
+        return self._network_service
+
+    @property
+    def subnets(self):
+        return self._subnet_service
+
+    @property
+    def routers(self):
+        return self._router_service
+
+
+class MockNetworkService(BaseNetworkService):
+
+    def __init__(self, provider):
+        super(MockNetworkService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockNetwork, 'networks')
+
+    def get(self, network_id):
+        return self.svc.get(network_id)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def create(self, name, cidr_block):
+        MockNetwork.assert_valid_resource_name(name)
+        return self.svc.create(name=name, cidr_block=cidr_block,
+                               state=NetworkState.AVAILABLE)
+
+
+class MockSubnetService(BaseSubnetService):
+
+    def __init__(self, provider):
+        super(MockSubnetService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockSubnet, 'subnets')
+
+    def get(self, subnet_id):
+        return self.svc.get(subnet_id)
+
+    def list(self, network=None, limit=None, marker=None):
+        network_id = network.id if isinstance(network, Network) else network
+        if network_id:
+            return self.svc.list(limit=limit, marker=marker,
+                                 network_id=network_id)
+        return self.svc.list(limit=limit, marker=marker)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def create(self, name, network, cidr_block, zone=None):
+        MockSubnet.assert_valid_resource_name(name)
+        network_id = network.id if isinstance(network, Network) else network
+        zone_id = zone.id if isinstance(zone, PlacementZone) else zone
+        return self.svc.create(
+            name=name, network_id=network_id, cidr_block=cidr_block,
+            zone_id=zone_id or REGIONS[self.provider.region_name][0],
+            state=SubnetState.AVAILABLE)
+
+    def get_or_create_default(self, zone=None):
+        zone_id = zone.id if isinstance(zone, PlacementZone) else zone
+        records, _ = self.provider.mock_client.list(
+            'subnets', name=MockSubnet.CB_DEFAULT_SUBNET_NAME)
+        for record in records:
+            if not zone_id or record['zone_id'] == zone_id:
+                return MockSubnet(self.provider, record)
+        # No default subnet exists, so create a network with a subnet in
+        # each of the region's zones
+        default_net = self.provider.networking.networks.create(
+            name=MockNetwork.CB_DEFAULT_NETWORK_NAME,
+            cidr_block='10.0.0.0/16')
+        default_sn = None
+        zones = self.provider.mock_client.list_zones(
+            self.provider.region_name)
+        for i, z in enumerate(zones):
+            sn = self.create(MockSubnet.CB_DEFAULT_SUBNET_NAME, default_net,
+                             '10.0.{0}.0/24'.format(i), z)
+            if not default_sn or zone_id == z:
+                default_sn = sn
+        return default_sn
+
+    def delete(self, subnet):
+        subnet_id = subnet.id if isinstance(subnet, Subnet) else subnet
+        self.svc.delete(subnet_id)
+
+
+class MockRouterService(BaseRouterService):
+
+    def __init__(self, provider):
+        super(MockRouterService, self).__init__(provider)
+        self.svc = MockResourceService(provider, MockRouter, 'routers')
+
+    def get(self, router_id):
+        return self.svc.get(router_id)
+
+    def find(self, **kwargs):
+        return self.svc.find(**kwargs)
+
+    def list(self, limit=None, marker=None):
+        return self.svc.list(limit=limit, marker=marker)
+
+    def create(self, name, network):
+        MockRouter.assert_valid_resource_name(name)
+        network_id = network.id if isinstance(network, Network) else network
+        return self.svc.create(name=name, network_id=network_id,
+                               subnet_ids=[], gateway_id=None)
+
+
+class MockBulkService(BaseBulkService):
+
+    def __init__(self, provider):
+        super(MockBulkService, self).__init__(provider)
+
+    def _batch_delete(self, items):
+        """
+        Delete instances, and the objects of each bucket, in a single call
+        each.
+        """
+        client = self.provider.mock_client
+        instances = [item for item in items
+                     if isinstance(item.resource, MockInstance)]
+        objects = [item for item in items
+                   if isinstance(item.resource, MockBucketObject)]
+        if instances:
+            client.delete_many('instances',
+                               [item.resource.id for item in instances])
+        by_bucket = {}
+        for item in objects:
+            # pylint:disable=protected-access
+            by_bucket.setdefault(item.resource._bucket_name,
+                                 []).append(item)
+        rejected = []
+        for bucket_name, bucket_items in by_bucket.items():
+            try:
+                client.delete_objects(
+                    bucket_name, [item.resource.id for item in bucket_items])
+            except ProviderInternalException as e:
+                log.debug("Batch delete of %s objects from %s failed,"
+                          " falling back to individual deletes: %s",
+                          len(bucket_items), bucket_name, e)
+                rejected.extend(bucket_items)
+        batched = set(id(item) for item in instances + objects)
+        return [item for item in items
+                if id(item) not in batched] + rejected
@@ -2,9 +2,21 @@
 Helper functions
 """
 import itertools
+import json
 import logging as log
+import threading
+import time
 
 from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.base.transfer import BaseMultipartUpload
+from cloudbridge.cloud.base.transfer import BaseRangedDownload
+from cloudbridge.cloud.base.transfer import READ_CHUNK_SIZE
+from cloudbridge.cloud.interfaces.exceptions \
+    import TransferIntegrityException
+
+from six.moves.urllib.parse import unquote
+
+from swiftclient import ClientException
 
 
 def os_result_limit(provider, requested_limit=None):
@@ -38,3 +50,192 @@ def to_server_paged_list(provider, objects, limit=None):
     for obj in itertools.islice(objects, limit):
         results.append(obj)
     return results
+
+
+def find_by_ids(list_page, ids):
+    """
+    Finds the native objects with the given ids without listing the whole
+    project. ``list_page(limit, marker)`` must return one page of a listing
+    sorted newest first, which is the Nova and Cinder default. Pages of
+    ``len(ids)`` objects are fetched until every id is found, the listing
+    ends or a page contains none of the remaining ids. Objects which were
+    not found are older or no longer exist, and are left out of the result.
+
+    :rtype: ``dict``
+    :return: The objects that were found, keyed by id.
+    """
+    remaining = set(ids)
+    limit = len(remaining)
+    found = {}
+    marker = None
+    while remaining:
+        page = list(list_page(limit, marker))
+        matches = [obj for obj in page if obj.id in remaining]
+        for obj in matches:
+            found[obj.id] = obj
+            remaining.discard(obj.id)
+        if not matches or len(page) < limit:
+            break
+        marker = page[-1].id
+    return found
+
+
+class SwiftConnectionMixin(object):
+    """
+    Gives each thread of a transfer its own Swift connection, as connections
+    cannot be shared between threads. Requires a ``threading.local()`` as
+    ``self._local``.
+    """
+
+    @property
+    def _connection(self):
+        if not getattr(self._local, 'connection', None):
+            # pylint:disable=protected-access
+            self._local.connection = self.provider._connect_swift()
+        return self._local.connection
+
+
+class SwiftSegmentedUpload(SwiftConnectionMixin, BaseMultipartUpload):
+    """
+    Uploads a file to a Swift object as a static large object. The parts
+    are stored as segments in the ``<container>_segments`` container, named
+    as by the ``swift`` command line client, and the object is a manifest
+    listing each segment with its ETag. Swift checks the segments against
+    the manifest when it is written, and reads of the object do not depend
+    on container listings, which are only eventually consistent.
+
+    Once the new object is written, the segments of the large object it
+    replaced, if any, are deleted.
+    """
+    # Swift's default limits for static large objects
+    MIN_PART_SIZE = 1024 * 1024
+    MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+    MAX_PARTS = 1000
+
+    def __init__(self, provider, container_name, object_name, path,
+                 part_size=None, max_workers=None):
+        super(SwiftSegmentedUpload, self).__init__(provider, path, part_size,
+                                                   max_workers)
+        self._container_name = container_name
+        self._object_name = object_name
+        self._segment_container = '{0}_segments'.format(container_name)
+        self._segment_prefix = '{0}/{1:.6f}/{2}/{3}/'.format(
+            object_name, time.time(), self.size, self.part_size)
+        self._local = threading.local()
+
+    def _old_segments(self):
+        """
+        Returns the ``(container, name)`` of each segment of the large
+        object being replaced, leaving out those of this upload.
+        """
+        try:
+            headers = self.provider.swift.head_object(self._container_name,
+                                                      self._object_name)
+        except ClientException as e:
+            if e.http_status == 404:
+                return []
+            raise
+        if headers.get('x-static-large-object', '').lower() == 'true':
+            _, manifest = self.provider.swift.get_object(
+                self._container_name, self._object_name,
+                query_string='multipart-manifest=get')
+            segments = [tuple(segment['name'].lstrip('/').split('/', 1))
+                        for segment in json.loads(manifest)]
+        elif headers.get('x-object-manifest'):
+            container, prefix = unquote(
+                headers['x-object-manifest']).split('/', 1)
+            _, listing = self.provider.swift.get_container(
+                container, prefix=prefix, full_listing=True)
+            segments = [(container, segment['name']) for segment in listing]
+        else:
+            return []
+        return [(container, name) for container, name in segments
+                if not (container == self._segment_container and
+                        name.startswith(self._segment_prefix))]
+
+    def _delete_old_segments(self, segments):
+        """
+        Deletes the segments of the replaced large object, once the new
+        object has been written.
+        """
+        try:
+            for container, name in segments:
+                self.provider.swift.delete_object(container, name)
+        except ClientException:
+            log.warning("Could not delete the old segments of %s/%s",
+                        self._container_name, self._object_name,
+                        exc_info=True)
+
+    def _upload_single(self):
+        old_segments = self._old_segments()
+        with open(self.path, 'rb') as contents:
+            self.provider.swift.put_object(
+                self._container_name, self._object_name, contents,
+                content_length=self.size)
+        self._delete_old_segments(old_segments)
+
+    def _begin(self):
+        self.provider.swift.put_container(self._segment_container)
+
+    def _upload_part(self, part):
+        segment_name = '{0}{1:08d}'.format(self._segment_prefix,
+                                           part.number - 1)
+        with part.open() as contents:
+            etag = self._connection.put_object(self._segment_container,
+                                               segment_name, contents,
+                                               content_length=part.length)
+        return {'path': '/{0}/{1}'.format(self._segment_container,
+                                          segment_name),
+                'etag': etag, 'size_bytes': part.length}
+
+    def _complete(self, results):
+        old_segments = self._old_segments()
+        self.provider.swift.put_object(
+            self._container_name, self._object_name, json.dumps(results),
+            query_string='multipart-manifest=put')
+        self._delete_old_segments(old_segments)
+
+    def _abort(self):
+        _, segments = self.provider.swift.get_container(
+            self._segment_container, prefix=self._segment_prefix,
+            full_listing=True)
+        for segment in segments:
+            self.provider.swift.delete_object(self._segment_container,
+                                              segment['name'])
+
+
+class SwiftRangedDownload(SwiftConnectionMixin, BaseRangedDownload):
+    """
+    Downloads a Swift object with ranged GET requests. The ETag of each
+    response must match the one the download started with, so that parts
+    of different versions of the object are never mixed.
+    """
+
+    def __init__(self, provider, container_name, object_name, path,
+                 parts=None, max_workers=None):
+        self._container_name = container_name
+        self._object_name = object_name
+        self._local = threading.local()
+        headers = provider.swift.head_object(container_name, object_name)
+        etag = headers.get('etag', '')
+        # The ETag of a large object is quoted, and is not its MD5
+        md5 = (etag if etag and not etag.startswith('"') and
+               'x-object-manifest' not in headers else None)
+        super(SwiftRangedDownload, self).__init__(
+            provider, path, int(headers['content-length']), etag, md5=md5,
+            parts=parts, max_workers=max_workers)
+        self._headers = {'If-Match': etag} if md5 else {}
+
+    def _write_range(self, stream, start, end):
+        headers = dict(self._headers, Range='bytes={0}-{1}'.format(start, end))
+        response_headers, content = self._connection.get_object(
+            self._container_name, self._object_name, headers=headers,
+            resp_chunk_size=READ_CHUNK_SIZE)
+        etag = response_headers.get('etag', '')
+        if etag.strip('"') != self.version.strip('"'):
+            raise TransferIntegrityException(
+                "{0}/{1} changed during the download, from ETag {2} to "
+                "{3}".format(self._container_name, self._object_name,
+                             self.version, etag))
+        for chunk in content:
+            stream.write(chunk)
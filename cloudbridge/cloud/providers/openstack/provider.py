@@ -1,13 +1,17 @@
 """Provider implementation based on OpenStack Python clients for OpenStack."""
 
 import inspect
+import logging
 import os
 
 from cinderclient import client as cinder_client
 
+import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base import BaseCloudProvider
 
 from keystoneauth1 import session
+from keystoneauth1.identity import v2
+from keystoneauth1.identity import v3
 
 from keystoneclient import client as keystone_client
 
@@ -17,7 +21,6 @@ from novaclient import client as nova_client
 from novaclient import shell as nova_shell
 
 from openstack import connection
-from openstack import profile
 
 from swiftclient import client as swift_client
 
@@ -26,6 +29,42 @@ from .services import OpenStackNetworkingService
 from .services import OpenStackSecurityService
 from .services import OpenStackStorageService
 
+log = logging.getLogger(__name__)
+
+# Number of seconds before expiry at which a token is replaced
+DEFAULT_TOKEN_REFRESH_WINDOW = 120
+
+
+class TokenRefreshingAuthMixin(object):
+    """
+    Extends a Keystone auth plugin to fetch a new token a configurable time
+    before the current one expires, and to count how many tokens have been
+    fetched.
+    """
+
+    def __init__(self, *args, **kwargs):
+        refresh_window = kwargs.pop('refresh_window',
+                                    DEFAULT_TOKEN_REFRESH_WINDOW)
+        super(TokenRefreshingAuthMixin, self).__init__(*args, **kwargs)
+        # Consulted by the plugin when deciding whether to reauthenticate
+        self.MIN_TOKEN_LIFE_SECONDS = refresh_window
+        self.token_fetches = 0
+
+    def get_auth_ref(self, session, **kwargs):
+        self.token_fetches += 1
+        log.debug("Fetching Keystone token (fetch number %s)",
+                  self.token_fetches)
+        return super(TokenRefreshingAuthMixin, self).get_auth_ref(
+            session, **kwargs)
+
+
+class V3Password(TokenRefreshingAuthMixin, v3.Password):
+    pass
+
+
+class V2Password(TokenRefreshingAuthMixin, v2.Password):
+    pass
+
 
 class OpenStackCloudProvider(BaseCloudProvider):
     """OpenStack provider implementation."""
@@ -62,8 +101,10 @@ class OpenStackCloudProvider(BaseCloudProvider):
         self._neutron = None
         self._os_conn = None
 
-        # Additional cached variables
+        # Additional cached variables. A single Keystone session is shared
+        # by all service clients so that they reuse the same token.
         self._cached_keystone_session = None
+        self._cached_keystone_version = None
 
         # Initialize provider services
         self._compute = OpenStackComputeService(self)
@@ -91,10 +132,11 @@ class OpenStackCloudProvider(BaseCloudProvider):
         :rtype: ``int``
         :return: Keystone version as an int (currently, 2 or 3).
         """
-        ks_version = keystone_client.Client(auth_url=self.auth_url).version
-        if ks_version == 'v3':
-            return 3
-        return 2
+        if not self._cached_keystone_version:
+            ks_version = keystone_client.Client(
+                auth_url=self.auth_url).version
+            self._cached_keystone_version = 3 if ks_version == 'v3' else 2
+        return self._cached_keystone_version
 
     @property
     def _keystone_session(self):
@@ -107,36 +149,51 @@ class OpenStackCloudProvider(BaseCloudProvider):
         if self._cached_keystone_session:
             return self._cached_keystone_session
 
+        refresh_window = int(self._get_config_value(
+            'os_token_refresh_window', DEFAULT_TOKEN_REFRESH_WINDOW))
         if self._keystone_version == 3:
-            from keystoneauth1.identity import v3
-            auth = v3.Password(auth_url=self.auth_url,
-                               username=self.username,
-                               password=self.password,
-                               user_domain_name=self.user_domain_name,
-                               project_domain_name=self.project_domain_name,
-                               project_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
+            auth = V3Password(auth_url=self.auth_url,
+                              username=self.username,
+                              password=self.password,
+                              user_domain_name=self.user_domain_name,
+                              project_domain_name=self.project_domain_name,
+                              project_name=self.project_name,
+                              refresh_window=refresh_window)
         else:
-            from keystoneauth1.identity import v2
-            auth = v2.Password(self.auth_url, username=self.username,
-                               password=self.password,
-                               tenant_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
+            auth = V2Password(self.auth_url, username=self.username,
+                              password=self.password,
+                              tenant_name=self.project_name,
+                              refresh_window=refresh_window)
+        # Keystone sessions take a single timeout, which is applied to the
+        # whole request, so use the read timeout here.
+        self._cached_keystone_session = session.Session(
+            auth=auth,
+            session=cb_helpers.create_http_session(
+                pool_size=self.config.http_pool_size,
+                keep_alive=self.config.http_keep_alive,
+                rate_limiter=self.rate_limiter,
+                instrumentation=self.instrumentation),
+            timeout=self.config.http_read_timeout)
         return self._cached_keystone_session
 
-    def _connect_openstack(self):
-        prof = profile.Profile()
-        prof.set_region(profile.Profile.ALL, self.region_name)
+    @property
+    def token_fetches(self):
+        """
+        The number of tokens fetched from Keystone by the shared session
+        during the lifetime of this provider.
+
+        :rtype: ``int``
+        :return: Number of token fetches.
+        """
+        if not self._cached_keystone_session:
+            return 0
+        return self._cached_keystone_session.auth.token_fetches
 
+    def _connect_openstack(self):
         return connection.Connection(
-            profile=prof,
-            user_agent='cloudbridge',
-            auth_url=self.auth_url,
-            project_name=self.project_name,
-            username=self.username,
-            password=self.password,
-            user_domain_name=self.user_domain_name,
-            project_domain_name=self.project_domain_name
+            session=self._keystone_session,
+            region_name=self.region_name,
+            app_name='cloudbridge'
         )
 
 #     @property
@@ -185,14 +242,26 @@ class OpenStackCloudProvider(BaseCloudProvider):
     def storage(self):
         return self._storage
 
+    def _region_config(self, region_name):
+        config = dict(self.config)
+        config['os_region_name'] = region_name
+        return config
+
+    def for_region(self, region_name):
+        region_provider = super(OpenStackCloudProvider, self).for_region(
+            region_name)
+        # Keystone tokens are valid in all regions, so share the session
+        # pylint:disable=protected-access
+        if not region_provider._cached_keystone_session:
+            region_provider._cached_keystone_session = \
+                self._cached_keystone_session
+        return region_provider
+
     def _connect_nova(self):
         return self._connect_nova_region(self.region_name)
 
     def _connect_nova_region(self, region_name):
         """Get an OpenStack Nova (compute) client object."""
-        # Force reauthentication with Keystone
-        self._cached_keystone_session = None
-
         api_version = self._get_config_value(
             'os_compute_api_version',
             os.environ.get('OS_COMPUTE_API_VERSION', 2))
@@ -314,6 +383,8 @@ class OpenStackCloudProvider(BaseCloudProvider):
         else:
             clean_options['authurl'] = self.auth_url
             clean_options['session'] = self._keystone_session
+        if self.config.http_read_timeout:
+            clean_options.setdefault('timeout', self.config.http_read_timeout)
         return swift_client.Connection(**clean_options)
 
     def _connect_neutron(self):
@@ -4,7 +4,6 @@ DataTypes used by this provider
 import inspect
 import ipaddress
 import logging
-import os
 
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseAttachmentInfo
@@ -30,6 +29,7 @@ from cloudbridge.cloud.base.resources import BaseVMFirewallRuleContainer
 from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.transfer import http_range
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
@@ -52,11 +52,7 @@ from openstack.exceptions import HttpException
 from openstack.exceptions import ResourceNotFound
 
 import swiftclient
-from swiftclient.service import SwiftService, SwiftUploadObject
-
-
-ONE_GIG = 1048576000  # in bytes
-FIVE_GIG = ONE_GIG * 5  # in bytes
+from swiftclient.service import SwiftService
 
 log = logging.getLogger(__name__)
 
@@ -327,9 +323,17 @@ class OpenStackInstance(BaseInstance):
         """
         Get the VM type object.
         """
-        flavor = self._provider.nova.flavors.get(
-            self._os_instance.flavor.get('id'))
-        return OpenStackVMType(self._provider, flavor)
+        vm_type = self._provider.compute.vm_types.get(self.vm_type_id)
+        if vm_type:
+            return vm_type
+        # The flavor may be private or have been deleted since the instance
+        # was launched, in which case it is not part of the flavor listing
+        try:
+            flavor = self._provider.nova.flavors.get(self.vm_type_id)
+            return OpenStackVMType(self._provider, flavor)
+        except novaex.NotFound:
+            log.debug("Flavor %s was not found.", self.vm_type_id)
+            return None
 
     def reboot(self):
         """
@@ -467,17 +471,14 @@ class OpenStackRegion(BaseRegion):
     def zones(self):
         # ``detailed`` param must be set to ``False`` because the (default)
         # ``True`` value requires Admin privileges
-        if self.name == self._provider.region_name:  # optimisation
-            zones = self._provider.nova.availability_zones.list(detailed=False)
-        else:
-            try:
-                # pylint:disable=protected-access
-                region_nova = self._provider._connect_nova_region(self.name)
-                zones = region_nova.availability_zones.list(detailed=False)
-            except novaex.EndpointNotFound:
-                # This region may not have a compute endpoint. If so just
-                # return an empty list
-                zones = []
+        # Reuses the cached connection for the region
+        region_nova = self._provider.for_region(self.name).nova
+        try:
+            zones = region_nova.availability_zones.list(detailed=False)
+        except novaex.EndpointNotFound:
+            # This region may not have a compute endpoint. If so just
+            # return an empty list
+            zones = []
 
         return [OpenStackPlacementZone(self._provider, z.zoneName, self.name)
                 for z in zones]
@@ -1250,12 +1251,23 @@ class OpenStackBucketObject(BaseBucketObject):
     def last_modified(self):
         return self._obj.get("last_modified")
 
-    def iter_content(self):
+    def iter_content(self, start=None, end=None):
         """Returns this object's content as an iterable."""
+        byte_range = http_range(start, end)
         _, content = self._provider.swift.get_object(
-            self.cbcontainer.name, self.name, resp_chunk_size=65536)
+            self.cbcontainer.name, self.name, resp_chunk_size=65536,
+            headers={'Range': byte_range} if byte_range else None)
         return content
 
+    def download_to_file(self, path, parts=None, max_workers=None,
+                         resume=False, verify=False):
+        """
+        Download this object to a file, as byte ranges fetched in parallel.
+        """
+        return oshelpers.SwiftRangedDownload(
+            self._provider, self.cbcontainer.name, self.name, path, parts,
+            max_workers).download(resume, verify)
+
     def upload(self, data):
         """
         Set the contents of this object to the data read from the source
@@ -1266,42 +1278,22 @@ class OpenStackBucketObject(BaseBucketObject):
         self._provider.swift.put_object(self.cbcontainer.name, self.name,
                                         data)
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, part_size=None, max_workers=None):
         """
         Stores the contents of the file pointed by the ``path`` variable.
-        If the file is bigger than 5 Gig, it will be broken into segments.
+        Files bigger than ``part_size`` are uploaded as segments in
+        parallel, and stored as a static large object.
 
         :type path: ``str``
         :param path: Absolute path to the file to be uploaded to Swift.
         :rtype: ``bool``
-        :return: ``True`` if successful, ``False`` if not.
-
-        .. note::
-            * The size of the segments chosen (or any of the other upload
-              options) is not under user control.
-            * If called this method will remap the
-              ``swiftclient.service.get_conn`` factory method to
-              ``self._provider._connect_swift``
+        :return: ``True`` if successful.
 
         .. seealso:: https://github.com/gvlproject/cloudbridge/issues/35#issuecomment-297629661 # noqa
         """
-        upload_options = {}
-        if 'segment_size' not in upload_options:
-            if os.path.getsize(path) >= FIVE_GIG:
-                upload_options['segment_size'] = FIVE_GIG
-
-        # remap the swift service's connection factory method
-        # pylint:disable=protected-access
-        swiftclient.service.get_conn = self._provider._connect_swift
-
-        result = True
-        with SwiftService() as swift:
-            upload_object = SwiftUploadObject(path, object_name=self.name)
-            for up_res in swift.upload(self.cbcontainer.name,
-                                       [upload_object, ],
-                                       options=upload_options):
-                result = result and up_res['success']
-        return result
+        return oshelpers.SwiftSegmentedUpload(
+            self._provider, self.cbcontainer.name, self.name, path,
+            part_size, max_workers).upload()
 
     def delete(self):
         """
@@ -386,6 +386,22 @@ class OpenStackVolumeService(BaseVolumeService):
 
         return oshelpers.to_server_paged_list(self.provider, cb_vols, limit)
 
+    def _refresh_all(self, volumes):
+        """
+        Refreshes a set of volumes by paging through the most recent volumes.
+        Volumes which are not found that way are refreshed individually.
+        """
+        current = oshelpers.find_by_ids(
+            lambda limit, marker: self.provider.cinder.volumes.list(
+                limit=limit, marker=marker),
+            [vol.id for vol in volumes])
+        for vol in volumes:
+            if vol.id in current:
+                # pylint:disable=protected-access
+                vol._volume = current[vol.id]
+            else:
+                vol.refresh()
+
     def create(self, name, size, zone, snapshot=None, description=None):
         """
         Creates a new volume.
@@ -455,6 +471,23 @@ class OpenStackSnapshotService(BaseSnapshotService):
                              'marker': marker})]
         return oshelpers.to_server_paged_list(self.provider, cb_snaps, limit)
 
+    def _refresh_all(self, snapshots):
+        """
+        Refreshes a set of snapshots by paging through the most recent
+        snapshots. Snapshots which are not found that way are refreshed
+        individually.
+        """
+        current = oshelpers.find_by_ids(
+            lambda limit, marker: self.provider.cinder.volume_snapshots.list(
+                search_opts={'limit': limit, 'marker': marker}),
+            [snap.id for snap in snapshots])
+        for snap in snapshots:
+            if snap.id in current:
+                # pylint:disable=protected-access
+                snap._snapshot = current[snap.id]
+            else:
+                snap.refresh()
+
     def create(self, name, volume, description=None):
         """
         Creates a new snapshot of a given volume.
@@ -762,6 +795,23 @@ class OpenStackInstanceService(BaseInstanceService):
                 marker=marker)]
         return oshelpers.to_server_paged_list(self.provider, cb_insts, limit)
 
+    def _refresh_all(self, instances):
+        """
+        Refreshes a set of instances by paging through the most recent
+        instances. Instances which are not found that way are refreshed
+        individually.
+        """
+        current = oshelpers.find_by_ids(
+            lambda limit, marker: self.provider.nova.servers.list(
+                limit=limit, marker=marker),
+            [inst.id for inst in instances])
+        for inst in instances:
+            if inst.id in current:
+                # pylint:disable=protected-access
+                inst._os_instance = current[inst.id]
+            else:
+                inst.refresh()
+
     def get(self, instance_id):
         """
         Returns an instance given its id.
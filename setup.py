@@ -34,7 +34,7 @@ REQS_AZURE = ['msrest>=0.4.7',
               'azure-storage>=0.34.0',
               'pysftp>=0.2.9']
 REQS_OPENSTACK = [
-    'openstacksdk',
+    'openstacksdk>=0.12.0',
     'python-novaclient>=7.0.0',
     'python-glanceclient>=2.5.0',
     'python-cinderclient>=1.9.0',
@@ -61,7 +61,7 @@ setup(
     url='http://cloudbridge.readthedocs.org/',
     install_requires=REQS_FULL,
     extras_require={
-        ':python_version=="2.7"': ['py2-ipaddress'],
+        ':python_version=="2.7"': ['py2-ipaddress', 'futures>=3.0.0'],
         ':python_version=="3"': ['py2-ipaddress'],
         'full': REQS_FULL,
         'dev': REQS_DEV
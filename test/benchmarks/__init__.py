@@ -0,0 +1,6 @@
+"""
+Offline benchmarks for the list, iterate, find, get, paging and to_json paths
+of the CloudBridge services, run against the mock providers.
+
+Run with ``python -m test.benchmarks --help`` for the available options.
+"""
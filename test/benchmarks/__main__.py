@@ -0,0 +1,185 @@
+"""
+Runs the benchmarks against a mock provider, saves the results and compares
+them with a previous run.
+
+Example::
+
+    # Record a baseline, then compare a later commit against it
+    python -m test.benchmarks --scale 0.1
+    git checkout my-branch
+    python -m test.benchmarks --scale 0.1
+
+Results are saved to ``.benchmarks/`` as one JSON file per run, named after
+the commit. Unless ``--baseline`` is given, each run is compared with the
+latest earlier run for the same provider and scale. The exit status is 1 if
+any benchmark is slower than the baseline by more than ``--threshold``.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from cloudbridge.cloud.factory import CloudProviderFactory
+from cloudbridge.cloud.interfaces import TestMockHelperMixin
+
+from . import cases
+
+DEFAULT_RESULTS_DIR = '.benchmarks'
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+# Differences smaller than this, in seconds, are treated as noise
+MIN_REGRESSION_SECONDS = 0.001
+
+timer = getattr(time, 'perf_counter', time.time)
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.STDOUT).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def create_mock_provider(provider_name):
+    provider_class = CloudProviderFactory().get_provider_class(
+        provider_name, get_mock=True)
+    if not issubclass(provider_class, TestMockHelperMixin):
+        raise ValueError(
+            "No mock provider is available for {0}; benchmarks only run"
+            " offline".format(provider_name))
+    provider = provider_class({'default_wait_interval': 0})
+    provider.setUpMock()
+    return provider
+
+
+def measure(operation, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = timer()
+        operation()
+        timings.append(timer() - start)
+    timings.sort()
+    return {'min': timings[0],
+            'median': timings[len(timings) // 2],
+            'repeat': repeat}
+
+
+def run(provider_name, scale, repeat, selected=None):
+    provider = create_mock_provider(provider_name)
+    try:
+        start = timer()
+        seeded = cases.seed(provider_name, provider, scale)
+        print("Seeded {0} in {1:.1f}s".format(provider.name, timer() - start))
+        results = {}
+        for name, operation in cases.benchmarks(provider, seeded):
+            if selected and not any(s in name for s in selected):
+                continue
+            results[name] = measure(operation, repeat)
+            print("{0:<28} min {1:9.4f}s  median {2:9.4f}s".format(
+                name, results[name]['min'], results[name]['median']))
+        return results
+    finally:
+        provider.tearDownMock()
+
+
+def find_baseline(results_dir, provider_name, scale):
+    runs = []
+    for path in glob.glob(os.path.join(results_dir, '*.json')):
+        with open(path) as f:
+            run_data = json.load(f)
+        if (run_data.get('provider') == provider_name and
+                run_data.get('scale') == scale):
+            runs.append(run_data)
+    return max(runs, key=lambda r: r['timestamp']) if runs else None
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns the names of the benchmarks whose median time regressed by more
+    than ``threshold`` (a fraction) compared with the baseline.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline['results'].get(name)
+        if not previous:
+            continue
+        change = result['median'] - previous['median']
+        ratio = change / previous['median'] if previous['median'] else 0
+        regressed = (ratio > threshold and
+                     change > MIN_REGRESSION_SECONDS)
+        print("{0:<28} {1:+7.1%}{2}".format(
+            name, ratio, '  REGRESSION' if regressed else ''))
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m test.benchmarks',
+        description="Benchmark CloudBridge against a mock provider.")
+    parser.add_argument('--provider', default=os.environ.get(
+        'CB_TEST_PROVIDER', 'aws'), help="Provider to benchmark")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Fraction of the full resource counts to seed")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="Number of times to run each benchmark")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown, as a fraction of the"
+                             " baseline")
+    parser.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR,
+                        help="Directory in which results are saved")
+    parser.add_argument('--baseline',
+                        help="Results file to compare with, instead of the"
+                             " latest saved run")
+    parser.add_argument('--no-save', action='store_true',
+                        help="Do not save the results of this run")
+    parser.add_argument('benchmarks', nargs='*',
+                        help="Only run benchmarks whose names contain one of"
+                             " these strings")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    run_data = {
+        'commit': commit,
+        'timestamp': time.time(),
+        'provider': args.provider,
+        'scale': args.scale,
+        'python': platform.python_version(),
+        'results': run(args.provider, args.scale, args.repeat,
+                       args.benchmarks)
+    }
+
+    path = os.path.join(args.results_dir, '{0}-{1}-{2}.json'.format(
+        commit, args.provider, args.scale))
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        baseline = find_baseline(args.results_dir, args.provider, args.scale)
+    if not args.no_save:
+        if not os.path.isdir(args.results_dir):
+            os.makedirs(args.results_dir)
+        with open(path, 'w') as f:
+            json.dump(run_data, f, indent=2, sort_keys=True)
+
+    if not baseline:
+        print("No baseline to compare with")
+        return 0
+    print("Compared with {0}:".format(baseline['commit']))
+    regressions = compare(run_data['results'], baseline, args.threshold)
+    if regressions:
+        print("{0} benchmarks regressed by more than {1:.0%}".format(
+            len(regressions), args.threshold))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Seeding of the mock providers, and the benchmarked operations.
+
+Each resource type has a target count, which is multiplied by the ``scale``
+given to the runner. Providers with a fast native way of creating resources
+register a seeder in ``SEEDERS``; others are seeded through the CloudBridge
+API.
+"""
+from test import helpers
+
+from cloudbridge.cloud.interfaces.resources import InstanceState
+from cloudbridge.cloud.interfaces.resources import SnapshotState
+
+# Resource counts at a scale of 1
+INSTANCE_COUNT = 10000
+SNAPSHOT_COUNT = 5000
+BUCKET_OBJECT_COUNT = 100000
+
+# Number of resources fetched individually by the "get" benchmarks
+GET_SAMPLE_SIZE = 100
+# Page size used by the "paging" benchmarks
+PAGE_SIZE = 1000
+
+RESOURCE_PREFIX = 'cb-bench'
+
+
+def scaled(count, scale):
+    return max(int(count * scale), 1)
+
+
+class SeededResources(object):
+    """
+    The resources seeded into a provider, for use by the benchmarks.
+    """
+
+    def __init__(self, bucket, instance_ids, snapshot_ids, object_names):
+        self.bucket = bucket
+        self.instance_ids = instance_ids
+        self.snapshot_ids = snapshot_ids
+        self.object_names = object_names
+
+
+def seed_aws(provider, scale):
+    """
+    Seed the moto backends directly through boto, which is far faster than
+    going through CloudBridge for this many resources.
+    """
+    ec2 = provider.ec2_conn.meta.client
+    s3 = provider.s3_conn.meta.client
+    image = helpers.get_provider_test_data(provider, 'image')
+    vm_type = helpers.get_provider_test_data(provider, 'vm_type')
+    zone = helpers.get_provider_test_data(provider, 'placement')
+
+    instance_ids = []
+    remaining = scaled(INSTANCE_COUNT, scale)
+    while remaining:
+        count = min(remaining, 1000)
+        reservation = ec2.run_instances(
+            ImageId=image, InstanceType=vm_type, MinCount=count,
+            MaxCount=count, TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [{'Key': 'Name', 'Value': RESOURCE_PREFIX}]}])
+        instance_ids.extend(i['InstanceId'] for i in reservation['Instances'])
+        remaining -= count
+
+    volume_id = ec2.create_volume(Size=1, AvailabilityZone=zone)['VolumeId']
+    snapshot_ids = []
+    for i in range(scaled(SNAPSHOT_COUNT, scale)):
+        snapshot_ids.append(ec2.create_snapshot(
+            VolumeId=volume_id, Description=RESOURCE_PREFIX)['SnapshotId'])
+    ec2.create_tags(Resources=snapshot_ids[:1],
+                    Tags=[{'Key': 'Name', 'Value': RESOURCE_PREFIX}])
+
+    s3.create_bucket(Bucket=RESOURCE_PREFIX)
+    object_names = []
+    for i in range(scaled(BUCKET_OBJECT_COUNT, scale)):
+        name = '{0}/{1:08d}'.format(RESOURCE_PREFIX, i)
+        s3.put_object(Bucket=RESOURCE_PREFIX, Key=name, Body=b'x')
+        object_names.append(name)
+
+    return SeededResources(provider.storage.buckets.get(RESOURCE_PREFIX),
+                           instance_ids, snapshot_ids, object_names)
+
+
+def seed_generic(provider, scale):
+    """
+    Seed any provider through the CloudBridge API.
+    """
+    image = helpers.get_provider_test_data(provider, 'image')
+    vm_type = helpers.get_provider_test_data(provider, 'vm_type')
+    zone = helpers.get_provider_test_data(provider, 'placement')
+    _, subnet = helpers.create_test_network(provider, RESOURCE_PREFIX)
+
+    instance_ids = [
+        provider.compute.instances.create(
+            RESOURCE_PREFIX, image, vm_type, subnet, zone=zone).id
+        for _ in range(scaled(INSTANCE_COUNT, scale))]
+
+    volume = provider.storage.volumes.create(RESOURCE_PREFIX, 1, zone)
+    snapshot_ids = [volume.create_snapshot(RESOURCE_PREFIX).id
+                    for _ in range(scaled(SNAPSHOT_COUNT, scale))]
+
+    bucket = provider.storage.buckets.create(RESOURCE_PREFIX)
+    object_names = []
+    for i in range(scaled(BUCKET_OBJECT_COUNT, scale)):
+        obj = bucket.objects.create('{0}/{1:08d}'.format(RESOURCE_PREFIX, i))
+        obj.upload('x')
+        object_names.append(obj.name)
+
+    return SeededResources(bucket, instance_ids, snapshot_ids, object_names)
+
+
+def seed_mock(provider, scale):
+    """
+    Seed the in-memory cloud directly through its client.
+    """
+    client = provider.mock_client
+    image = helpers.get_provider_test_data(provider, 'image')
+    vm_type = helpers.get_provider_test_data(provider, 'vm_type')
+    zone = helpers.get_provider_test_data(provider, 'placement')
+
+    instance_ids = [
+        client.create('instances', name=RESOURCE_PREFIX, image_id=image,
+                      vm_type_id=vm_type, subnet_id=None, zone_id=zone,
+                      key_pair_name=None, vm_firewall_ids=[], user_data=None,
+                      block_devices=0, private_ip=client.next_ip('10.0'),
+                      public_ip=None, state=InstanceState.RUNNING)['id']
+        for _ in range(scaled(INSTANCE_COUNT, scale))]
+
+    snapshot_ids = [
+        client.create('snapshots', name=RESOURCE_PREFIX, volume_id=None,
+                      size=1, description=None,
+                      state=SnapshotState.AVAILABLE)['id']
+        for _ in range(scaled(SNAPSHOT_COUNT, scale))]
+
+    client.create_bucket(RESOURCE_PREFIX)
+    object_names = []
+    for i in range(scaled(BUCKET_OBJECT_COUNT, scale)):
+        name = '{0}/{1:08d}'.format(RESOURCE_PREFIX, i)
+        client.put_object(RESOURCE_PREFIX, name, b'x')
+        object_names.append(name)
+
+    return SeededResources(provider.storage.buckets.get(RESOURCE_PREFIX),
+                           instance_ids, snapshot_ids, object_names)
+
+
+SEEDERS = {
+    'aws': seed_aws,
+    'mock': seed_mock
+}
+
+
+def seed(provider_name, provider, scale):
+    return SEEDERS.get(provider_name, seed_generic)(provider, scale)
+
+
+def iterate(container):
+    return sum(1 for _ in container)
+
+
+def page(container):
+    pages = 0
+    results = container.list(limit=PAGE_SIZE)
+    while True:
+        pages += 1
+        if not results.is_truncated:
+            return pages
+        results = container.list(limit=PAGE_SIZE, marker=results.marker)
+
+
+def get_each(container, ids):
+    step = max(len(ids) // GET_SAMPLE_SIZE, 1)
+    return [container.get(resource_id)
+            for resource_id in ids[::step][:GET_SAMPLE_SIZE]]
+
+
+def list_all(container, count):
+    # Results may be fetched lazily, so consume them all
+    return list(container.list(limit=count))
+
+
+def to_json(container):
+    return [resource.to_json() for resource in container]
+
+
+def benchmarks(provider, seeded):
+    """
+    Returns the benchmarked operations, as an ordered list of
+    ``(name, callable)`` pairs.
+    """
+    containers = [
+        ('instances', provider.compute.instances, seeded.instance_ids),
+        ('snapshots', provider.storage.snapshots, seeded.snapshot_ids),
+        ('bucket_objects', seeded.bucket.objects, seeded.object_names)
+    ]
+    cases = []
+    for name, container, ids in containers:
+        cases.extend([
+            (name + '.list', lambda c=container, i=ids: list_all(c, len(i))),
+            (name + '.iterate', lambda c=container: iterate(c)),
+            (name + '.page', lambda c=container: page(c)),
+            (name + '.find', lambda c=container: c.find(name=RESOURCE_PREFIX)),
+            (name + '.get', lambda c=container, i=ids: get_each(c, i)),
+            (name + '.to_json', lambda c=container: to_json(c))
+        ])
+    return cases
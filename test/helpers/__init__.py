@@ -97,6 +97,11 @@ TEST_DATA_CONFIG = {
             os.environ.get('CB_IMAGE_AZURE', 'cb-test-image'),
         "vm_type":
             os.environ.get('CB_VM_TYPE_AZURE', 'Basic_A0'),
+    },
+    "MockCloudProvider": {
+        "image": 'img-00000000',
+        "vm_type": 'mock.small',
+        "placement": 'mock-region-1a',
     }
 }
 
@@ -108,6 +113,8 @@ def get_provider_test_data(provider, key):
         return TEST_DATA_CONFIG.get("OpenStackCloudProvider").get(key)
     elif "AzureCloudProvider" in provider.name:
         return TEST_DATA_CONFIG.get("AzureCloudProvider").get(key)
+    elif "MockCloudProvider" in provider.name:
+        return TEST_DATA_CONFIG.get("MockCloudProvider").get(key)
     return None
 
 
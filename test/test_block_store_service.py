@@ -7,6 +7,7 @@ from test.helpers import standard_interface_tests as sit
 from cloudbridge.cloud.factory import ProviderList
 from cloudbridge.cloud.interfaces import SnapshotState
 from cloudbridge.cloud.interfaces import VolumeState
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
 from cloudbridge.cloud.interfaces.provider import TestMockHelperMixin
 from cloudbridge.cloud.interfaces.resources import AttachmentInfo
 from cloudbridge.cloud.interfaces.resources import Snapshot
@@ -37,6 +38,40 @@ class CloudBlockStoreServiceTestCase(ProviderTestBase):
         sit.check_crud(self, self.provider.storage.volumes, Volume,
                        "cb_createvol", create_vol, cleanup_vol)
 
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_wait_for_multiple_volumes(self):
+        """
+        Create several volumes and wait on them together
+        """
+        name = "cb_waitvols-{0}".format(helpers.get_uuid())
+        zone = helpers.get_provider_test_data(self.provider, "placement")
+        vols = []
+
+        def cleanup_vols():
+            for vol in vols:
+                vol.delete()
+            self.provider.storage.volumes.wait_for_all(
+                vols, [VolumeState.DELETED, VolumeState.UNKNOWN],
+                terminal_states=[VolumeState.ERROR])
+
+        with helpers.cleanup_action(cleanup_vols):
+            vols.extend(self.provider.storage.volumes.create(name, 1, zone)
+                        for _ in range(3))
+            reached = self.provider.storage.volumes.wait_for_any(
+                vols, [VolumeState.AVAILABLE],
+                terminal_states=[VolumeState.ERROR])
+            self.assertTrue(reached)
+            self.assertTrue(all(vol in vols for vol in reached))
+            self.assertTrue(self.provider.storage.volumes.wait_for_all(
+                vols, [VolumeState.AVAILABLE],
+                terminal_states=[VolumeState.ERROR]))
+            self.assertTrue(all(vol.state == VolumeState.AVAILABLE
+                                for vol in vols))
+            with self.assertRaises(WaitStateException):
+                self.provider.storage.volumes.wait_for_all(
+                    vols, [VolumeState.IN_USE],
+                    terminal_states=[VolumeState.AVAILABLE])
+
     @helpers.skipIfNoService(['storage.volumes'])
     def test_attach_detach_volume(self):
         """
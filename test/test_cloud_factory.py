@@ -1,9 +1,11 @@
+import threading
 import unittest
 from test import helpers
 
 from cloudbridge.cloud import factory
 from cloudbridge.cloud import interfaces
 from cloudbridge.cloud.factory import CloudProviderFactory
+from cloudbridge.cloud.factory import ProviderPool
 from cloudbridge.cloud.interfaces import TestMockHelperMixin
 from cloudbridge.cloud.interfaces.provider import CloudProvider
 from cloudbridge.cloud.providers.aws import AWSCloudProvider
@@ -30,6 +32,58 @@ class CloudFactoryTestCase(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             CloudProviderFactory().create_provider("ec23", {})
 
+    def test_create_provider_pooled(self):
+        """
+        Pooled providers should be shared for identical configs, and
+        discarded once idle
+        """
+        pool = CloudProviderFactory.provider_pool
+        pool.clear()
+        self.addCleanup(pool.clear)
+        config = {'aws_region_name': 'us-east-1'}
+
+        first = CloudProviderFactory().create_provider(
+            factory.ProviderList.AWS, config, pooled=True)
+        self.assertIs(first, CloudProviderFactory().create_provider(
+            factory.ProviderList.AWS, dict(config), pooled=True))
+        self.assertIsNot(first, CloudProviderFactory().create_provider(
+            factory.ProviderList.AWS, config))
+        other = CloudProviderFactory().create_provider(
+            factory.ProviderList.AWS, {'aws_region_name': 'us-west-1'},
+            pooled=True)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(pool), 2)
+
+        idle_timeout = pool.idle_timeout
+        self.addCleanup(setattr, pool, 'idle_timeout', idle_timeout)
+        pool.idle_timeout = -1
+        self.assertIsNot(first, CloudProviderFactory().create_provider(
+            factory.ProviderList.AWS, config, pooled=True))
+        self.assertEqual(len(pool), 1)
+
+    def test_provider_pool_construction(self):
+        """
+        Constructing a pooled provider should not block other lookups, and
+        concurrent constructions should return the same provider
+        """
+        pool = ProviderPool()
+        lookups = []
+
+        def other_lookup():
+            lookups.append(pool.get_or_create('other', object))
+
+        def create():
+            thread = threading.Thread(target=other_lookup)
+            thread.start()
+            thread.join(5)
+            # Another thread pools the same key in the meantime
+            pool.get_or_create('key', lambda: 'winner')
+            return 'loser'
+
+        self.assertEqual(pool.get_or_create('key', create), 'winner')
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(pool.get_or_create('key', create), 'winner')
+
     def test_find_provider_mock_valid(self):
         """
         Searching for a provider with a known mock driver should return
@@ -1,8 +1,32 @@
+import hashlib
 import itertools
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
 from test.helpers import ProviderTestBase
 
+from cloudbridge.cloud.base import tracing
+from cloudbridge.cloud.base.helpers import RateLimitedHTTPAdapter
+from cloudbridge.cloud.base.instrumentation import CallAggregator
+from cloudbridge.cloud.base.instrumentation import http_operation_name
+from cloudbridge.cloud.base.ratelimit import DESCRIBE
+from cloudbridge.cloud.base.ratelimit import MUTATE
+from cloudbridge.cloud.base.ratelimit import RateLimiter
+from cloudbridge.cloud.base.ratelimit import is_throttled
+from cloudbridge.cloud.base.ratelimit import operation_kind
+from cloudbridge.cloud.base.ratelimit import parse_retry_after
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.base.resources import StreamingResultList
+from cloudbridge.cloud.base.transfer import BaseMultipartUpload
+from cloudbridge.cloud.base.transfer import BaseRangedDownload
+from cloudbridge.cloud.interfaces.exceptions import \
+    TransferIntegrityException
+
+import requests
+from requests.adapters import HTTPAdapter
 
 
 class DummyResult(object):
@@ -15,6 +39,258 @@ class DummyResult(object):
         return "%s (%s)" % (self.id, self.name)
 
 
+class DummySpan(object):
+
+    def __init__(self, tracer, name, parent):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attributes = {}
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self, end_time=None):
+        self.tracer.ended.append(self)
+
+
+class DummyTracer(object):
+
+    def __init__(self):
+        self.active = []
+        self.ended = []
+
+    def start_span(self, name, start_time=None, attributes=None):
+        span = DummySpan(self, name, self.active[-1] if self.active else None)
+        span.attributes.update(attributes or {})
+        return span
+
+    @contextmanager
+    def start_as_current_span(self, name):
+        span = self.start_span(name)
+        self.active.append(span)
+        try:
+            yield span
+        finally:
+            self.active.pop()
+            span.end()
+
+
+class DummyRawStream(BytesIO):
+    """
+    An in-memory HTTP response body, counting the reads which return a new
+    bytes object and the reads into a caller's buffer.
+    """
+
+    def __init__(self, content):
+        super(DummyRawStream, self).__init__(content)
+        self.reads = 0
+        self.readintos = 0
+
+    def read(self, *args):
+        self.reads += 1
+        return super(DummyRawStream, self).read(*args)
+
+    def readinto(self, buffer):
+        self.readintos += 1
+        return super(DummyRawStream, self).readinto(buffer)
+
+
+class DummyHTTPAdapter(HTTPAdapter):
+    """
+    Answers requests with the status codes in ``statuses``, in order.
+    """
+
+    def __init__(self, **kwargs):
+        super(DummyHTTPAdapter, self).__init__(**kwargs)
+        self.statuses = []
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.raw = BytesIO()
+        return response
+
+
+class DummyRateLimitedHTTPAdapter(RateLimitedHTTPAdapter, DummyHTTPAdapter):
+    pass
+
+
+class DummyRangedDownload(BaseRangedDownload):
+    """
+    Downloads in-memory content, recording the ranges fetched. Ranges in
+    ``fail`` raise an error once, and ranges in ``corrupt`` have their
+    content replaced by the result of the given function.
+    """
+
+    def __init__(self, provider, path, content, parts, md5=None):
+        super(DummyRangedDownload, self).__init__(
+            provider, path, len(content), 'v1', md5=md5, parts=parts,
+            max_workers=1)
+        self.content = content
+        self.fetched = []
+        self.fail = set()
+        self.corrupt = {}
+
+    def _write_range(self, stream, start, end):
+        self.fetched.append((start, end))
+        if (start, end) in self.fail:
+            self.fail.discard((start, end))
+            raise IOError("Connection reset")
+        data = self.content[start:end + 1]
+        stream.write(self.corrupt.get((start, end), lambda d: d)(data))
+
+
+class DummyMultipartUpload(BaseMultipartUpload):
+    """
+    Records the steps of a multipart upload. Steps named in ``fail`` raise
+    an error.
+    """
+
+    def __init__(self, provider, path, part_size):
+        super(DummyMultipartUpload, self).__init__(provider, path, part_size,
+                                                   max_workers=1)
+        self.steps = []
+        self.fail = set()
+
+    def _step(self, name):
+        self.steps.append(name)
+        if name in self.fail:
+            raise IOError("{0} failed".format(name))
+
+    def _upload_single(self):
+        self._step('single')
+
+    def _begin(self):
+        self._step('begin')
+
+    def _upload_part(self, part):
+        self._step('part')
+        return part.number
+
+    def _complete(self, results):
+        self._step('complete')
+
+    def _abort(self):
+        self._step('abort')
+
+
+class DummySwiftClient(object):
+    """
+    An in-memory Swift store, serving the calls made by
+    ``SwiftSegmentedUpload`` and recording the writes and deletes in order.
+    Writes of objects named in ``fail`` raise an error.
+    """
+
+    def __init__(self, exception_class):
+        self.exception_class = exception_class
+        self.objects = {}
+        self.log = []
+        self.fail = set()
+        # Called before each object is read
+        self.before_get = None
+
+    def head_object(self, container, name):
+        if (container, name) not in self.objects:
+            raise self.exception_class("Not found", http_status=404)
+        return dict(self.objects[(container, name)][1])
+
+    def put_container(self, container):
+        pass
+
+    def put_object(self, container, name, contents, content_length=None,
+                   headers=None, query_string=None):
+        if (container, name) in self.fail:
+            raise self.exception_class("Failed", http_status=500)
+        if hasattr(contents, 'read'):
+            contents = contents.read()
+        data = (contents if isinstance(contents, bytes)
+                else contents.encode('utf-8'))
+        headers = dict((key.lower(), value)
+                       for key, value in (headers or {}).items())
+        if query_string == 'multipart-manifest=put':
+            # Check the segments, and store the manifest as Swift returns it
+            manifest = json.loads(data)
+            for segment in manifest:
+                content = self.objects[tuple(
+                    segment['path'].lstrip('/').split('/', 1))][0]
+                assert segment['etag'] == hashlib.md5(content).hexdigest()
+                assert segment['size_bytes'] == len(content)
+            data = json.dumps([{'name': segment['path']}
+                               for segment in manifest]).encode('utf-8')
+            headers['x-static-large-object'] = 'True'
+        self.objects[(container, name)] = (data, headers)
+        self.log.append(('put', container, name))
+        return hashlib.md5(data).hexdigest()
+
+    def get_object(self, container, name, query_string=None, headers=None,
+                   resp_chunk_size=None):
+        if self.before_get:
+            self.before_get()
+        response_headers = self.head_object(container, name)
+        data = self.objects[(container, name)][0]
+        if query_string == 'multipart-manifest=get':
+            return response_headers, data
+        start, end = (headers['Range'].split('=')[1].split('-'))
+        data = data[int(start):int(end) + 1]
+        return response_headers, iter([data[:resp_chunk_size],
+                                       data[resp_chunk_size:]])
+
+    def get_container(self, container, prefix=None, full_listing=False):
+        return {}, [{'name': name} for (cont, name) in sorted(self.objects)
+                    if cont == container and name.startswith(prefix or '')]
+
+    def delete_object(self, container, name):
+        del self.objects[(container, name)]
+        self.log.append(('delete', container, name))
+
+
+class DummySwiftProvider(object):
+
+    def __init__(self, config, swift):
+        self.config = config
+        self.swift = swift
+
+    def _connect_swift(self):
+        return self.swift
+
+
+class DummyBlobClient(object):
+    """
+    Serves the blob and ranged gets used by ``AzureBlobStream``, recording
+    the calls made.
+    """
+
+    class Properties(object):
+
+        def __init__(self, content):
+            self.content_length = len(content)
+            self.etag = '"{0}"'.format(hashlib.md5(content).hexdigest())
+
+    class Blob(object):
+
+        def __init__(self, content):
+            self.properties = DummyBlobClient.Properties(content)
+
+    def __init__(self, content):
+        self.content = content
+        self.lookups = 0
+        self.ranges = []
+
+    def get_blob(self, container_name, blob_name):
+        self.lookups += 1
+        return self.Blob(self.content)
+
+    def get_blob_range(self, container_name, blob_name, start, end,
+                       if_match=None):
+        self.ranges.append((start, end))
+        if if_match != self.Properties(self.content).etag:
+            raise ValueError("Precondition failed")
+        return self.content[start:end + 1]
+
+
 class CloudHelpersTestCase(ProviderTestBase):
 
     def setUp(self):
@@ -56,6 +332,271 @@ class CloudHelpersTestCase(ProviderTestBase):
         self.assertFalse(results.supports_server_paging, "Client paged result"
                          " lists should return False for server paging.")
 
+        # A non-existent marker should return no results
+        results = ClientPagedResultList(self.provider, objects, 2, 5)
+        self.assertListEqual(results, [])
+        self.assertFalse(results.is_truncated)
+
+    def test_s3_bucket_obj_iterator(self):
+        try:
+            from botocore.exceptions import IncompleteReadError
+            from botocore.response import StreamingBody
+            from cloudbridge.cloud.providers.aws.resources \
+                import AWSBucketObject
+        except ImportError:
+            raise self.skipTest("boto3 is not installed")
+        content = b"0123456789" * 100
+
+        # Chunks follow the configured chunk size
+        body = StreamingBody(BytesIO(content), len(content))
+        chunks = list(AWSBucketObject.BucketObjIterator(body, 300,
+                                                        len(content)))
+        self.assertListEqual([len(chunk) for chunk in chunks],
+                             [300, 300, 300, 100])
+        self.assertEqual(b"".join(chunks), content)
+
+        # readinto fills the caller's buffer in place, without reading a
+        # bytes object per chunk
+        raw = DummyRawStream(content)
+        stream = AWSBucketObject.BucketObjIterator(
+            StreamingBody(raw, len(content)), content_length=len(content))
+        buffer = bytearray(64)
+        received = BytesIO()
+        count = stream.readinto(buffer)
+        while count:
+            received.write(memoryview(buffer)[:count])
+            count = stream.readinto(buffer)
+        self.assertEqual(received.getvalue(), content)
+        self.assertEqual(raw.reads, 0)
+        self.assertEqual(raw.readintos, 17)
+
+        # A short body fails the length check instead of truncating
+        body = StreamingBody(BytesIO(content[:500]), len(content))
+        stream = AWSBucketObject.BucketObjIterator(body,
+                                                   content_length=len(content))
+        with self.assertRaises(IncompleteReadError):
+            while stream.readinto(buffer):
+                pass
+
+    def test_ranged_download_resume(self):
+        content = os.urandom(1000)
+        md5 = hashlib.md5(content).hexdigest()
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(lambda: os.path.exists(path + '.cbparts') and
+                        os.remove(path + '.cbparts'))
+
+        # A download that fails partway records the parts already written
+        download = DummyRangedDownload(self.provider, path, content, 4, md5)
+        download.fail.add((500, 749))
+        with self.assertRaises(IOError):
+            download.download()
+        self.assertListEqual(download.fetched,
+                             [(0, 249), (250, 499), (500, 749)])
+        with open(path + '.cbparts') as state:
+            self.assertListEqual(state.read().splitlines()[1:], ['1', '2'])
+
+        # Resuming it fetches only the missing parts
+        download.fetched = []
+        self.assertTrue(download.download(resume=True, verify=True))
+        self.assertListEqual(download.fetched, [(500, 749), (750, 999)])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+        self.assertFalse(os.path.exists(path + '.cbparts'))
+
+        # A record left by a different version of the object is ignored
+        with open(path + '.cbparts', 'w') as state:
+            state.write('{"size": 1000, "version": "v0", "part_size": 250}\n'
+                        '1\n2\n3\n')
+        download.fetched = []
+        self.assertTrue(download.download(resume=True))
+        self.assertEqual(len(download.fetched), 4)
+
+    def test_ranged_download_integrity(self):
+        content = os.urandom(1000)
+        md5 = hashlib.md5(content).hexdigest()
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(lambda: os.path.exists(path + '.cbparts') and
+                        os.remove(path + '.cbparts'))
+
+        # A short range is detected as soon as it is written
+        download = DummyRangedDownload(self.provider, path, content, 4)
+        download.corrupt[(250, 499)] = lambda data: data[:-1]
+        with self.assertRaises(TransferIntegrityException):
+            download.download()
+
+        # A corrupted range fails the checksum
+        download = DummyRangedDownload(self.provider, path, content, 4, md5)
+        download.corrupt[(250, 499)] = lambda data: bytes(
+            bytearray([data[0] ^ 0xff])) + data[1:]
+        self.assertTrue(download.download())
+        with self.assertRaises(TransferIntegrityException):
+            download.download(verify=True)
+        self.assertFalse(os.path.exists(path + '.cbparts'))
+
+    def test_azure_blob_stream(self):
+        try:
+            from cloudbridge.cloud.providers.azure.helpers \
+                import AzureBlobStream
+        except ImportError:
+            raise self.skipTest("The Azure SDK is not installed")
+        content = os.urandom(1000)
+        client = DummyBlobClient(content)
+        properties = client.Properties(content)
+
+        # A known size and ETag avoid looking up the blob
+        stream = AzureBlobStream(client, 'bucket', 'blob', chunk_size=100,
+                                 read_ahead=2,
+                                 size=properties.content_length,
+                                 etag=properties.etag)
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            # Chunks are only fetched up to read_ahead ahead of the reader
+            self.assertLessEqual(len(client.ranges), len(chunks) + 2)
+        self.assertEqual(b"".join(chunks), content)
+        self.assertListEqual(client.ranges,
+                             [(i, i + 99) for i in range(0, 1000, 100)])
+        self.assertEqual(client.lookups, 0)
+
+        # readinto fills the caller's buffer, across chunk boundaries
+        client.ranges = []
+        stream = AzureBlobStream(client, 'bucket', 'blob', 150, 849,
+                                 chunk_size=256)
+        self.assertEqual(client.lookups, 1)
+        buffer = bytearray(64)
+        received = bytearray()
+        count = stream.readinto(buffer)
+        while count:
+            received.extend(buffer[:count])
+            count = stream.readinto(buffer)
+        self.assertEqual(bytes(received), content[150:850])
+        self.assertListEqual(client.ranges,
+                             [(150, 405), (406, 661), (662, 849)])
+
+        # Reads of a blob which has changed since its ETag was known fail
+        stream = AzureBlobStream(client, 'bucket', 'blob', size=1000,
+                                 etag='"stale"')
+        with self.assertRaises(ValueError):
+            stream.read()
+
+    def test_multipart_upload_abort(self):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(1000))
+        self.addCleanup(os.remove, path)
+
+        upload = DummyMultipartUpload(self.provider, path, 1000)
+        self.assertTrue(upload.upload())
+        self.assertListEqual(upload.steps, ['single'])
+
+        # A failed part or completion cleans up the parts already sent
+        for step in ('part', 'complete'):
+            upload = DummyMultipartUpload(self.provider, path, 400)
+            upload.fail.add(step)
+            with self.assertRaises(IOError):
+                upload.upload()
+            self.assertEqual(upload.steps[-1], 'abort')
+            self.assertEqual(upload.steps.count('complete'),
+                             1 if step == 'complete' else 0)
+
+    def test_swift_segmented_upload_overwrite(self):
+        try:
+            from swiftclient import ClientException
+            from cloudbridge.cloud.providers.openstack.helpers \
+                import SwiftSegmentedUpload
+        except ImportError:
+            raise self.skipTest("The OpenStack clients are not installed")
+        swift = DummySwiftClient(ClientException)
+        provider = DummySwiftProvider(self.provider.config, swift)
+        part_size = 1024 * 1024
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(part_size * 5 // 2))
+        self.addCleanup(os.remove, path)
+
+        def upload():
+            return SwiftSegmentedUpload(provider, 'bucket', 'obj', path,
+                                        part_size, 1)
+
+        # A dynamic large object whose segments share a prefix with new
+        # uploads
+        swift.put_object('bucket_segments', 'obj/old', b'old')
+        swift.put_object('bucket', 'obj', b'', headers={
+            'X-Object-Manifest': 'bucket_segments/obj/'})
+
+        # A failed write keeps the old object, and removes the new segments
+        swift.fail.add(('bucket', 'obj'))
+        with self.assertRaises(ClientException):
+            upload().upload()
+        self.assertListEqual(sorted(swift.objects), [
+            ('bucket', 'obj'), ('bucket_segments', 'obj/old')])
+        swift.fail.clear()
+
+        # The old segments are only deleted once the new object is written
+        swift.log = []
+        first = upload()
+        self.assertTrue(first.upload())
+        self.assertListEqual(
+            [entry[0] for entry in swift.log], ['put'] * 4 + ['delete'])
+        self.assertEqual(swift.log[-2], ('put', 'bucket', 'obj'))
+        self.assertEqual(swift.log[-1],
+                         ('delete', 'bucket_segments', 'obj/old'))
+        self.assertEqual(
+            swift.head_object('bucket', 'obj')['x-static-large-object'],
+            'True')
+
+        # Replacing a static large object deletes the segments it lists
+        second = upload()
+        self.assertTrue(second.upload())
+        self.assertListEqual(
+            [name for container, name in sorted(swift.objects)
+             if container == 'bucket_segments'],
+            ['{0}{1:08d}'.format(second._segment_prefix, number)
+             for number in range(3)])
+
+    def test_swift_ranged_download_etag(self):
+        try:
+            from swiftclient import ClientException
+            from cloudbridge.cloud.providers.openstack.helpers \
+                import SwiftRangedDownload
+        except ImportError:
+            raise self.skipTest("The OpenStack clients are not installed")
+        swift = DummySwiftClient(ClientException)
+        provider = DummySwiftProvider(self.provider.config, swift)
+        content = os.urandom(1000)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(lambda: os.path.exists(path + '.cbparts') and
+                        os.remove(path + '.cbparts'))
+
+        # Large objects have no MD5, but each range must match their ETag
+        swift.put_object('bucket', 'obj', content, headers={
+            'ETag': '"v1"', 'Content-Length': '1000'})
+        self.assertTrue(SwiftRangedDownload(provider, 'bucket', 'obj', path,
+                                            4, 1).download())
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+        # An object replaced during the download fails instead of mixing
+        # the two versions
+        download = SwiftRangedDownload(provider, 'bucket', 'obj', path, 4, 1)
+        gets = []
+
+        def replace_object():
+            gets.append(1)
+            if len(gets) == 2:
+                swift.put_object('bucket', 'obj', os.urandom(1000), headers={
+                    'ETag': '"v2"', 'Content-Length': '1000'})
+
+        swift.before_get = replace_object
+        with self.assertRaises(TransferIntegrityException):
+            download.download()
+
     def test_server_paged_result_list(self):
 
         objects = list(itertools.islice(self.objects, 2))
@@ -72,3 +613,160 @@ class CloudHelpersTestCase(ProviderTestBase):
                         " lists should return True for server paging.")
         with self.assertRaises(NotImplementedError):
             results.data
+
+    def test_streaming_result_list(self):
+        fetched_pages = []
+
+        def pages(page_size):
+            for i in range(0, len(self.objects), page_size):
+                fetched_pages.append(i)
+                yield self.objects[i:i + page_size]
+
+        # Pages should only be fetched as results are consumed
+        results = StreamingResultList(pages(2), 3)
+        self.assertEqual(fetched_pages, [])
+        self.assertEqual(next(iter(results)), self.objects[0])
+        self.assertEqual(fetched_pages, [0])
+        self.assertListEqual(list(results), self.objects[:3])
+        self.assertEqual(fetched_pages, [0, 2])
+        self.assertTrue(results.is_truncated)
+        self.assertEqual(results.marker, self.objects[2].id)
+        self.assertFalse(results.supports_total)
+        self.assertTrue(results.supports_server_paging, "Streaming result"
+                        " lists should return True for server paging.")
+
+        # Accessing the list populates it up to the limit
+        del fetched_pages[:]
+        results = StreamingResultList(pages(1), 10)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[3], self.objects[3])
+        self.assertEqual(fetched_pages, [0, 1, 2, 3])
+        self.assertFalse(results.is_truncated)
+        self.assertIsNone(results.marker)
+        with self.assertRaises(NotImplementedError):
+            results.data
+
+    def test_rate_limiter(self):
+        self.assertEqual(operation_kind('DescribeInstances'), DESCRIBE)
+        self.assertEqual(operation_kind('RunInstances'), MUTATE)
+        self.assertEqual(parse_retry_after('3'), 3)
+        self.assertEqual(parse_retry_after('Thu, 01 Jan 1970 00:00:00 GMT'),
+                         0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertTrue(is_throttled(429, 'POST'))
+        self.assertTrue(is_throttled(503, 'get'))
+        self.assertFalse(is_throttled(503, 'POST'))
+        self.assertFalse(is_throttled(503, 'PATCH'))
+        self.assertFalse(is_throttled(500, 'GET'))
+
+        limiter = RateLimiter(rates={MUTATE: 100}, burst=2, max_retries=2,
+                              base_delay=0.1, max_delay=1)
+        # Only the burst is allowed through without waiting
+        for _ in range(3):
+            limiter.acquire(MUTATE)
+            limiter.acquire(DESCRIBE)
+        metrics = limiter.metrics
+        self.assertEqual(metrics['requests'], {DESCRIBE: 3, MUTATE: 3})
+        self.assertGreater(metrics['rate_limit_wait_time'], 0)
+
+        # Throttling reduces the rate, and is retried up to max_retries
+        self.assertLessEqual(limiter.throttled(MUTATE, 1), 0.1)
+        self.assertEqual(limiter.throttled(MUTATE, 2, retry_after=5), 1)
+        self.assertIsNone(limiter.throttled(MUTATE, 3))
+        self.assertEqual(limiter.rates()[MUTATE], 12.5)
+        limiter.succeeded(MUTATE)
+        self.assertEqual(limiter.rates()[MUTATE], 17.5)
+
+        metrics = limiter.metrics
+        self.assertEqual(metrics['throttle_events'], {DESCRIBE: 0, MUTATE: 3})
+        self.assertEqual(metrics['retries'], 2)
+        self.assertGreaterEqual(metrics['backoff_wait_time'], 1)
+
+    def test_rate_limited_http_adapter(self):
+        limiter = RateLimiter(max_retries=2, base_delay=0, max_delay=0)
+        adapter = DummyRateLimitedHTTPAdapter(limiter)
+        # Non-idempotent requests are only retried when rate limited, as a
+        # 503 may follow a request which took effect
+        for method, statuses, attempts in (('GET', [503, 200], 2),
+                                           ('PUT', [503, 200], 2),
+                                           ('POST', [503, 200], 1),
+                                           ('PATCH', [503, 200], 1),
+                                           ('POST', [429, 200], 2)):
+            adapter.statuses = list(statuses)
+            adapter.sent = 0
+            request = requests.Request(method, 'http://cloud/').prepare()
+            response = adapter.send(request)
+            self.assertEqual(adapter.sent, attempts, method)
+            self.assertEqual(response.status_code, statuses[attempts - 1])
+
+    def test_instrumentation(self):
+        self.assertEqual(
+            http_operation_name(
+                'get', '/subscriptions/1234/resourceGroups/cb/providers/'
+                'Microsoft.Network/networkInterfaces/nic-a'),
+            'GET /subscriptions/{id}/resourceGroups/{id}/providers/'
+            'Microsoft.Network/networkInterfaces/{id}')
+        self.assertEqual(
+            http_operation_name(
+                'GET', '/v2.1/servers/0f7b0a6e-3b0e-4a7e-9b4a-2c1d8e6f5a3b'),
+            'GET /v2.1/servers/{id}')
+
+        aggregator = CallAggregator()
+        records = []
+
+        def failing_listener(record):
+            raise ValueError("Listener errors should be ignored")
+
+        instrumentation = self.provider.instrumentation
+        for listener in (aggregator, records.append, failing_listener):
+            instrumentation.add_listener(listener)
+        try:
+            for latency in range(1, 101):
+                instrumentation.record('svc', 'Op', latency / 100.0,
+                                       status=200, bytes_received=10)
+            instrumentation.record('svc', 'Op', 2, status=500, retries=2,
+                                   error='InternalError')
+            # Calls made by the provider are also recorded
+            self.provider.compute.regions.list()
+        finally:
+            for listener in (aggregator, records.append, failing_listener):
+                instrumentation.remove_listener(listener)
+        self.assertFalse(instrumentation.enabled)
+
+        summary = aggregator.summary()
+        stats = summary[('svc', 'Op')]
+        self.assertEqual(stats['count'], 101)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['bytes_received'], 1000)
+        self.assertEqual(stats['p50'], 0.51)
+        self.assertEqual(stats['p99'], 1.0)
+        self.assertGreater(len(summary), 1)
+        self.assertGreater(len(records), 101)
+        self.assertIn('cloudbridge_api_call_seconds_count{service="svc",'
+                      'operation="Op"} 101', aggregator.to_prometheus())
+
+    def test_tracing(self):
+        service_class = type(self.provider.compute.regions)
+        list_method = service_class.__dict__.get('list')
+        tracer = DummyTracer()
+        tracing.enable_tracing(tracer)
+        try:
+            self.provider.compute.regions.list()
+        finally:
+            tracing.disable_tracing()
+
+        spans = [span for span in tracer.ended
+                 if span.name == service_class.__name__ + '.list']
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0].attributes['cloudbridge.provider'],
+                         self.provider.name)
+        # API calls are recorded as children of the method which made them
+        call_spans = [span for span in tracer.ended
+                      if 'cloudbridge.operation' in span.attributes]
+        self.assertTrue(call_spans)
+        self.assertTrue(all(span.parent for span in call_spans))
+
+        # Disabling tracing restores the original methods
+        self.assertIs(service_class.__dict__.get('list'), list_method)
+        self.assertFalse(self.provider.instrumentation.enabled)
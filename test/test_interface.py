@@ -64,3 +64,20 @@ class CloudInterfaceTestCase(ProviderTestBase):
             cloned_provider = CloudProviderFactory().create_provider(
                 self.provider.PROVIDER_ID, cloned_config)
             cloned_provider.authenticate()
+
+    def test_token_fetches(self):
+        if self.provider.PROVIDER_ID != 'openstack':
+            raise unittest.SkipTest(
+                "Only OpenStack providers count token fetches")
+
+        provider = CloudProviderFactory().create_provider(
+            self.provider.PROVIDER_ID, self.provider.config.copy())
+        self.assertEqual(provider.token_fetches, 0)
+        # All service clients share the session, and so a single token
+        provider.authenticate()
+        provider.compute.instances.list()
+        provider.storage.volumes.list()
+        provider.storage.buckets.list()
+        provider.networking.networks.list()
+        provider.security.key_pairs.list()
+        self.assertEqual(provider.token_fetches, 1)
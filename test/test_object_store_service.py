@@ -156,6 +156,70 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                     target_stream2.write(data)
                 self.assertEqual(target_stream2.getvalue(), content)
 
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_partial_bucket_content_reads(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_ranges.txt")
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                content = b"0123456789" * 100
+                obj.upload(content)
+                obj = test_bucket.objects.get("hello_ranges.txt")
+
+                self.assertEqual(b''.join(obj.iter_content(10, 19)),
+                                 content[10:20])
+                self.assertEqual(b''.join(obj.iter_content(start=990)),
+                                 content[990:])
+                self.assertEqual(b''.join(obj.iter_content(end=4)),
+                                 content[:5])
+
+                with obj.open(buffer_size=64) as f:
+                    self.assertEqual(f.read(5), content[:5])
+                    f.seek(-8, os.SEEK_END)
+                    self.assertEqual(f.tell(), len(content) - 8)
+                    self.assertEqual(f.read(), content[-8:])
+                    f.seek(500)
+                    self.assertEqual(f.read(200), content[500:700])
+                    self.assertEqual(f.read(1000), content[700:])
+                    self.assertEqual(f.read(), b'')
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_read_bucket_content_into_buffer(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj_name = "hello_readinto.txt"
+            obj = test_bucket.objects.create(obj_name)
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                content = b"0123456789" * 100
+                obj.upload(content)
+                obj = test_bucket.objects.get(obj_name)
+
+                stream = obj.iter_content()
+                if not hasattr(stream, 'readinto'):
+                    raise self.skipTest("Content does not support readinto")
+                buffer = bytearray(64)
+                received = BytesIO()
+                while True:
+                    count = stream.readinto(buffer)
+                    if not count:
+                        break
+                    received.write(buffer[:count])
+                self.assertEqual(received.getvalue(), content)
+
+                if self.provider.PROVIDER_ID == ProviderList.AWS:
+                    provider = self.provider.__class__(
+                        dict(self.provider.config, s3_read_chunk_size=300))
+                    chunks = list(provider.storage.buckets.get(name)
+                                  .objects.get(obj_name).iter_content())
+                    self.assertListEqual([len(chunk) for chunk in chunks],
+                                         [300, 300, 300, 100])
+
     @helpers.skipIfNoService(['storage.buckets'])
     def test_generate_url(self):
         if self.provider.PROVIDER_ID == ProviderList.OPENSTACK:
@@ -199,6 +263,84 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                 with open(test_file, 'rb') as f:
                     self.assertEqual(target_stream.getvalue(), f.read())
 
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_upload_bucket_content_from_file_in_parts(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_multipart.bin")
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                # Three parts of the smallest size accepted by S3
+                part_size = 5 * 1024 * 1024
+                content = os.urandom(2 * part_size + 1024)
+                fd, test_file = tempfile.mkstemp()
+                with helpers.cleanup_action(lambda: os.remove(test_file)):
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(content)
+                    self.assertTrue(obj.upload_from_file(
+                        test_file, part_size=part_size, max_workers=2))
+                target_stream = BytesIO()
+                obj.save_content(target_stream)
+                self.assertEqual(target_stream.getvalue(), content)
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_download_bucket_content_to_file_in_parts(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_ranged.bin")
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                content = os.urandom(100 * 1024 + 7)
+                obj.upload(content)
+                fd, target_file = tempfile.mkstemp()
+                os.close(fd)
+                with helpers.cleanup_action(lambda: os.remove(target_file)):
+                    self.assertTrue(obj.download_to_file(
+                        target_file, parts=4, verify=True))
+                    with open(target_file, 'rb') as f:
+                        self.assertEqual(f.read(), content)
+                    self.assertFalse(os.path.exists(target_file + '.cbparts'))
+
+                    # Resuming a completed download fetches it all again
+                    self.assertTrue(obj.download_to_file(
+                        target_file, parts=4, resume=True))
+                    with open(target_file, 'rb') as f:
+                        self.assertEqual(f.read(), content)
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_bulk_bucket_objects(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            objs = [test_bucket.objects.create("bulk-{0}.txt".format(i))
+                    for i in range(5)]
+
+            def upload(obj):
+                if obj.name == "bulk-3.txt":
+                    raise ValueError("failed upload")
+                obj.upload(obj.name)
+                return obj.name
+
+            report = self.provider.bulk.map(upload, objs, max_workers=3)
+            self.assertEqual([item.resource for item in report], objs)
+            self.assertFalse(report.ok)
+            self.assertEqual(len(report.succeeded), 4)
+            self.assertEqual([item.result for item in report.succeeded],
+                             [obj.name for obj in objs if obj.name !=
+                              "bulk-3.txt"])
+            self.assertIsInstance(report.failed[0].error, ValueError)
+
+            report = self.provider.bulk.delete(list(test_bucket.objects))
+            self.assertTrue(report.ok, "Bulk delete failed: %s" %
+                            report.failed)
+            self.assertEqual(len(report), 4)
+            self.assertEqual(len(list(test_bucket.objects)), 0)
+
     @skip("Skip unless you want to test swift objects bigger than 5 Gig")
     @helpers.skipIfNoService(['storage.buckets'])
     def test_upload_download_bucket_content_with_large_file(self):
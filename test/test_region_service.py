@@ -1,3 +1,4 @@
+import threading
 from test import helpers
 from test.helpers import ProviderTestBase
 from test.helpers import standard_interface_tests as sit
@@ -65,3 +66,42 @@ class CloudRegionServiceTestCase(ProviderTestBase):
                     zone_find_count += 1
         # zone info cannot be repeated between regions
         self.assertEqual(zone_find_count, 1)
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_map_regions(self):
+        """
+        Test querying several regions at once through bulk.map_regions
+        """
+        regions = list(self.provider.compute.regions)[:3]
+        results = self.provider.bulk.map_regions(
+            lambda region_provider: region_provider.compute.regions.current
+            .zones, regions=regions)
+
+        self.assertListEqual(results.regions,
+                             [region.name for region in regions])
+        self.assertTrue(results.ok, "Unexpected errors: %s" % results.errors)
+        for region in regions:
+            self.assertListEqual(
+                [zone.name for zone in results.get(region.name)],
+                [zone.name for zone in region.zones])
+        for region_name, zone in results:
+            self.assertEqual(zone.region_name, region_name)
+        # Lazy results are consumed in the worker threads, not the caller's
+        threads = []
+
+        def lazy_query(region_provider):
+            threads.append(threading.current_thread())
+            for zone in region_provider.compute.regions.current.zones:
+                threads.append(threading.current_thread())
+                yield zone
+
+        self.assertTrue(
+            self.provider.bulk.map_regions(lazy_query, regions=regions).ok)
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+        # Region providers are cached, and shared between regions
+        region_provider = self.provider.for_region(regions[-1].name)
+        self.assertIs(region_provider,
+                      self.provider.for_region(regions[-1].name))
+        self.assertIs(region_provider.for_region(regions[0].name),
+                      self.provider.for_region(regions[0].name))
@@ -73,3 +73,27 @@ class CloudVMTypeServiceTestCase(ProviderTestBase):
 
         sit.check_standard_behaviour(
                 self, self.provider.compute.vm_types, vm_type)
+
+    @helpers.skipIfNoService(['compute.vm_types'])
+    def test_vm_types_index(self):
+        """
+        Repeated lookups should be served from the VM type index until it
+        is invalidated.
+        """
+        vm_types = self.provider.compute.vm_types
+        vm_type_name = helpers.get_provider_test_data(
+            self.provider,
+            "vm_type")
+        vm_type = vm_types.find(name=vm_type_name)[0]
+        stats = vm_types.index_stats
+        self.assertEqual(stats['misses'], 1)
+        self.assertGreater(stats['size'], 0)
+
+        self.assertEqual(vm_types.get(vm_type.id).id, vm_type.id)
+        self.assertEqual(vm_types.find(name=vm_type_name)[0].id, vm_type.id)
+        self.assertEqual(vm_types.index_stats['hits'], stats['hits'] + 2)
+        self.assertEqual(vm_types.index_stats['misses'], 1)
+
+        vm_types.invalidate()
+        self.assertEqual(vm_types.get(vm_type.id).id, vm_type.id)
+        self.assertEqual(vm_types.index_stats['misses'], 2)